@@ -0,0 +1,117 @@
+"""
+Picking an algorithm from cheap features of the reduced problem, for callers who'd rather not guess.
+
+The features take a single pass over the decompositions plus a union find for the components:
+
+- set_count, the number of decompositions left to hit
+- distinct_primes, the number of primes they hold between them
+- log10_search_space, log10 of the product of the decomposition sizes, i.e. how many outcomes exhaustive walks
+- max_degree, the most decompositions any one prime appears in
+- component_count, the number of connected components (see components.py)
+
+SELECTION_TABLE then lists, for each quality of answer wanted, rules tried in order, the first whose condition holds
+picking the algorithm. The thresholds come from timing every algorithm on random inputs over small and large ranges and
+on products of three primes from a narrow band (the wide instances), which are the hard ones:
+
+- exhaustive is as quick as anything up to about 10^6 outcomes, and hopeless not long after.
+- when no prime hits more than a fifth of the decompositions nothing is dominated, branch-and-bound stalls and the ILP
+  solvers do far better. They also leave greedy furthest from the optimum, so annealing is the heuristic of choice.
+- otherwise branch-and-bound (per component, if there's more than one) proves the optimum in milliseconds even at
+  thousands of decompositions, and greedy almost always finds it too.
+
+Every choice is logged, along with the features it was made on, so the policy can be audited.
+"""
+import collections
+import itertools
+import logging
+import math
+from components import connected_components
+from ilp_backend import available_ilp_solvers
+
+logger = logging.getLogger(__name__)
+
+InstanceFeatures = collections.namedtuple(
+    'InstanceFeatures', ['set_count', 'distinct_primes', 'log10_search_space', 'max_degree', 'component_count']
+)
+
+# largest log10 of the number of outcomes exhaustive is picked for
+EXHAUSTIVE_LOG10_LIMIT = 6
+
+# instances where no prime's degree exceeds this share of the decompositions count as wide
+WIDE_DEGREE_SHARE = 0.2
+
+
+def _is_wide(features):
+    """Whether no prime hits more than WIDE_DEGREE_SHARE of the decompositions."""
+    return features.max_degree <= WIDE_DEGREE_SHARE * features.set_count
+
+
+SELECTION_TABLE = {
+    'exact': [
+        ('exhaustive', lambda features: features.log10_search_space <= EXHAUSTIVE_LOG10_LIMIT),
+        ('ilp', lambda features: _is_wide(features) and bool(available_ilp_solvers())),
+        ('components', lambda features: features.component_count > 1),
+        ('branch-and-bound', lambda features: True),
+    ],
+    'heuristic': [
+        ('exhaustive', lambda features: features.log10_search_space <= EXHAUSTIVE_LOG10_LIMIT),
+        ('annealing', _is_wide),
+        ('greedy', lambda features: True),
+    ],
+}
+
+
+def instance_features(remaining):
+    """Compute the features algorithms are picked on.
+
+    Parameters
+    ----------
+    remaining : list
+        List of lists of remaining decompositions.
+
+    Returns
+    -------
+    InstanceFeatures
+        Named tuple of (set_count, distinct_primes, log10_search_space, max_degree, component_count).
+    """
+    degrees = collections.Counter(itertools.chain.from_iterable(remaining))
+
+    return InstanceFeatures(
+        set_count=len(remaining),
+        distinct_primes=len(degrees),
+        log10_search_space=sum(math.log10(len(decomposition)) for decomposition in remaining),
+        max_degree=max(degrees.values(), default=0),
+        component_count=len(connected_components(remaining)),
+    )
+
+
+def choose_algorithm(
+    features,
+    quality='exact',
+):
+    """Pick the algorithm expected to be fastest for an instance at the quality wanted.
+
+    Parameters
+    ----------
+    features : InstanceFeatures
+        Features of the instance, from instance_features.
+    quality : string
+        'exact' to only pick algorithms that prove their answer minimal, 'heuristic' to settle for a good answer fast.
+
+    Returns
+    -------
+    string
+        Name of the algorithm, as in get_chosen_algorithm.
+
+    Raises
+    ------
+    ValueError
+        If quality isn't in SELECTION_TABLE.
+    """
+    if quality not in SELECTION_TABLE:
+        raise ValueError('quality must be one of {}, not {}'.format(sorted(SELECTION_TABLE), quality))
+
+    algorithm = next(algorithm for algorithm, condition in SELECTION_TABLE[quality] if condition(features))
+    logger.info('picked %s for %s quality on %s', algorithm, quality, features)
+
+    return algorithm
@@ -0,0 +1,559 @@
+"""
+Benchmarks for the more performance sensitive parts of the pipeline. Run as a script to print the results, e.g.
+
+    python benchmarks.py
+
+The solvers have a harness of their own, running every algorithm on seeded instances of each kind in generate_instance
+and writing the results to JSON or CSV. Passing --compare with the results of an earlier commit lists any runs that got
+slower, gave larger solutions or stopped working.
+
+    python benchmarks.py --solvers --output results.json
+    python benchmarks.py --solvers --output new.json --compare results.json
+"""
+import argparse
+import csv
+import json
+import math
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import tracemalloc
+from timeit import default_timer as timer
+from shared_functions import (
+    prime_factor_decomposition,
+    get_prime_decomposition_list,
+    get_remaining,
+    check_if_solved,
+)
+from kernelisation import kernelise
+from hit_set_algorithms import ALGORITHMS, get_chosen_algorithm, ilp_hitting_set
+
+
+def per_element_prime_decomposition_list(int_list):
+    """The old decomposition phase, factoring each element on its own (twice) with no sharing between repeats. Kept
+    here as the baseline the batch version is measured against.
+
+    Parameters
+    ----------
+    int_list : list
+        List of integers to factorise.
+
+    Returns
+    -------
+    list
+        List of prime factor decompositions for input list.
+    """
+    return [prime_factor_decomposition(i) for i in int_list
+            if prime_factor_decomposition(i) != []]
+
+
+def benchmark_decomposition(
+    list_lengths=(10 ** 3, 10 ** 4, 10 ** 5),
+    value_range=10 ** 6,
+    distinct_values=1000,
+    seed=0,
+):
+    """Time the per element decomposition against the batch decomposition used by get_prime_decomposition_list.
+
+    Parameters
+    ----------
+    list_lengths : tuple
+        Lengths of the input lists to time.
+    value_range : int
+        Inputs are drawn from range(0, value_range).
+    distinct_values : int
+        Number of distinct integers each input list is drawn from, to mimic heavily repeated production lists.
+    seed : int
+        Seed for the input generation.
+
+    Returns
+    -------
+    list
+        List of dicts holding the list length and the time taken by each method in seconds.
+    """
+    rng = random.Random(seed)
+    pool = rng.sample(range(value_range), distinct_values)
+    results = []
+
+    for length in list_lengths:
+        int_list = [rng.choice(pool) for _ in range(length)]
+
+        start = timer()
+        expected = per_element_prime_decomposition_list(int_list)
+        per_element_time = timer() - start
+
+        start = timer()
+        realised = get_prime_decomposition_list(int_list, text=False)
+        batch_time = timer() - start
+
+        if expected != realised:
+            raise AssertionError('batch decomposition disagrees with per element decomposition')
+
+        results.append({
+            'list_length': length,
+            'per_element_seconds': per_element_time,
+            'batch_seconds': batch_time,
+        })
+
+    return results
+
+
+def pairwise_get_remaining(
+    prime_decomposition_list,
+    sols,
+):
+    """The old get_remaining, checking every decomposition against every other for a strict superset. Kept here as the
+    baseline the hashed version is measured against.
+
+    Parameters
+    ----------
+    prime_decomposition_list : list
+        List of lists of prime numbers
+    sols : list
+        List of integers which if present as a list in prime_decomposition_list should be dropped.
+
+    Returns
+    -------
+    list
+        List of lists where each sublist if of length > 1.
+    """
+    sols = [[i] for i in sols]
+
+    remaining = [decomposition for decomposition in prime_decomposition_list
+                 if decomposition not in sols]
+    remaining_sets = [set(decomposition) for decomposition in remaining]
+
+    remaining = [decomposition_list for decomposition_list, decomposition_set in zip(remaining, remaining_sets)
+                 if not any(decomposition_set < other for other in remaining_sets)]
+
+    return remaining
+
+
+def benchmark_get_remaining(
+    set_counts=(10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6),
+    value_range=10 ** 9,
+    baseline_limit=10 ** 4,
+    seed=0,
+):
+    """Time get_remaining's subset elimination as the number of decompositions grows, against the pairwise version for
+    the sizes small enough for it to finish.
+
+    Parameters
+    ----------
+    set_counts : tuple
+        Numbers of decompositions to time, each the decomposition of a random integer.
+    value_range : int
+        Integers are drawn from range(2, value_range).
+    baseline_limit : int
+        Largest set count to also time the pairwise version on, it being quadratic.
+    seed : int
+        Seed for the input generation.
+
+    Returns
+    -------
+    list
+        List of dicts holding the number of decompositions, the number kept, and the time taken by each method in
+        seconds (None where the pairwise version wasn't run).
+    """
+    rng = random.Random(seed)
+    results = []
+
+    for count in set_counts:
+        decompositions = get_prime_decomposition_list([rng.randrange(2, value_range) for _ in range(count)], False)
+        sols = list(set(decomposition[0] for decomposition in decompositions if len(decomposition) == 1))
+
+        start = timer()
+        realised = get_remaining(decompositions, sols)
+        hashed_time = timer() - start
+
+        pairwise_time = None
+        if count <= baseline_limit:
+            start = timer()
+            expected = pairwise_get_remaining(decompositions, sols)
+            pairwise_time = timer() - start
+
+            if expected != realised:
+                raise AssertionError('hashed get_remaining disagrees with pairwise get_remaining')
+
+        results.append({
+            'sets': count,
+            'kept': len(realised),
+            'pairwise_seconds': pairwise_time,
+            'hashed_seconds': hashed_time,
+        })
+
+    return results
+
+
+INSTANCE_KINDS = ('dense', 'sparse', 'wide', 'duplicates')
+
+# self-solve only ever hands back the partial solution found by the reduction, so there's nothing to benchmark
+BENCHMARK_ALGORITHMS = tuple(algorithm for algorithm in ALGORITHMS if algorithm != 'self-solve')
+
+
+def _primes_between(low, high):
+    """Primes p with low <= p < high, by trial division as the ranges here are small."""
+    return [p for p in range(max(low, 2), high) if all(p % q for q in range(2, math.isqrt(p) + 1))]
+
+
+def generate_instance(
+    kind,
+    size,
+    seed=0,
+):
+    """Generate one benchmark input. The same kind, size and seed always give the same integers, on any machine.
+
+    Plain random integers are almost all solved outright by kernelisation, the primes and the unshared large factors
+    taking everything else with them, which would leave the algorithms nothing to do. So every kind is built from
+    products of a few distinct primes, with no prime factor of its own, and most of each instance is still there
+    after the reduction.
+
+    Parameters
+    ----------
+    kind : string
+        One of INSTANCE_KINDS:
+        - 'dense', products of two or three primes below 60, so a small range where every prime is shared widely.
+        - 'sparse', products of two primes from a random band around 10^5, so a large range where each prime is
+          shared by about three integers.
+        - 'wide', products of three primes from a narrow band, so every decomposition is wide and no prime dominates,
+          the adversarial case for the exact algorithms.
+        - 'duplicates', products of two primes drawn with replacement from a pool a tenth the size of the list.
+    size : int
+        Number of integers.
+    seed : int
+        Seed for the generation.
+
+    Returns
+    -------
+    list
+        List of integers.
+    """
+    # string seeds are hashed with sha512, so unlike hash() they don't change between runs
+    rng = random.Random('{}:{}:{}'.format(seed, kind, size))
+
+    if kind == 'dense':
+        band = _primes_between(2, 60)
+        return [math.prod(rng.sample(band, rng.choice((2, 3)))) for _ in range(size)]
+    if kind == 'sparse':
+        band = rng.sample(_primes_between(10 ** 5, 2 * 10 ** 5), max(size * 2 // 3, 3))
+        return [math.prod(rng.sample(band, 2)) for _ in range(size)]
+    if kind == 'wide':
+        band = _primes_between(101, 400)
+        return [rng.choice(band) * rng.choice(band) * rng.choice(band) for _ in range(size)]
+    if kind == 'duplicates':
+        pool_size = max(size // 10, 3)
+        band = _primes_between(2, 10 ** 3)[:max(pool_size // 2, 3)]
+        pool = [math.prod(rng.sample(band, 2)) for _ in range(pool_size)]
+        return [rng.choice(pool) for _ in range(size)]
+
+    raise ValueError('kind must be one of {}, not {}'.format(INSTANCE_KINDS, kind))
+
+
+def _solve_in_child(
+    remaining,
+    sols,
+    algorithm,
+    time_budget,
+    conn,
+):
+    """Run one algorithm in its own process, sending back what happened.
+
+    The algorithm is run twice, once to time it and once under tracemalloc for the peak memory it allocated, as tracing
+    slows the allocation heavy algorithms down several times over. The peak covers everything allocated through
+    python, numpy arrays included, but not the memory of solver libraries outside it, i.e. CBC and OR-Tools.
+    """
+    chosen_algorithm = get_chosen_algorithm(algorithm)
+    stats = {}
+
+    try:
+        start = timer()
+        solution = chosen_algorithm(remaining, list(sols), False, time_budget=time_budget, stats=stats)
+        seconds = timer() - start
+
+        tracemalloc.start()
+        chosen_algorithm(remaining, list(sols), False, time_budget=time_budget)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        conn.send({
+            'status': 'ok',
+            'seconds': seconds,
+            'peak_memory_kb': peak_memory / 1024,
+            'solution': [int(p) for p in solution],
+            'finished': stats.get('finished', True),
+        })
+    except Exception as error:
+        conn.send({'status': 'error', 'message': repr(error)})
+    finally:
+        conn.close()
+
+
+def _run_isolated(
+    remaining,
+    sols,
+    algorithm,
+    time_budget,
+):
+    """Run _solve_in_child and wait for it, killing it if it goes well over its time budget."""
+    parent_conn, child_conn = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_solve_in_child,
+                                      args=(remaining, sols, algorithm, time_budget, child_conn))
+    process.start()
+    child_conn.close()
+
+    # the budget covers each of the two runs, the grace covers starting up and the odd algorithm that checks it rarely
+    if parent_conn.poll(time_budget * 4 + 5):
+        outcome = parent_conn.recv()
+    else:
+        outcome = {'status': 'killed'}
+        process.terminate()
+
+    process.join()
+    parent_conn.close()
+
+    return outcome
+
+
+def benchmark_algorithms(
+    kinds=INSTANCE_KINDS,
+    sizes=(100, 300, 1000),
+    algorithms=BENCHMARK_ALGORITHMS,
+    time_budget=2.0,
+    reference_budget=30.0,
+    seed=0,
+):
+    """Run every algorithm on a grid of generated instances, each in its own process, recording its time, peak memory,
+    solution size and distance from the optimum.
+
+    Every instance is kernelised first (see kernelisation.py) and the algorithms all get the same kernel, so the times
+    are of the algorithms alone. The reference is the ILP solver (or branch-and-bound without one) given a much larger
+    time budget, and each gap is measured against its lower bound, so is exact wherever the reference finished and an
+    overestimate elsewhere.
+
+    Parameters
+    ----------
+    kinds : tuple
+        Kinds of instance to generate, see generate_instance.
+    sizes : tuple
+        Numbers of integers per instance.
+    algorithms : tuple
+        Names of the algorithms to run, as in get_chosen_algorithm.
+    time_budget : float
+        Seconds each algorithm is given per instance.
+    reference_budget : float
+        Seconds the reference solve is given per instance.
+    seed : int
+        Seed for the instance generation.
+
+    Returns
+    -------
+    list
+        List of dicts, one per instance and algorithm, holding 'kind', 'size', 'seed', 'algorithm', 'status' ('ok',
+        'error' or 'killed'), 'seconds', 'peak_memory_kb' (the peak memory the algorithm allocated, see
+        _solve_in_child), 'solution_size', 'valid' (whether the solution hits every input), 'finished',
+        'reference_size', 'reference_optimal', 'lower_bound' and 'gap'. Fields that don't apply, i.e. the solution size
+        of a run that was killed, are None.
+    """
+    results = []
+
+    for kind in kinds:
+        for size in sizes:
+            decompositions = get_prime_decomposition_list(generate_instance(kind, size, seed), False)
+            remaining, sols, _ = kernelise(decompositions)
+
+            reference_stats = {}
+            reference = ilp_hitting_set(remaining, list(sols), False, reference_budget, stats=reference_stats)
+            lower_bound = reference_stats.get('lower_bound', len(reference))
+
+            for algorithm in algorithms:
+                if remaining:
+                    outcome = _run_isolated(remaining, sols, algorithm, time_budget)
+                else:
+                    # solved by the kernel, nothing for the algorithm to do
+                    outcome = {'status': 'ok', 'seconds': 0.0, 'peak_memory_kb': 0.0, 'solution': list(sols),
+                               'finished': True}
+
+                solution = outcome.get('solution')
+                results.append({
+                    'kind': kind,
+                    'size': size,
+                    'seed': seed,
+                    'algorithm': algorithm,
+                    'status': outcome['status'],
+                    'seconds': outcome.get('seconds'),
+                    'peak_memory_kb': outcome.get('peak_memory_kb'),
+                    'solution_size': None if solution is None else len(set(solution)),
+                    'valid': None if solution is None else check_if_solved(decompositions, solution) == [],
+                    'finished': outcome.get('finished'),
+                    'reference_size': len(reference),
+                    'reference_optimal': reference_stats.get('optimal', True),
+                    'lower_bound': lower_bound,
+                    'gap': None if solution is None else len(set(solution)) - lower_bound,
+                })
+
+    return results
+
+
+def _git_commit():
+    """Hash of the checked out commit, or None outside a git checkout."""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(
+    results,
+    path,
+    **metadata
+):
+    """Write benchmark results to path, as CSV if it ends in .csv and otherwise as JSON. The JSON also records the
+    commit, python version and platform, along with any metadata passed in, i.e. the seed and time budget.
+
+    Parameters
+    ----------
+    results : list
+        List of dicts, i.e. from benchmark_algorithms.
+    path : str
+        File to write.
+    **metadata
+        Extra fields for the JSON metadata.
+    """
+    if path.endswith('.csv'):
+        with open(path, 'w', newline='') as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=list(results[0]) if results else [])
+            writer.writeheader()
+            writer.writerows(results)
+        return
+
+    metadata.update({
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+    })
+    with open(path, 'w') as json_file:
+        json.dump({'metadata': metadata, 'results': results}, json_file, indent=1)
+
+
+def read_results(path):
+    """Read benchmark results written by write_results.
+
+    Parameters
+    ----------
+    path : str
+        File to read, CSV or JSON.
+
+    Returns
+    -------
+    list
+        List of dicts. Values read from CSV are left as strings.
+    """
+    if path.endswith('.csv'):
+        with open(path, newline='') as csv_file:
+            return list(csv.DictReader(csv_file))
+
+    with open(path) as json_file:
+        return json.load(json_file)['results']
+
+
+def compare_results(
+    baseline,
+    current,
+    tolerance=0.25,
+    slack=0.01,
+):
+    """Find the runs that got worse between two sets of benchmark results, matching them on kind, size, seed and
+    algorithm.
+
+    Parameters
+    ----------
+    baseline : list
+        Results from the earlier commit.
+    current : list
+        Results from the later commit.
+    tolerance : float
+        Fraction by which a run may get slower before it counts as a regression.
+    slack : float
+        Seconds a run may get slower regardless, so the noise on very quick runs isn't reported.
+
+    Returns
+    -------
+    list
+        List of dicts holding the 'kind', 'size', 'seed' and 'algorithm' of each regression, along with 'reason'
+        ('slower', 'larger', 'invalid' or 'status') and the 'baseline' and 'current' values compared.
+    """
+    def key(result):
+        return result['kind'], int(result['size']), int(result['seed']), result['algorithm']
+
+    def number(value):
+        return None if value in (None, '') else float(value)
+
+    baseline = {key(result): result for result in baseline}
+    regressions = []
+
+    for result in current:
+        before = baseline.get(key(result))
+        if before is None:
+            continue
+
+        found = dict(zip(('kind', 'size', 'seed', 'algorithm'), key(result)))
+        if result['status'] != before['status']:
+            regressions.append(dict(found, reason='status', baseline=before['status'], current=result['status']))
+        elif str(result['valid']) != str(before['valid']):
+            regressions.append(dict(found, reason='invalid', baseline=before['valid'], current=result['valid']))
+        elif result['status'] == 'ok':
+            size_before, size_now = number(before['solution_size']), number(result['solution_size'])
+            seconds_before, seconds_now = number(before['seconds']), number(result['seconds'])
+
+            if size_now > size_before:
+                regressions.append(dict(found, reason='larger', baseline=size_before, current=size_now))
+            elif seconds_now > seconds_before * (1 + tolerance) + slack:
+                regressions.append(dict(found, reason='slower', baseline=seconds_before, current=seconds_now))
+
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the MinPrimeHitSet pipeline.')
+    parser.add_argument('--solvers', action='store_true', help='benchmark the algorithms rather than the reduction')
+    parser.add_argument('--output', help='file to write the solver results to, .csv for CSV and otherwise JSON')
+    parser.add_argument('--compare', help='earlier solver results to check for regressions against')
+    parser.add_argument('--kinds', nargs='+', default=INSTANCE_KINDS, choices=INSTANCE_KINDS)
+    parser.add_argument('--sizes', nargs='+', type=int, default=(100, 300, 1000))
+    parser.add_argument('--algorithms', nargs='+', default=BENCHMARK_ALGORITHMS, choices=BENCHMARK_ALGORITHMS)
+    parser.add_argument('--time-budget', type=float, default=2.0)
+    parser.add_argument('--seed', type=int, default=0)
+    arguments = parser.parse_args()
+
+    if not arguments.solvers:
+        print('\n---| Decomposition Benchmark |---\n')
+        for result in benchmark_decomposition():
+            print('\t{list_length:>8} ints: per element {per_element_seconds:.4f}s, batch {batch_seconds:.4f}s'
+                  .format(**result))
+
+        print('\n---| get_remaining Benchmark |---\n')
+        for result in benchmark_get_remaining():
+            pairwise = 'skipped' if result['pairwise_seconds'] is None else \
+                '{:.4f}s'.format(result['pairwise_seconds'])
+            print('\t{:>8} sets: pairwise {}, hashed {:.4f}s'.format(
+                result['sets'], pairwise, result['hashed_seconds']))
+    else:
+        print('\n---| Solver Benchmark |---\n')
+        results = benchmark_algorithms(arguments.kinds, arguments.sizes, arguments.algorithms, arguments.time_budget,
+                                       seed=arguments.seed)
+        for result in results:
+            seconds = '-' if result['seconds'] is None else '{:.4f}s'.format(result['seconds'])
+            print('\t{kind:>10} {size:>6} {algorithm:>20}: {status} in {0}, size {solution_size}, gap {gap}'
+                  .format(seconds, **result))
+
+        if arguments.output:
+            write_results(results, arguments.output, seed=arguments.seed, time_budget=arguments.time_budget)
+
+        if arguments.compare:
+            regressions = compare_results(read_results(arguments.compare), results)
+            print('\n\t{} regressions'.format(len(regressions)))
+            for regression in regressions:
+                print('\t{kind:>10} {size:>6} {algorithm:>20}: {reason}, {baseline} -> {current}'.format(**regression))
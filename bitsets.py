@@ -0,0 +1,355 @@
+"""
+Bitset form of the prime decompositions. Each distinct prime is given a bit index and each decomposition becomes a
+python int with those bits set, so "is this decomposition hit by sols" is a single AND rather than a scan over both
+lists. For bulk work the masks can also be packed into rows of a numpy uint64 array.
+
+The functions here mirror the reduction steps in shared_functions, and produce the same results once decoded.
+"""
+import collections
+import itertools
+import random
+import numpy as np
+
+
+def build_prime_index(prime_decomposition_list):
+    """Assign a bit index to every distinct prime in the decompositions.
+
+    Parameters
+    ----------
+    prime_decomposition_list : list
+        List of lists of prime numbers
+
+    Returns
+    -------
+    tuple
+        (primes, bit_of) where primes is the sorted list of distinct primes, so primes[i] is the prime held in bit i,
+        and bit_of is the inverse dict mapping each prime to its bit index.
+    """
+    primes = sorted(set(itertools.chain.from_iterable(prime_decomposition_list)))
+
+    return primes, {p: i for i, p in enumerate(primes)}
+
+
+def encode_decomposition(decomposition, bit_of):
+    """Turn a list of primes into a bitmask. Primes missing from bit_of are ignored.
+
+    Parameters
+    ----------
+    decomposition : list
+        List of primes.
+    bit_of : dict
+        Mapping of prime to bit index, as output by build_prime_index.
+
+    Returns
+    -------
+    int
+        Bitmask with the bit of each prime in decomposition set.
+    """
+    mask = 0
+
+    for p in decomposition:
+        if p in bit_of:
+            mask |= 1 << bit_of[p]
+
+    return mask
+
+
+def encode_decompositions(prime_decomposition_list, bit_of):
+    """Turn every decomposition in a list into a bitmask.
+
+    Parameters
+    ----------
+    prime_decomposition_list : list
+        List of lists of prime numbers
+    bit_of : dict
+        Mapping of prime to bit index, as output by build_prime_index.
+
+    Returns
+    -------
+    list
+        List of int bitmasks, one per decomposition.
+    """
+    return [encode_decomposition(decomposition, bit_of) for decomposition in prime_decomposition_list]
+
+
+def iter_bits(mask):
+    """Yield the index of every set bit in mask, lowest first.
+
+    Parameters
+    ----------
+    mask : int
+        Bitmask to walk.
+
+    Yields
+    ------
+    int
+        Index of each set bit.
+    """
+    while mask:
+        low_bit = mask & -mask
+        yield low_bit.bit_length() - 1
+        mask ^= low_bit
+
+
+def decode_mask(mask, primes):
+    """Turn a bitmask back into the list of primes it holds.
+
+    Parameters
+    ----------
+    mask : int
+        Bitmask to decode.
+    primes : list
+        List of primes where primes[i] is the prime held in bit i.
+
+    Returns
+    -------
+    list
+        List of primes, in ascending bit order.
+    """
+    return [primes[bit] for bit in iter_bits(mask)]
+
+
+def decode_masks(masks, primes):
+    """Decode a list of bitmasks back into a list of lists of primes.
+
+    Parameters
+    ----------
+    masks : list
+        List of int bitmasks.
+    primes : list
+        List of primes where primes[i] is the prime held in bit i.
+
+    Returns
+    -------
+    list
+        List of lists of primes.
+    """
+    return [decode_mask(mask, primes) for mask in masks]
+
+
+def pack_masks(masks, n_bits):
+    """Pack int bitmasks into the rows of a numpy uint64 array.
+
+    Parameters
+    ----------
+    masks : list
+        List of int bitmasks.
+    n_bits : int
+        Number of bits in use, i.e. the number of distinct primes.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shape (len(masks), ceil(n_bits / 64)) where row i holds masks[i], least significant word first.
+    """
+    n_words = max((n_bits + 63) // 64, 1)
+    packed = np.zeros((len(masks), n_words), dtype=np.uint64)
+    word = (1 << 64) - 1
+
+    for i, mask in enumerate(masks):
+        for w in range(n_words):
+            packed[i, w] = (mask >> (64 * w)) & word
+
+    return packed
+
+
+def unhit_rows(packed, packed_sol):
+    """Find the packed decompositions not hit by a packed solution.
+
+    Parameters
+    ----------
+    packed : numpy.ndarray
+        Array of packed decompositions, as output by pack_masks.
+    packed_sol : numpy.ndarray
+        Single packed row holding the solution mask.
+
+    Returns
+    -------
+    numpy.ndarray
+        Indices of the rows in packed sharing no bits with packed_sol.
+    """
+    hit = (packed & packed_sol.reshape(1, -1)).any(axis=1)
+
+    return np.flatnonzero(~hit)
+
+
+def get_sols_bits(masks):
+    """Bitset form of get_sols.
+
+    Parameters
+    ----------
+    masks : list
+        List of int bitmasks.
+
+    Returns
+    -------
+    int
+        Mask of every prime appearing in a decomposition on its own.
+    """
+    sol_mask = 0
+
+    for mask in masks:
+        if mask & (mask - 1) == 0:
+            sol_mask |= mask
+
+    return sol_mask
+
+
+def get_remaining_bits(
+    masks,
+    sol_mask,
+):
+    """Bitset form of get_remaining. Drops single prime decompositions held in sol_mask, then any decomposition that is
+    a strict subset of another.
+
+    Parameters
+    ----------
+    masks : list
+        List of int bitmasks.
+    sol_mask : int
+        Mask of primes in the partial solution.
+
+    Returns
+    -------
+    list
+        List of int bitmasks, in their original order.
+    """
+    masks = [mask for mask in masks
+             if not (mask & (mask - 1) == 0 and mask & sol_mask)]
+
+    # subset tests only need doing once per distinct mask, and only against masks that contain its rarest bit
+    distinct = set(masks)
+    holders = collections.defaultdict(list)
+    for mask in distinct:
+        for bit in iter_bits(mask):
+            holders[bit].append(mask)
+
+    strict_subsets = set()
+    for mask in distinct - {0}:
+        rarest = min(iter_bits(mask), key=lambda bit: len(holders[bit]))
+        if any(other != mask and mask & other == mask for other in holders[rarest]):
+            strict_subsets.add(mask)
+
+    return [mask for mask in masks if mask not in strict_subsets]
+
+
+def check_if_solved_bits(
+    masks,
+    sol_mask,
+):
+    """Bitset form of check_if_solved.
+
+    Parameters
+    ----------
+    masks : list
+        List of int bitmasks.
+    sol_mask : int
+        Mask of primes in the partial solution.
+
+    Returns
+    -------
+    list
+        List of the masks not hit by sol_mask.
+    """
+    return [mask for mask in masks if not mask & sol_mask]
+
+
+def check_for_single_remaining_sol_bits(
+    masks,
+    sol_mask,
+):
+    """Bitset form of check_for_single_remaining_sol.
+
+    Parameters
+    ----------
+    masks : list
+        List of int bitmasks.
+    sol_mask : int
+        Mask of primes in the partial solution.
+
+    Returns
+    -------
+    int
+        sol_mask, plus a random bit shared by every mask if one exists.
+    """
+    if not masks:
+        return sol_mask
+
+    common = -1
+    for mask in masks:
+        common &= mask
+
+    if common:
+        sol_mask |= 1 << random.choice(list(iter_bits(common)))
+
+    return sol_mask
+
+
+def remove_single_elements_bits(masks):
+    """Bitset form of remove_single_elements.
+
+    Parameters
+    ----------
+    masks : list
+        List of int bitmasks.
+
+    Returns
+    -------
+    list
+        List of int bitmasks, with primes appearing in only one mask removed where that mask holds other primes too.
+    """
+    seen_once = 0
+    seen_more = 0
+
+    for mask in masks:
+        seen_more |= seen_once & mask
+        seen_once |= mask
+
+    solo = seen_once & ~seen_more
+
+    return [mask & ~solo if mask & solo and mask & ~solo else mask for mask in masks]
+
+
+def bitset_reduction(
+    prime_decomposition_list,
+    text,
+):
+    """Run get_sols, get_remaining, check_if_solved and solution_reduction on the bitset form of the decompositions,
+    decoding back to primes only once at the end.
+
+    Parameters
+    ----------
+    prime_decomposition_list : list
+        List of lists of prime numbers
+    text : bool
+        Set False to avoid printing any statements
+
+    Returns
+    -------
+    tuple
+        (remaining, sols) where sols is the partial solution and remaining is the list of decompositions still to be
+        hit, or sols itself if the reduction solved the problem - the same contract as solution_reduction.
+    """
+    primes, bit_of = build_prime_index(prime_decomposition_list)
+    masks = encode_decompositions(prime_decomposition_list, bit_of)
+
+    sol_mask = get_sols_bits(masks)
+    masks = get_remaining_bits(masks, sol_mask)
+    masks = check_if_solved_bits(masks, sol_mask)
+
+    if text:
+        print('checking if problem solved without need for chosen algorithm...\n')
+
+    if masks:
+        sol_mask = check_for_single_remaining_sol_bits(masks, sol_mask)
+        masks = check_if_solved_bits(masks, sol_mask)
+
+    sols = decode_mask(sol_mask, primes)
+
+    if not masks:
+        if text:
+            print('\tMinHitSet complete! solution = {}'.format(sols))
+        return sols, sols
+    else:
+        masks = remove_single_elements_bits(masks)
+        return decode_masks(masks, primes), sols
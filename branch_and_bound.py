@@ -0,0 +1,153 @@
+"""
+Depth first branch-and-bound search for an exact MinHitSet solution.
+
+The search always branches on the smallest decomposition not yet hit, trying each of its primes in turn, so the
+branching factor stays as low as possible. A branch is pruned once the primes picked so far, plus a lower bound on how
+many more are needed, can't beat the best solution found so far. The lower bound is the size of a greedy packing of
+pairwise disjoint unhit decompositions, since no single prime can hit two of them.
+
+Everything is done on bitmasks: each decomposition is a mask over prime bits and each prime is a mask over the
+decompositions it hits. Memory use is bounded by the depth of the search, never by the size of the search space.
+
+The search can also share its upper bound with other solvers running alongside it (see the portfolio algorithm), in
+which case a smaller hitting set found anywhere prunes the search here too.
+"""
+import collections
+from bitsets import build_prime_index, encode_decompositions, decode_mask, iter_bits
+from deadline import as_deadline
+
+BranchAndBoundResult = collections.namedtuple(
+    'BranchAndBoundResult', ['solution', 'lower_bound', 'optimal', 'nodes']
+)
+
+# how many nodes to expand between checks of the clock
+_CLOCK_INTERVAL = 256
+
+
+def disjoint_lower_bound(
+    unhit,
+    set_masks,
+):
+    """Lower bound on the number of primes needed to hit every decomposition in unhit.
+
+    Parameters
+    ----------
+    unhit : int
+        Mask over decomposition indices of those still to be hit.
+    set_masks : list
+        Prime bitmask of each decomposition.
+
+    Returns
+    -------
+    int
+        Size of a greedily built collection of pairwise disjoint unhit decompositions.
+    """
+    used = 0
+    bound = 0
+
+    for j in sorted(iter_bits(unhit), key=lambda j: set_masks[j].bit_count()):
+        if not set_masks[j] & used:
+            used |= set_masks[j]
+            bound += 1
+
+    return bound
+
+
+def branch_and_bound_search(
+    remaining,
+    incumbent=None,
+    time_budget=None,
+    shared_bound=None,
+):
+    """Find a minimum hitting set of remaining by depth first branch-and-bound.
+
+    Parameters
+    ----------
+    remaining : list
+        List of lists of remaining decompositions to be hit.
+    incumbent : list
+        Any known hitting set of remaining (e.g. the greedy one), used as the starting upper bound.
+    time_budget : float / Deadline
+        Seconds to search for, or a Deadline shared with the caller, before giving up and returning the best solution
+        found so far. None searches until the optimum is proven.
+    shared_bound : multiprocessing.Value
+        Optional integer value holding the size of the smallest hitting set known to any process. It's read every so
+        often to prune with, and lowered whenever this search finds something smaller. A completed search then proves
+        that nothing smaller than the final bound exists, even if the hitting set of that size was found elsewhere.
+
+    Returns
+    -------
+    BranchAndBoundResult
+        Named tuple of (solution, lower_bound, optimal, nodes). solution is the best hitting set found, lower_bound the
+        best proven bound on the optimum size, optimal whether the search completed and nodes the count of nodes
+        expanded. The optimality gap is len(solution) - lower_bound. With a shared bound, solution may be larger than
+        lower_bound even when optimal, the optimum having been found by someone else.
+    """
+    if not remaining:
+        return BranchAndBoundResult([], 0, True, 0)
+
+    primes, bit_of = build_prime_index(remaining)
+    set_masks = encode_decompositions(remaining, bit_of)
+
+    hits = [0] * len(primes)
+    for j, mask in enumerate(set_masks):
+        for bit in iter_bits(mask):
+            hits[bit] |= 1 << j
+
+    all_sets = (1 << len(set_masks)) - 1
+    root_bound = disjoint_lower_bound(all_sets, set_masks)
+
+    if incumbent is None:
+        best = [min(iter_bits(mask)) for mask in set_masks]
+    else:
+        best = [bit_of[p] for p in incumbent if p in bit_of]
+    best = list(dict.fromkeys(best))
+    bound = len(best) if shared_bound is None else min(len(best), shared_bound.value)
+
+    deadline = as_deadline(time_budget)
+    nodes = 0
+    optimal = True
+
+    # each frame holds the sets still unhit, the bits picked so far and the candidate bits left to try at this depth
+    stack = [(all_sets, [], None)]
+
+    while stack:
+        unhit, chosen, candidates = stack.pop()
+
+        if candidates is None:
+            nodes += 1
+            if nodes % _CLOCK_INTERVAL == 0:
+                if deadline.passed():
+                    optimal = False
+                    break
+                if shared_bound is not None:
+                    bound = min(bound, shared_bound.value)
+
+            if not unhit:
+                if len(chosen) < bound:
+                    best = chosen
+                    bound = len(best) if shared_bound is None else min(len(best), shared_bound.value)
+                    if shared_bound is not None:
+                        with shared_bound.get_lock():
+                            shared_bound.value = min(shared_bound.value, bound)
+                continue
+
+            if len(chosen) + disjoint_lower_bound(unhit, set_masks) >= bound:
+                continue
+
+            smallest = min(iter_bits(unhit), key=lambda j: set_masks[j].bit_count())
+            candidates = sorted(iter_bits(set_masks[smallest]),
+                                key=lambda bit: (hits[bit] & unhit).bit_count())
+
+        if candidates:
+            bit = candidates.pop()
+            stack.append((unhit, chosen, candidates))
+            stack.append((unhit & ~hits[bit], chosen + [bit], None))
+
+        if bound == root_bound:
+            break
+
+    lower_bound = bound if optimal else root_bound
+    solution = decode_mask(sum(1 << bit for bit in set(best)), primes)
+
+    return BranchAndBoundResult(solution, lower_bound, optimal, nodes)
@@ -0,0 +1,76 @@
+"""
+Splitting MinHitSet into independent sub problems. Two decompositions interact only if they share a prime, so the
+decompositions fall into connected components (joined through shared primes) and any hitting set is just a hitting set
+of each component put together. Solving every component to optimality therefore solves the whole thing to optimality,
+and the search space of the exhaustive style algorithms becomes a sum over components rather than a product.
+"""
+
+
+def _find(
+    parent,
+    p,
+):
+    """Root of p's tree in the union find forest, halving the path on the way up."""
+    while parent[p] != p:
+        parent[p] = parent[parent[p]]
+        p = parent[p]
+
+    return p
+
+
+def prime_components(remaining):
+    """Group the primes of remaining into components, two primes being joined whenever they share a decomposition.
+
+    Parameters
+    ----------
+    remaining : list
+        List of lists of remaining decompositions.
+
+    Returns
+    -------
+    dict
+        Mapping of each prime to the root prime of its component.
+    """
+    parent = {}
+    size = {}
+
+    for decomposition in remaining:
+        for p in decomposition:
+            if p not in parent:
+                parent[p] = p
+                size[p] = 1
+
+        root = _find(parent, decomposition[0])
+        for p in decomposition[1:]:
+            other = _find(parent, p)
+            if other != root:
+                # union by size keeps the trees shallow
+                if size[other] > size[root]:
+                    root, other = other, root
+                parent[other] = root
+                size[root] += size[other]
+
+    return {p: _find(parent, p) for p in parent}
+
+
+def connected_components(remaining):
+    """Split remaining into groups of decompositions that share no primes with any other group.
+
+    Parameters
+    ----------
+    remaining : list
+        List of lists of remaining decompositions.
+
+    Returns
+    -------
+    list
+        List of components, each a list of decompositions. Components come in the order their first decomposition
+        appears in remaining, and keep the order of remaining within them.
+    """
+    root_of = prime_components(remaining)
+    components = {}
+
+    for decomposition in remaining:
+        components.setdefault(root_of[decomposition[0]], []).append(decomposition)
+
+    return list(components.values())
@@ -0,0 +1,227 @@
+"""
+Incremental bookkeeping of how well a candidate solution hits the decompositions, for the local search algorithms.
+
+Rather than rechecking every decomposition each time a prime enters or leaves the solution, a hit count is kept per
+decomposition along with an index of which decompositions each prime appears in. Adding or removing a prime then only
+touches the decompositions that prime appears in.
+"""
+import collections
+import random
+
+
+class CoverageState:
+    """Hit counts of a candidate solution against a fixed list of decompositions.
+
+    Parameters
+    ----------
+    remaining : list
+        List of lists of decompositions to be hit.
+    solution : iterable
+        Primes in the starting solution. Primes appearing in no decomposition are kept but hit nothing.
+    """
+
+    def __init__(
+        self,
+        remaining,
+        solution=(),
+    ):
+        self.remaining = remaining
+        self.sets_of = collections.defaultdict(list)
+        for j, decomposition in enumerate(remaining):
+            for p in decomposition:
+                self.sets_of[p].append(j)
+
+        self.hit_counts = [0] * len(remaining)
+        self.solution = set()
+        self._members = []
+        self._member_position = {}
+
+        # unhit decomposition indices, kept as a list plus positions so one can be drawn at random in O(1)
+        self.unhit_sets = list(range(len(remaining)))
+        self._unhit_position = list(range(len(remaining)))
+
+        for p in solution:
+            self.add(p)
+
+    @property
+    def unhit(self):
+        """Number of decompositions not hit by the solution."""
+        return len(self.unhit_sets)
+
+    def is_solved(self):
+        """True when every decomposition is hit at least once."""
+        return not self.unhit_sets
+
+    def random_unhit(self, rng=random):
+        """Draw an unhit decomposition index uniformly at random.
+
+        Parameters
+        ----------
+        rng : random.Random
+            Source of randomness. Defaults to the random module itself.
+
+        Returns
+        -------
+        int
+            Index into remaining of a decomposition the solution doesn't hit.
+        """
+        return self.unhit_sets[rng.randrange(len(self.unhit_sets))]
+
+    def random_member(self, rng=random):
+        """Draw a prime from the solution uniformly at random.
+
+        Parameters
+        ----------
+        rng : random.Random
+            Source of randomness. Defaults to the random module itself.
+
+        Returns
+        -------
+        int
+            A prime in the solution.
+        """
+        return self._members[rng.randrange(len(self._members))]
+
+    def _mark_hit(self, j):
+        """Drop j from the unhit list by swapping the last entry into its place."""
+        position = self._unhit_position[j]
+        last = self.unhit_sets.pop()
+
+        if last != j:
+            self.unhit_sets[position] = last
+            self._unhit_position[last] = position
+
+    def _mark_unhit(self, j):
+        """Append j to the unhit list."""
+        self._unhit_position[j] = len(self.unhit_sets)
+        self.unhit_sets.append(j)
+
+    def can_remove(self, p):
+        """Check if p could leave the solution without leaving any decomposition unhit. Costs O(degree of p).
+
+        Parameters
+        ----------
+        p : int
+            Prime to check.
+
+        Returns
+        -------
+        bool
+            True if p is in the solution and every decomposition containing it is hit by some other prime too.
+        """
+        return p in self.solution and all(self.hit_counts[j] > 1 for j in self.sets_of.get(p, ()))
+
+    def add(self, p):
+        """Put p into the solution.
+
+        Parameters
+        ----------
+        p : int
+            Prime to add. Does nothing if it is already in the solution.
+
+        Returns
+        -------
+        int
+            Number of decompositions newly hit.
+        """
+        if p in self.solution:
+            return 0
+
+        self.solution.add(p)
+        self._member_position[p] = len(self._members)
+        self._members.append(p)
+        newly_hit = 0
+
+        for j in self.sets_of.get(p, ()):
+            if self.hit_counts[j] == 0:
+                newly_hit += 1
+                self._mark_hit(j)
+            self.hit_counts[j] += 1
+
+        return newly_hit
+
+    def remove(self, p):
+        """Take p out of the solution, whether or not that leaves decompositions unhit.
+
+        Parameters
+        ----------
+        p : int
+            Prime to remove. Does nothing if it isn't in the solution.
+
+        Returns
+        -------
+        int
+            Number of decompositions left unhit by the removal.
+        """
+        if p not in self.solution:
+            return 0
+
+        self.solution.discard(p)
+        position = self._member_position.pop(p)
+        last = self._members.pop()
+        if last != p:
+            self._members[position] = last
+            self._member_position[last] = position
+        newly_unhit = 0
+
+        for j in self.sets_of.get(p, ()):
+            self.hit_counts[j] -= 1
+            if self.hit_counts[j] == 0:
+                newly_unhit += 1
+                self._mark_unhit(j)
+
+        return newly_unhit
+
+    def removal_cost(self, p):
+        """Number of decompositions that would be left unhit if p were removed.
+
+        Parameters
+        ----------
+        p : int
+            Prime in the solution.
+
+        Returns
+        -------
+        int
+            Count of decompositions hit by p alone.
+        """
+        return sum(1 for j in self.sets_of.get(p, ()) if self.hit_counts[j] == 1)
+
+    def addition_gain(self, p):
+        """Number of decompositions that would be newly hit if p were added.
+
+        Parameters
+        ----------
+        p : int
+            Prime not in the solution.
+
+        Returns
+        -------
+        int
+            Count of currently unhit decompositions containing p.
+        """
+        return sum(1 for j in self.sets_of.get(p, ()) if self.hit_counts[j] == 0)
+
+    def remove_redundant(self, order=None):
+        """Sweep through the solution once, removing every prime that can go without leaving anything unhit.
+
+        Parameters
+        ----------
+        order : iterable
+            Order to try the primes in. Defaults to least useful first, i.e. those appearing in fewest decompositions.
+
+        Returns
+        -------
+        list
+            The primes removed, in the order they were removed.
+        """
+        if order is None:
+            order = sorted(self.solution, key=lambda p: len(self.sets_of.get(p, ())))
+
+        removed = []
+        for p in list(order):
+            if self.can_remove(p):
+                self.remove(p)
+                removed.append(p)
+
+        return removed
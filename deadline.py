@@ -0,0 +1,87 @@
+"""
+Shared time budget for the algorithms. minimum_prime_hitting_set hands every algorithm a time_budget, which it turns
+into a Deadline and checks every so often in its main loop. When the deadline passes the algorithm stops and returns the
+best hitting set it has, and since the Deadline remembers that it expired the algorithm can report it was cut off rather
+than finished.
+
+A time_budget can also be a Deadline already, which is how a budget is handed on from one algorithm to another (i.e.
+from components to the algorithm solving each component) without the clock restarting at every hop.
+
+A Deadline can also be given a cancelled check, which lets whoever handed the work out stop it early (see service.py)
+without every algorithm needing to know about cancellation.
+"""
+import time
+
+
+class Deadline:
+    """A point in time after which work should stop.
+
+    The clock is time.monotonic, which on every platform we run on is shared between processes, so a Deadline can be
+    sent to worker processes and still mean the same moment there.
+
+    Parameters
+    ----------
+    time_budget : float
+        Seconds from now until the deadline. None never expires.
+    cancelled : callable
+        Optional function of no arguments returning True once the work has been cancelled, at which point the deadline
+        counts as passed. Needs to pickle if the Deadline is to be sent to other processes.
+    """
+
+    def __init__(self, time_budget=None, cancelled=None):
+        self.expires_at = None if time_budget is None else time.monotonic() + time_budget
+        self.cancelled = cancelled
+        self.expired = False
+
+    def passed(self):
+        """Check if the deadline has passed, remembering if so.
+
+        Returns
+        -------
+        bool
+            True once the deadline has passed or the work has been cancelled. Always False for a deadline with no time
+            budget that can't be cancelled.
+        """
+        if not self.expired and (
+            (self.expires_at is not None and time.monotonic() >= self.expires_at)
+            or (self.cancelled is not None and self.cancelled())
+        ):
+            self.expired = True
+
+        return self.expired
+
+    def remaining(self):
+        """Seconds left before the deadline.
+
+        Returns
+        -------
+        float / None
+            Seconds left, never below 0, or None for a deadline with no time budget. Always 0 once it has passed.
+        """
+        if self.passed():
+            return 0.0
+
+        if self.expires_at is None:
+            return None
+
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+
+def as_deadline(time_budget):
+    """The Deadline for a time budget.
+
+    Parameters
+    ----------
+    time_budget : float / Deadline / None
+        Seconds from now, a Deadline already running, or None for no deadline.
+
+    Returns
+    -------
+    Deadline
+        time_budget itself if it's already a Deadline, so the clock is shared rather than restarted, otherwise a new
+        one.
+    """
+    if isinstance(time_budget, Deadline):
+        return time_budget
+
+    return Deadline(time_budget)
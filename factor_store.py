@@ -0,0 +1,181 @@
+"""
+On disk store of prime factorisations, shared between runs and between processes.
+
+A store is a directory holding two files:
+
+- spf.npy, the smallest prime factor table up to some limit, saved with numpy. It is opened with np.load(mmap_mode='r')
+  so every process reading it maps the same pages of the OS file cache, there's no per process copy and nothing to
+  rebuild on start up.
+- large.sqlite, a key value table of the prime factors of values above the limit that have been factored before, so
+  Pollard's rho is only ever run once per value.
+
+Build a store once with build_factor_store, then call open_factor_store in each process (i.e. as a process pool
+initializer) to put it behind prime_factor_decomposition and get_prime_decomposition_list.
+"""
+import json
+import os
+import sqlite3
+import numpy as np
+from factorisation import build_smallest_prime_factor_sieve, set_factor_store
+
+SPF_FILENAME = 'spf.npy'
+LARGE_FILENAME = 'large.sqlite'
+
+
+def _large_path(directory, writable):
+    """SQLite URI of the large value table, read only unless writable."""
+    path = os.path.abspath(os.path.join(directory, LARGE_FILENAME))
+
+    return 'file:{}?mode={}'.format(path, 'rw' if writable else 'ro')
+
+
+def build_factor_store(
+    directory,
+    limit=10 ** 7,
+):
+    """Create a factor store, or rebuild the spf table of an existing one. Any large values already stored are kept.
+
+    Parameters
+    ----------
+    directory : str
+        Directory to hold the store, created if it doesn't exist.
+    limit : int
+        Largest value covered by the spf table. The table takes 4 bytes per value.
+
+    Returns
+    -------
+    str
+        The directory.
+    """
+    os.makedirs(directory, exist_ok=True)
+
+    # written to the side and renamed into place, so readers never see half a table
+    temporary = os.path.join(directory, 'spf.tmp.npy')
+    np.save(temporary, build_smallest_prime_factor_sieve(limit))
+    os.replace(temporary, os.path.join(directory, SPF_FILENAME))
+
+    connection = sqlite3.connect(os.path.join(directory, LARGE_FILENAME))
+    connection.execute('CREATE TABLE IF NOT EXISTS factors (value TEXT PRIMARY KEY, primes TEXT)')
+    connection.commit()
+    connection.close()
+
+    return directory
+
+
+class FactorStore:
+    """An open factor store.
+
+    Parameters
+    ----------
+    directory : str
+        Directory made by build_factor_store.
+    writable : bool
+        Set True to allow newly factored large values to be added. Leave False in worker processes, which then share
+        the store without any locking.
+    """
+
+    def __init__(
+        self,
+        directory,
+        writable=False,
+    ):
+        self.directory = directory
+        self.writable = writable
+        self.spf = np.load(os.path.join(directory, SPF_FILENAME), mmap_mode='r')
+        self.connection = sqlite3.connect(_large_path(directory, writable), uri=True)
+
+    @property
+    def limit(self):
+        """Largest value covered by the spf table."""
+        return len(self.spf) - 1
+
+    def get_many(self, values):
+        """Look up the stored factors of any of values.
+
+        Parameters
+        ----------
+        values : list
+            Integers above the limit.
+
+        Returns
+        -------
+        dict
+            Mapping of each value found to the sorted list of its prime factors. Values not in the store are left out.
+        """
+        found = {}
+        values = list(values)
+
+        # batched to stay under sqlite's limit on the number of parameters in a query
+        for start in range(0, len(values), 500):
+            chunk = [str(val) for val in values[start:start + 500]]
+            rows = self.connection.execute(
+                'SELECT value, primes FROM factors WHERE value IN ({})'.format(', '.join('?' * len(chunk))),
+                chunk,
+            )
+            for value, primes in rows:
+                found[int(value)] = json.loads(primes)
+
+        return found
+
+    def put_many(self, factors):
+        """Add the factors of some large values to the store.
+
+        Parameters
+        ----------
+        factors : dict
+            Mapping of value to the sorted list of its prime factors.
+
+        Raises
+        ------
+        ValueError
+            If the store was opened read only.
+        """
+        if not self.writable:
+            raise ValueError('factor store at {} was opened read only'.format(self.directory))
+
+        self.connection.executemany(
+            'INSERT OR REPLACE INTO factors (value, primes) VALUES (?, ?)',
+            [(str(val), json.dumps([int(p) for p in primes])) for val, primes in factors.items()],
+        )
+        self.connection.commit()
+
+    def close(self):
+        """Close the large value table. The spf table is unmapped once nothing references it."""
+        self.connection.close()
+
+
+def open_factor_store(
+    directory,
+    writable=False,
+):
+    """Open a factor store and put it behind all factorisation in this process. Suitable as a process pool initializer,
+    i.e. ProcessPoolExecutor(initializer=open_factor_store, initargs=(directory,)).
+
+    Parameters
+    ----------
+    directory : str
+        Directory made by build_factor_store.
+    writable : bool
+        Set True to add newly factored large values to the store.
+
+    Returns
+    -------
+    FactorStore
+        The open store.
+    """
+    store = FactorStore(directory, writable)
+    set_factor_store(store)
+
+    return store
+
+
+def close_factor_store(store):
+    """Take a store opened with open_factor_store out of use and close it.
+
+    Parameters
+    ----------
+    store : FactorStore
+        The store to close.
+    """
+    set_factor_store(None)
+    store.close()
@@ -0,0 +1,455 @@
+"""
+Prime factorisation engine used to break the input integers down into their unique prime factors.
+
+Values up to the sieve limit are factored by walking a precomputed smallest prime factor (spf) table, which costs one
+lookup per prime factor. Anything above the limit has its small factors stripped by trial division and the leftover
+cofactor is split with Pollard's rho, using Miller-Rabin to decide when a piece is prime.
+
+Both can be backed by an on disk factor store (see factor_store.py), in which case the spf table is memory mapped from
+disk rather than built, and the factors of large values are looked up before falling back to Pollard's rho.
+
+TODO - consider a segmented sieve if we ever want limits much past 10^8
+"""
+import collections
+import itertools
+import math
+import random
+import numpy as np
+
+DEFAULT_SIEVE_LIMIT = 10 ** 6
+
+# rough number of sieve entries that cost as much to build as factoring one value with Pollard's rho
+SIEVE_ENTRIES_PER_RHO = 1000
+
+# bases that make Miller-Rabin deterministic for every n < 3.3 * 10^24, past that the test is probabilistic
+MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+_sieve_limit = DEFAULT_SIEVE_LIMIT
+_sieve = None
+_store = None
+
+CompactDecomposition = collections.namedtuple('CompactDecomposition', ['values', 'offsets', 'primes', 'inverse'])
+
+
+def build_smallest_prime_factor_sieve(limit):
+    """Build a table holding the smallest prime factor of every integer up to limit.
+
+    Parameters
+    ----------
+    limit : int
+        Largest value to be covered by the table.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of length limit + 1 where entry i is the smallest prime dividing i, for i >= 2. Entries 0 and 1 are 0.
+    """
+    limit = max(int(limit), 2)
+    dtype = np.int32 if limit < 2 ** 31 else np.int64
+
+    spf = np.zeros(limit + 1, dtype=dtype)
+    spf[2::2] = 2
+
+    for p in range(3, math.isqrt(limit) + 1, 2):
+        if spf[p] == 0:
+            multiples = spf[p * p::2 * p]
+            multiples[multiples == 0] = p
+
+    unmarked = np.flatnonzero(spf == 0)
+    unmarked = unmarked[unmarked >= 2]
+    spf[unmarked] = unmarked
+
+    return spf
+
+
+def set_sieve_limit(limit):
+    """Set the largest value factored via the sieve. Values above this go through Pollard's rho instead, unless a batch
+    holds enough of them for compact_prime_factors to grow the sieve.
+
+    Parameters
+    ----------
+    limit : int
+        New sieve limit. The table itself is only (re)built the next time it is needed.
+    """
+    global _sieve_limit, _sieve
+
+    _sieve_limit = max(int(limit), 2)
+
+    if _sieve is not None and len(_sieve) - 1 != _sieve_limit:
+        _sieve = None
+
+
+def set_factor_store(store):
+    """Put a factor store behind every factorisation in this process, or take it away again.
+
+    Parameters
+    ----------
+    store : factor_store.FactorStore / None
+        Open store whose spf table becomes the shared sieve, and whose large value entries are checked before running
+        Pollard's rho. None goes back to building the sieve in memory, at the default limit.
+    """
+    global _store, _sieve, _sieve_limit
+
+    _store = store
+
+    if store is None:
+        _sieve_limit = DEFAULT_SIEVE_LIMIT
+        _sieve = None
+    else:
+        _sieve = store.spf
+        _sieve_limit = len(store.spf) - 1
+
+
+def get_sieve():
+    """Get the shared smallest prime factor table, building it on first use.
+
+    Returns
+    -------
+    numpy.ndarray
+        Smallest prime factor table covering every value up to the current sieve limit.
+    """
+    global _sieve
+
+    if _sieve is None:
+        _sieve = build_smallest_prime_factor_sieve(_sieve_limit)
+
+    return _sieve
+
+
+def is_probable_prime(n):
+    """Miller-Rabin primality test. Deterministic for all n < 3.3 * 10^24.
+
+    Parameters
+    ----------
+    n : int
+        Integer to test.
+
+    Returns
+    -------
+    bool
+        True if n is (almost certainly) prime.
+    """
+    if n < 2:
+        return False
+
+    for p in MILLER_RABIN_BASES:
+        if n % p == 0:
+            return n == p
+
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    for a in MILLER_RABIN_BASES:
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+
+    return True
+
+
+def pollard_rho(n):
+    """Find a non trivial factor of a composite n using Brent's variant of Pollard's rho.
+
+    Parameters
+    ----------
+    n : int
+        Odd composite integer to split.
+
+    Returns
+    -------
+    int
+        A factor d of n with 1 < d < n.
+    """
+    if n % 2 == 0:
+        return 2
+
+    rng = random.Random(n)  # seeded on n so repeated calls behave identically
+
+    while True:
+        y = rng.randrange(1, n)
+        c = rng.randrange(1, n)
+        m = 128
+        g = r = q = 1
+
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+
+            r *= 2
+
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+
+        if g != n:
+            return g
+
+
+def _factor_with_sieve(val, sieve):
+    """Unique prime factors of a value covered by the sieve."""
+    factors = set()
+
+    while val > 1:
+        p = int(sieve[val])
+        factors.add(p)
+        val //= p
+
+    return factors
+
+
+def _factor_large(val, sieve):
+    """Unique prime factors of a value above the sieve limit."""
+    factors = set()
+
+    # strip the small primes first, Pollard's rho is slow to find these compared to plain division
+    for p in (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47):
+        if val % p == 0:
+            factors.add(p)
+            while val % p == 0:
+                val //= p
+
+    stack = [val] if val > 1 else []
+
+    while stack:
+        n = stack.pop()
+
+        if n < len(sieve):
+            factors |= _factor_with_sieve(n, sieve)
+        elif is_probable_prime(n):
+            factors.add(n)
+        else:
+            d = pollard_rho(n)
+            stack.extend([d, n // d])
+
+    return factors
+
+
+def _factor_many_large(values, sieve):
+    """Unique prime factors of several values above the sieve limit, going through the factor store if there is one.
+
+    Returns
+    -------
+    dict
+        Mapping of each value to the sorted list of its prime factors.
+    """
+    factors = _store.get_many(values) if _store is not None else {}
+    missing = {val: sorted(_factor_large(val, sieve)) for val in values if val not in factors}
+
+    if missing and _store is not None and _store.writable:
+        _store.put_many(missing)
+
+    factors.update(missing)
+
+    return factors
+
+
+def prime_factors(val, sieve=None):
+    """Reduce an integer to its unique prime factors.
+
+    Parameters
+    ----------
+    val : int
+        An integer to be decomposed.
+    sieve : numpy.ndarray
+        Smallest prime factor table to use. Defaults to the shared table sized by the current sieve limit.
+
+    Returns
+    -------
+    list
+        Sorted list of the unique prime factors of val, or an empty list if val is in [-1, 0, 1].
+    """
+    val = abs(int(val))
+
+    if val < 2:
+        return []
+
+    if sieve is None:
+        sieve = get_sieve()
+
+    if val < len(sieve):
+        return sorted(_factor_with_sieve(val, sieve))
+    else:
+        return _factor_many_large([val], sieve)[val]
+
+
+def _sieve_for_values(values, max_sieve_limit):
+    """Get the shared sieve, first growing it to cover values (up to max_sieve_limit) if there are enough of them above
+    it to be worth the build. A few values are cheaper to put through Pollard's rho, and a grown sieve is kept so the
+    build is only paid for once. A sieve from the factor store is never grown."""
+    global _sieve, _sieve_limit
+
+    shared = get_sieve()
+    limit = min(max(values), max_sieve_limit)
+    above = sum(1 for val in values if len(shared) <= val <= limit)
+
+    if _store is not None or above * SIEVE_ENTRIES_PER_RHO < limit:
+        return shared
+
+    _sieve = build_smallest_prime_factor_sieve(limit)
+    _sieve_limit = limit
+
+    return _sieve
+
+
+def _factor_many_with_sieve(values, sieve):
+    """Factor an array of distinct values covered by the sieve all at once.
+
+    Every pass looks up the smallest prime factor of each value still above 1 and divides it out, so the loop runs at
+    most log2(max(values)) times regardless of how many values there are.
+
+    Returns
+    -------
+    tuple
+        (offsets, primes) arrays in compressed sparse row form, where the primes of values[i] are
+        primes[offsets[i]:offsets[i + 1]] in ascending order.
+    """
+    rows = []
+    cols = []
+    current = values.astype(np.int64)
+    index = np.arange(len(values))
+
+    keep = current > 1
+    current, index = current[keep], index[keep]
+
+    while len(current):
+        p = sieve[current].astype(np.int64)
+        rows.append(index)
+        cols.append(p)
+
+        current = current // p
+        keep = current > 1
+        current, index = current[keep], index[keep]
+
+    if rows:
+        rows = np.concatenate(rows)
+        cols = np.concatenate(cols)
+        pairs = np.unique(np.stack([rows, cols], axis=1), axis=0)
+        rows, cols = pairs[:, 0], pairs[:, 1]
+    else:
+        rows = cols = np.zeros(0, dtype=np.int64)
+
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(np.bincount(rows, minlength=len(values)))
+
+    return offsets, cols
+
+
+def compact_prime_factors(int_list, max_sieve_limit=10 ** 7):
+    """Factorise a whole list of integers, factoring each distinct absolute value only once.
+
+    Every distinct value covered by the shared sieve is factored in one vectorised pass, and the rest go through
+    Pollard's rho one at a time. When enough values fall above the shared sieve it's grown to cover them first, up to
+    max_sieve_limit, and kept at that size for later calls.
+
+    Parameters
+    ----------
+    int_list : list
+        List of integers to factorise.
+    max_sieve_limit : int
+        Largest the shared sieve will be grown to for the batch. Values above this are factored with Pollard's rho.
+
+    Returns
+    -------
+    CompactDecomposition
+        Named tuple of (values, offsets, primes, inverse). values holds the distinct absolute inputs, the primes of
+        values[i] are primes[offsets[i]:offsets[i + 1]], and int_list[j] maps to values[inverse[j]].
+    """
+    index_of = {}
+    inverse = np.empty(len(int_list), dtype=np.int64)
+
+    for position, val in enumerate(int_list):
+        val = abs(int(val))
+        inverse[position] = index_of.setdefault(val, len(index_of))
+
+    values = list(index_of)
+    if not values:
+        empty = np.zeros(0, dtype=np.int64)
+        return CompactDecomposition(values, np.zeros(1, dtype=np.int64), empty, inverse)
+
+    sieve = _sieve_for_values(values, max_sieve_limit)
+    covered = [i for i, val in enumerate(values) if val < len(sieve)]
+    offsets, primes = _factor_many_with_sieve(np.array([values[i] for i in covered], dtype=np.int64), sieve)
+
+    counts = np.zeros(len(values), dtype=np.int64)
+    counts[covered] = np.diff(offsets)
+
+    if len(covered) == len(values):
+        all_primes = primes
+    else:
+        # stitch the Pollard's rho results for the large values back in amongst the sieved ones
+        pieces = [[] for _ in values]
+        for j, i in enumerate(covered):
+            pieces[i] = primes[offsets[j]:offsets[j + 1]].tolist()
+        large = _factor_many_large([val for val in values if val >= len(sieve)], sieve)
+        for i, val in enumerate(values):
+            if val >= len(sieve):
+                pieces[i] = large[val]
+                counts[i] = len(pieces[i])
+        all_primes = np.array(list(itertools.chain.from_iterable(pieces)), dtype=object)
+        if all(p < 2 ** 63 for p in all_primes):
+            all_primes = all_primes.astype(np.int64)
+
+    all_offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    all_offsets[1:] = np.cumsum(counts)
+
+    return CompactDecomposition(values, all_offsets, all_primes, inverse)
+
+
+def expand_compact_decomposition(compact):
+    """Turn a CompactDecomposition back into one list of primes per original input, in input order.
+
+    Parameters
+    ----------
+    compact : CompactDecomposition
+        Output of compact_prime_factors.
+
+    Returns
+    -------
+    list
+        List of lists of primes, one per input integer. -1, 0 and 1 map to empty lists.
+    """
+    offsets = compact.offsets.tolist()
+    primes = compact.primes.tolist()
+    distinct = [primes[offsets[i]:offsets[i + 1]] for i in range(len(compact.values))]
+
+    return [list(distinct[i]) for i in compact.inverse.tolist()]
+
+
+def batch_prime_factors(int_list, max_sieve_limit=10 ** 7):
+    """Factorise a whole list of integers through one shared sieve, factoring repeated values only once.
+
+    Parameters
+    ----------
+    int_list : list
+        List of integers to factorise.
+    max_sieve_limit : int
+        Largest the shared sieve will be grown to for the batch. Values above this are factored with Pollard's rho.
+
+    Returns
+    -------
+    list
+        List of sorted unique prime factor lists, one per input integer in input order. -1, 0 and 1 map to empty lists.
+    """
+    return expand_compact_decomposition(compact_prime_factors(int_list, max_sieve_limit))
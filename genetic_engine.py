@@ -0,0 +1,445 @@
+"""
+Genetic algorithm engine for MinHitSet, with the whole population held as a boolean numpy matrix (individuals x
+primes). Crossover, mutation and repair all act on the full matrix at once, and every generation is scored with a single
+matrix product against the (primes x sets) incidence matrix.
+
+An island mode runs several independent populations in worker processes, swapping their best individuals around a
+ring every few generations.
+
+Children that fail to hit every decomposition aren't thrown away but repaired, greedily adding whichever prime hits the
+most of their unhit decompositions, and then trimmed of any primes left redundant. Every individual in the population is
+therefore always a valid solution and fitness is just the number of primes it holds.
+"""
+import collections
+import multiprocessing
+import numpy as np
+from hit_check import build_incidence_matrix, hit_counts
+from deadline import as_deadline
+
+GeneticResult = collections.namedtuple('GeneticResult', ['solution', 'generations', 'history', 'timed_out'])
+IslandResult = collections.namedtuple('IslandResult', ['solution', 'epochs', 'island_stats', 'timed_out'])
+
+
+def greedy_repair(
+    population,
+    incidence,
+    rng,
+):
+    """Make every individual a hitting set by greedily adding primes, all individuals being repaired in parallel.
+
+    Parameters
+    ----------
+    population : numpy.ndarray
+        Boolean (individuals x primes) matrix. Modified in place.
+    incidence : numpy.ndarray
+        Boolean (primes x sets) incidence matrix.
+    rng : numpy.random.Generator
+        Source of randomness, used to break ties between equally good primes.
+
+    Returns
+    -------
+    numpy.ndarray
+        Integer (individuals x sets) hit counts of the repaired population.
+    """
+    counts = hit_counts(population, incidence)
+    incidence_t = incidence.T.astype(np.float32)
+
+    unhit = counts == 0
+    rows = np.flatnonzero(unhit.any(axis=1))
+
+    while len(rows):
+        gains = unhit[rows].astype(np.float32) @ incidence_t
+        gains += rng.random(gains.shape, dtype=np.float32) * 0.5  # ties broken at random, never reorders real gains
+        picks = gains.argmax(axis=1)
+
+        population[rows, picks] = True
+        counts[rows] += incidence[picks]
+
+        unhit = counts == 0
+        rows = np.flatnonzero(unhit.any(axis=1))
+
+    return counts
+
+
+def trim_redundant(
+    population,
+    counts,
+    incidence,
+    rng,
+):
+    """Drop any prime whose decompositions are all hit by something else too, sweeping the primes in a random order.
+
+    Parameters
+    ----------
+    population : numpy.ndarray
+        Boolean (individuals x primes) matrix of hitting sets. Modified in place.
+    counts : numpy.ndarray
+        Integer (individuals x sets) hit counts of population. Modified in place.
+    incidence : numpy.ndarray
+        Boolean (primes x sets) incidence matrix.
+    rng : numpy.random.Generator
+        Source of randomness for the sweep order.
+    """
+    for k in rng.permutation(incidence.shape[0]):
+        sets_k = np.flatnonzero(incidence[k])
+        removable = np.flatnonzero(population[:, k] & (counts[:, sets_k] > 1).all(axis=1))
+
+        if len(removable):
+            population[removable, k] = False
+            counts[np.ix_(removable, sets_k)] -= 1
+
+
+def random_population(
+    incidence,
+    population_size,
+    rng,
+):
+    """Generate a repaired and trimmed population of random solutions.
+
+    Parameters
+    ----------
+    incidence : numpy.ndarray
+        Boolean (primes x sets) incidence matrix.
+    population_size : int
+        Number of individuals.
+    rng : numpy.random.Generator
+        Source of randomness.
+
+    Returns
+    -------
+    numpy.ndarray
+        Boolean (individuals x primes) matrix of hitting sets.
+    """
+    density = rng.uniform(0.0, 0.5, size=(population_size, 1))
+    population = rng.random((population_size, incidence.shape[0])) < density
+
+    counts = greedy_repair(population, incidence, rng)
+    trim_redundant(population, counts, incidence, rng)
+
+    return population
+
+
+def tournament_select(
+    fitness,
+    n,
+    rng,
+):
+    """Pick n parents by binary tournament, the individual with fewer primes winning each.
+
+    Parameters
+    ----------
+    fitness : numpy.ndarray
+        Number of primes held by each individual.
+    n : int
+        Number of parents to pick.
+    rng : numpy.random.Generator
+        Source of randomness.
+
+    Returns
+    -------
+    numpy.ndarray
+        Indices of the chosen parents.
+    """
+    contestants = rng.integers(0, len(fitness), size=(n, 2))
+    first_wins = fitness[contestants[:, 0]] <= fitness[contestants[:, 1]]
+
+    return np.where(first_wins, contestants[:, 0], contestants[:, 1])
+
+
+def next_generation(
+    population,
+    incidence,
+    rng,
+    crossover_rate=0.9,
+    mutation_rate=0.02,
+    elite=2,
+):
+    """Breed the next generation: keep the elite, fill the rest with uniform crossover children of tournament winners,
+    flip random genes, then repair and trim every child.
+
+    Parameters
+    ----------
+    population : numpy.ndarray
+        Boolean (individuals x primes) matrix of hitting sets.
+    incidence : numpy.ndarray
+        Boolean (primes x sets) incidence matrix.
+    rng : numpy.random.Generator
+        Source of randomness.
+    crossover_rate : float
+        Chance a child mixes both parents rather than copying the first.
+    mutation_rate : float
+        Chance each gene of each child is flipped.
+    elite : int
+        Number of best individuals carried over unchanged.
+
+    Returns
+    -------
+    numpy.ndarray
+        Boolean (individuals x primes) matrix of the new population, the same size as the old.
+    """
+    fitness = population.sum(axis=1)
+    elite = min(elite, len(population))
+    n_children = len(population) - elite
+
+    elites = population[np.argsort(fitness, kind='stable')[:elite]]
+
+    mothers = population[tournament_select(fitness, n_children, rng)]
+    fathers = population[tournament_select(fitness, n_children, rng)]
+
+    from_mother = rng.random(mothers.shape) < 0.5
+    from_mother |= (rng.random(n_children) >= crossover_rate)[:, None]
+    children = np.where(from_mother, mothers, fathers)
+
+    children ^= rng.random(children.shape) < mutation_rate
+
+    counts = greedy_repair(children, incidence, rng)
+    trim_redundant(children, counts, incidence, rng)
+
+    return np.vstack([elites, children])
+
+
+def best_individual(population):
+    """Index of the individual holding the fewest primes.
+
+    Parameters
+    ----------
+    population : numpy.ndarray
+        Boolean (individuals x primes) matrix of hitting sets.
+
+    Returns
+    -------
+    int
+        Row index of the best individual.
+    """
+    return int(np.argmin(population.sum(axis=1)))
+
+
+def run_genetic_algorithm(
+    remaining,
+    population_size=50,
+    generations=100,
+    crossover_rate=0.9,
+    mutation_rate=0.02,
+    elite=2,
+    stale_generations=10,
+    time_budget=None,
+    seed=None,
+):
+    """Evolve a population of hitting sets for remaining, stopping after a number of generations, once the best
+    solution has gone stale_generations without improving, or when the time budget runs out.
+
+    Parameters
+    ----------
+    remaining : list
+        List of lists of remaining decompositions to hit.
+    population_size : int
+        Number of individuals in the population.
+    generations : int
+        Maximum number of generations to breed.
+    crossover_rate : float
+        Chance a child mixes both parents rather than copying the first.
+    mutation_rate : float
+        Chance each gene of each child is flipped.
+    elite : int
+        Number of best individuals carried over unchanged each generation.
+    stale_generations : int
+        Stop once this many generations pass without the best solution improving.
+    time_budget : float / Deadline
+        Seconds to run for at most, or a Deadline shared with the caller. None runs until one of the other stopping
+        conditions.
+    seed : int
+        Seed for the run.
+
+    Returns
+    -------
+    GeneticResult
+        Named tuple of (solution, generations, history, timed_out) - the best solution found as a list of primes, the
+        number of generations bred, the best solution size after each generation and whether the time budget cut the
+        run short.
+    """
+    if not remaining:
+        return GeneticResult([], 0, [], False)
+
+    rng = np.random.default_rng(seed)
+    primes, _, incidence = build_incidence_matrix(remaining)
+    deadline = as_deadline(time_budget)
+
+    population = random_population(incidence, population_size, rng)
+    best = population[best_individual(population)].copy()
+    history = [int(best.sum())]
+    stale = 0
+    generation = 0
+    timed_out = False
+
+    while generation < generations and stale < stale_generations:
+        if deadline.passed():
+            timed_out = True
+            break
+
+        population = next_generation(population, incidence, rng, crossover_rate, mutation_rate, elite)
+        generation += 1
+
+        candidate = population[best_individual(population)]
+        if candidate.sum() < best.sum():
+            best = candidate.copy()
+            stale = 0
+        else:
+            stale += 1
+        history.append(int(best.sum()))
+
+    return GeneticResult([primes[k] for k in np.flatnonzero(best)], generation, history, timed_out)
+
+
+def _island_worker(
+    remaining,
+    conn,
+    seed_sequence,
+    population_size,
+    crossover_rate,
+    mutation_rate,
+    elite,
+    migration_interval,
+    migrants,
+    deadline,
+):
+    """Evolve one island's population in a worker process.
+
+    After every migration_interval generations the island's best migrants individuals (and its generation count) are
+    sent up conn, or sooner if the deadline passes part way through. The reply is either the migrants to take in,
+    replacing the island's worst individuals, or None to stop.
+    """
+    rng = np.random.default_rng(seed_sequence)
+    _, _, incidence = build_incidence_matrix(remaining)
+    population = random_population(incidence, population_size, rng)
+    generation = 0
+
+    while True:
+        for _ in range(migration_interval):
+            if deadline.passed():
+                break
+            population = next_generation(population, incidence, rng, crossover_rate, mutation_rate, elite)
+            generation += 1
+
+        order = np.argsort(population.sum(axis=1), kind='stable')
+        conn.send((population[order[:migrants]], generation))
+
+        incoming = conn.recv()
+        if incoming is None:
+            break
+        population[order[len(order) - len(incoming):]] = incoming
+
+    conn.close()
+
+
+def run_island_genetic_algorithm(
+    remaining,
+    islands=4,
+    migration_interval=5,
+    migrants=2,
+    epochs=20,
+    stale_epochs=4,
+    time_budget=None,
+    population_size=50,
+    crossover_rate=0.9,
+    mutation_rate=0.02,
+    elite=2,
+    seed=None,
+):
+    """Run the GA as an island model, each island being an independent population evolving in its own process.
+
+    Islands run migration_interval generations at a time (an epoch), then each sends its best migrants individuals to
+    the next island round a ring. Everything stops after the given number of epochs, once stale_epochs pass without
+    the overall best improving, or when the time budget runs out. The islands check the deadline every generation and
+    report straight away once it's passed, rather than finishing their epoch.
+
+    Parameters
+    ----------
+    remaining : list
+        List of lists of remaining decompositions to hit.
+    islands : int
+        Number of islands, i.e. worker processes.
+    migration_interval : int
+        Generations per epoch, between migrations.
+    migrants : int
+        Number of individuals each island sends on per migration.
+    epochs : int
+        Maximum number of epochs.
+    stale_epochs : int
+        Stop once this many epochs pass without the best solution over all islands improving.
+    time_budget : float / Deadline
+        Seconds to run for at most, or a Deadline shared with the caller. None runs until one of the other stopping
+        conditions.
+    population_size : int
+        Number of individuals on each island.
+    crossover_rate : float
+        Chance a child mixes both parents rather than copying the first.
+    mutation_rate : float
+        Chance each gene of each child is flipped.
+    elite : int
+        Number of best individuals on each island carried over unchanged each generation.
+    seed : int
+        Seed for the run, from which each island's own seed is derived.
+
+    Returns
+    -------
+    IslandResult
+        Named tuple of (solution, epochs, island_stats, timed_out). island_stats holds a dict per island with its
+        'generations' bred and 'history', the size of its best individual after each epoch. timed_out says whether the
+        time budget cut the run short.
+    """
+    if not remaining:
+        return IslandResult([], 0, [], False)
+
+    primes = sorted(set(p for decomposition in remaining for p in decomposition))
+    migrants = max(min(migrants, population_size - 1), 1)
+    deadline = as_deadline(time_budget)
+
+    connections = []
+    processes = []
+    for seed_sequence in np.random.SeedSequence(seed).spawn(islands):
+        parent_conn, child_conn = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+            target=_island_worker,
+            args=(remaining, child_conn, seed_sequence, population_size, crossover_rate, mutation_rate, elite,
+                  migration_interval, migrants, deadline),
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        connections.append(parent_conn)
+        processes.append(process)
+
+    island_stats = [{'island': i, 'generations': 0, 'history': []} for i in range(islands)]
+    best = None
+    stale = 0
+    epoch = 0
+
+    try:
+        while True:
+            reports = [conn.recv() for conn in connections]
+            epoch += 1
+            improved = False
+
+            for stats, (top, generation) in zip(island_stats, reports):
+                stats['generations'] = generation
+                stats['history'].append(int(top[0].sum()))
+                if best is None or top[0].sum() < best.sum():
+                    best = top[0].copy()
+                    improved = True
+
+            stale = 0 if improved else stale + 1
+            timed_out = epoch < epochs and stale < stale_epochs and deadline.passed()
+            stop = epoch >= epochs or stale >= stale_epochs or timed_out
+
+            for i, conn in enumerate(connections):
+                conn.send(None if stop else reports[i - 1][0])
+
+            if stop:
+                break
+    finally:
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+    return IslandResult([primes[k] for k in np.flatnonzero(best)], epoch, island_stats, timed_out)
@@ -0,0 +1,163 @@
+"""
+Vectorised form of check_if_solved, for when many candidate solutions need checking against the same decompositions.
+
+The decompositions are held as a (primes x sets) incidence matrix and the candidates as a (candidates x primes) matrix,
+so a single matrix product gives how many times each candidate hits each set. Anything above zero is a hit.
+"""
+import numpy as np
+from bitsets import build_prime_index
+
+
+def build_incidence_matrix(
+    remaining,
+    bit_of=None,
+):
+    """Build the prime by set incidence matrix for a list of decompositions.
+
+    Parameters
+    ----------
+    remaining : list
+        List of lists of remaining decompositions.
+    bit_of : dict
+        Mapping of prime to row index. Defaults to one built from remaining via build_prime_index.
+
+    Returns
+    -------
+    tuple
+        (primes, bit_of, incidence) where incidence[i, j] is True when primes[i] is in remaining[j].
+    """
+    if bit_of is None:
+        primes, bit_of = build_prime_index(remaining)
+    else:
+        primes = sorted(bit_of, key=bit_of.get)
+
+    incidence = np.zeros((len(primes), len(remaining)), dtype=bool)
+
+    for j, decomposition in enumerate(remaining):
+        incidence[[bit_of[p] for p in decomposition], j] = True
+
+    return primes, bit_of, incidence
+
+
+def solutions_to_matrix(
+    candidates,
+    bit_of,
+):
+    """Turn a list of candidate solutions into a (candidates x primes) boolean matrix. Primes not in bit_of can't hit
+    anything so are dropped.
+
+    Parameters
+    ----------
+    candidates : list
+        List of lists of primes, each one a candidate solution.
+    bit_of : dict
+        Mapping of prime to column index, as used to build the incidence matrix.
+
+    Returns
+    -------
+    numpy.ndarray
+        Boolean matrix where entry [i, k] is True when candidate i holds the prime in column k.
+    """
+    matrix = np.zeros((len(candidates), len(bit_of)), dtype=bool)
+
+    for i, candidate in enumerate(candidates):
+        matrix[i, [bit_of[p] for p in candidate if p in bit_of]] = True
+
+    return matrix
+
+
+def hit_counts(
+    candidate_matrix,
+    incidence,
+):
+    """Count how many primes of each candidate land in each set.
+
+    Parameters
+    ----------
+    candidate_matrix : numpy.ndarray
+        Boolean (candidates x primes) matrix.
+    incidence : numpy.ndarray
+        Boolean (primes x sets) incidence matrix.
+
+    Returns
+    -------
+    numpy.ndarray
+        Integer (candidates x sets) matrix of hit counts.
+    """
+    # float32 keeps the product on the BLAS path, the counts are small enough to be exact
+    counts = candidate_matrix.astype(np.float32) @ incidence.astype(np.float32)
+
+    return counts.astype(np.int32)
+
+
+def batch_check_if_solved(
+    candidate_matrix,
+    incidence,
+):
+    """Check every candidate against every set in one go.
+
+    Parameters
+    ----------
+    candidate_matrix : numpy.ndarray
+        Boolean (candidates x primes) matrix.
+    incidence : numpy.ndarray
+        Boolean (primes x sets) incidence matrix.
+
+    Returns
+    -------
+    tuple
+        (hit_mask, unhit) where hit_mask is a boolean (candidates x sets) matrix and unhit[i] is the array of set
+        indices candidate i misses. A candidate solves MinHitSet when its unhit array is empty.
+    """
+    hit_mask = hit_counts(candidate_matrix, incidence) > 0
+    unhit = [np.flatnonzero(~row) for row in hit_mask]
+
+    return hit_mask, unhit
+
+
+def batch_is_solution(
+    candidate_matrix,
+    incidence,
+):
+    """Flag which candidates hit every set.
+
+    Parameters
+    ----------
+    candidate_matrix : numpy.ndarray
+        Boolean (candidates x primes) matrix.
+    incidence : numpy.ndarray
+        Boolean (primes x sets) incidence matrix.
+
+    Returns
+    -------
+    numpy.ndarray
+        Boolean array, True for each candidate that is a hitting set.
+    """
+    return (hit_counts(candidate_matrix, incidence) > 0).all(axis=1)
+
+
+def filter_solutions(
+    remaining,
+    candidates,
+):
+    """Batched equivalent of [sol for sol in candidates if not check_if_solved(remaining, sol)].
+
+    Parameters
+    ----------
+    remaining : list
+        List of lists of remaining decompositions to check if the candidates hit.
+    candidates : list
+        List of lists of primes, each one a candidate solution.
+
+    Returns
+    -------
+    list
+        The candidates that hit every decomposition in remaining, in their original order.
+    """
+    if not candidates:
+        return []
+
+    _, bit_of, incidence = build_incidence_matrix(remaining)
+    feasible = batch_is_solution(solutions_to_matrix(candidates, bit_of), incidence)
+
+    return [candidate for candidate, ok in zip(candidates, feasible) if ok]
@@ -1,18 +1,28 @@
 """
 All algorithm code will be stored here. so far includes exhaustive, stochastic and greedy solutions.
 
-TODO - write any other algorithms
-     - consider multiprocessed approach to multiple-stochastic alg.
-     - *consider method of passing optional params to more complicated algorithms i.e. 'heat' for our descent method,
-     or number_of_iterations for the multiple run algorithms*
+Optional params for the more complicated algorithms (i.e. the population size for genetic) are passed through
+minimum_prime_hitting_set's algorithm_params dict.
+
+Every algorithm bar self-solve takes a time_budget and a stats dict. Each checks the budget as it goes, and if it runs
+out returns the best hitting set found so far (the greedy one if it hasn't found any yet), setting stats['finished'] to
+False to say it was cut off. The time_budget can be seconds or a deadline.Deadline, and algorithms calling others hand
+on their Deadline rather than the seconds left, so the whole run works to the one clock.
+
+TODO - write any other algorithms (tabu search?)
      - consider method of testing stochastic algs, whose output will be to some extent random
 """
 import itertools
 import collections
-import operator
-import pandas as pd
+import heapq
+import inspect
+import math
+import multiprocessing
+import os
+import queue
 import random
-from math import floor
+import time
+from concurrent.futures import ProcessPoolExecutor
 from shared_functions import (
     get_sols,
     get_remaining,
@@ -20,6 +30,17 @@ from shared_functions import (
     check_if_solved,
     solution_reduction,
 )
+from bitsets import bitset_reduction
+from hit_check import filter_solutions
+from weighted_sampler import WeightedSampler
+from coverage_state import CoverageState
+from genetic_engine import run_genetic_algorithm, run_island_genetic_algorithm
+from branch_and_bound import branch_and_bound_search
+from ilp_backend import solve_hitting_set_ilp
+from components import connected_components
+from kernelisation import kernelise
+from deadline import as_deadline
+from algorithm_selection import instance_features, choose_algorithm
 
 
 def self_solve_hitting_set(
@@ -50,6 +71,8 @@ def randomly_generated_hitting_set(
     remaining,
     sols,
     text,
+    time_budget=None,
+    stats=None,
 ):
     """Run a chaotic mess of a method to solve MinHitSet on remaining decompositions.
     legit though, it just generates a number of random sets and sees which if any is the smallest legitimate solution
@@ -64,6 +87,11 @@ def randomly_generated_hitting_set(
         List of integers that form an at least partial solution to MinHitSet algorithm.
     text : bool
         Set False to avoid printing any statements
+    time_budget : float
+        Seconds to generate random sets for at most. If it runs out before any of them work the greedy solution is
+        output rather than every distinct element.
+    stats : dict
+        Optional dict to be filled with 'finished', False if the time budget ran out.
 
     Returns
     -------
@@ -73,29 +101,94 @@ def randomly_generated_hitting_set(
     if text:
         print('\n---| Running Chaotic Random Minimum Prime Hitting Set Algorithm |---\n')
 
+    deadline = as_deadline(time_budget)
     element_list = list(set(itertools.chain.from_iterable(remaining)))
+    actual_sols = []
+
+    # generated and checked in chunks, so the deadline can be checked in between
+    for start in range(0, len(remaining), 256):
+        if deadline.passed():
+            break
 
-    potential_sols = [list(set([random.choice(element_list) for i in range(len(element_list))]))
-                      for i in range(len(remaining))]
-    actual_sols = [sol for sol in potential_sols if not check_if_solved(remaining, sol)]
+        potential_sols = [list(set([random.choice(element_list) for i in range(len(element_list))]))
+                          for i in range(min(256, len(remaining) - start))]
+        actual_sols += filter_solutions(remaining, potential_sols)
 
     if len(actual_sols) > 0:
         best_sol = min(actual_sols, key=len) + sols
+    elif deadline.expired:
+        best_sol = lazy_greedy_cover(remaining) + sols
     else:
         best_sol = element_list + sols
 
+    if stats is not None:
+        stats['finished'] = not deadline.expired
+
     if text:
         print('\tMinHitSet complete! solution = {}'.format(sorted(best_sol)))
 
     return best_sol
 
 
+def stream_hitting_sets(
+    remaining,
+    best_size,
+    deadline=None,
+):
+    """Lazily walk the outcomes of picking one element from each decomposition, depth first and in the same order as
+    itertools.product(*remaining), yielding the distinct elements of each outcome. Only the current branch is ever held
+    in memory.
+
+    Two kinds of branch are skipped along the way. Any prefix with at least best_size[0] distinct elements can't lead
+    anywhere better so is dropped with everything below it. And a decomposition already hit by the prefix is only
+    walked once, as picking a new element from it can only ever grow the outcome.
+
+    Parameters
+    ----------
+    remaining : list
+        List of lists of remaining decompositions to check if sols hit.
+    best_size : list
+        One element list holding the size of the best outcome found so far. The caller can lower it between yields to
+        tighten the pruning.
+    deadline : Deadline
+        Optional deadline, checked every 1024 branches. Once it passes the walk just stops.
+
+    Yields
+    ------
+    frozenset
+        Distinct elements of an outcome smaller than best_size[0] at the time it was reached.
+    """
+    stack = [(0, frozenset())]
+    popped = 0
+
+    while stack:
+        popped += 1
+        if deadline is not None and popped % 1024 == 0 and deadline.passed():
+            return
+
+        depth, prefix = stack.pop()
+
+        if len(prefix) >= best_size[0]:
+            continue
+
+        if depth == len(remaining):
+            yield prefix
+        elif not prefix.isdisjoint(remaining[depth]):
+            stack.append((depth + 1, prefix))
+        else:
+            for element in reversed(remaining[depth]):
+                stack.append((depth + 1, prefix | {element}))
+
+
 def exhaustive_hitting_set(
     remaining,
     sols,
-    text,
+    text=True,
+    time_budget=None,
+    stats=None,
 ):
-    """Run exhaustive MinHitSet algorithm on remaining decompositions.
+    """Run exhaustive MinHitSet algorithm on remaining decompositions. The possible outcomes are streamed rather than
+    stored, keeping only the best found so far, so memory use stays flat however big the search space gets.
 
     Parameters
     ----------
@@ -105,20 +198,39 @@ def exhaustive_hitting_set(
         List of integers that form an at least partial solution to MinHitSet algorithm.
     text : bool
         Set False to avoid printing any statements
+    time_budget : float
+        Seconds to search for. If it runs out the smallest outcome found so far is output, or the greedy solution if
+        there isn't one yet. None (the default) searches everything.
+    stats : dict
+        Optional dict to be filled with 'finished', False if the time budget ran out.
 
     Returns
     -------
     list
-        List of integers forming a solution to the MinHitSet algorithm run on remaining.
+        List of integers forming a solution to the MinHitSet algorithm run on remaining. Guaranteed minimal unless the
+        time budget ran out.
     """
     if text:
         print('\n---| Running Exhaustive Minimum Prime Hitting Set Algorithm |---\n')
 
-    partial_hitting_sets = [list(k) for k in itertools.product(*remaining)]
-    hitting_sets = [list(set(k + sols)) for k in partial_hitting_sets]
-    hitting_sets = sorted(hitting_sets, key=len)
+    deadline = as_deadline(time_budget)
+    best_size = [len(set(itertools.chain.from_iterable(remaining))) + 1]
+    min_partial_hit_set = None
+
+    for partial_hit_set in stream_hitting_sets(remaining, best_size, deadline):
+        min_partial_hit_set = partial_hit_set
+        best_size[0] = len(partial_hit_set)
+
+        if best_size[0] <= 1:  # can't do better than len(sols) + 1, so stop looking
+            break
 
-    min_hit_set = hitting_sets[0]
+    if min_partial_hit_set is None:
+        min_partial_hit_set = lazy_greedy_cover(remaining)
+
+    min_hit_set = list(set(list(min_partial_hit_set) + sols))
+
+    if stats is not None:
+        stats['finished'] = not deadline.expired
 
     if text:
         print('\tMinHitSet complete! solution = {}'.format(sorted(min_hit_set)))
@@ -126,12 +238,16 @@ def exhaustive_hitting_set(
     return min_hit_set
 
 
-def greedy_hitting_set(
+def branch_and_bound_hitting_set(
     remaining,
     sols,
     text,
+    time_budget=None,
+    stats=None,
 ):
-    """Run Greedy MinHitSet heuristic on remaining un hit solutions.
+    """Run branch-and-bound MinHitSet algorithm on remaining decompositions. Starts from the greedy solution and
+    searches depth first for something smaller, so it holds only the current branch in memory rather than every
+    possible outcome like the exhaustive algorithm does.
 
     Parameters
     ----------
@@ -141,42 +257,184 @@ def greedy_hitting_set(
         List of integers that form an at least partial solution to MinHitSet algorithm.
     text : bool
         Set False to avoid printing any statements
+    time_budget : float
+        Seconds to search for. If the budget runs out the best solution found so far is returned. None (the default)
+        searches until the optimum is proven.
+    stats : dict
+        Optional dict to be filled with the search outcome: 'finished' (the same as 'optimal' here), 'optimal',
+        'lower_bound', 'gap' and 'nodes'.
 
     Returns
     -------
     list
-        List of integers forming a potential (greedy) solution to the MinHitSet algorithm run on remaining.
+        List of integers forming a solution to the MinHitSet algorithm run on remaining. Guaranteed minimal unless the
+        time budget ran out.
     """
     if text:
-        print('\n---| Running Greedy Minimum Prime Hitting Set Heuristic |---\n')
+        print('\n---| Running Branch and Bound Minimum Prime Hitting Set Algorithm |---\n')
 
-    unsolved = True
-    while unsolved:
-        element_list = list(itertools.chain.from_iterable(remaining))
-        counts = collections.Counter(element_list)
+    deadline = as_deadline(time_budget)
+    incumbent = greedy_hitting_set(remaining, [], False)
+    result = branch_and_bound_search(remaining, incumbent, deadline)
 
-        next_element_in_sol = max(counts.items(), key=operator.itemgetter(1))[0]
-        sols.append(next_element_in_sol)
+    min_hit_set = result.solution + sols
+    lower_bound = result.lower_bound + len(sols)
 
-        remaining = check_if_solved(remaining, sols)
-        if not remaining:
-            unsolved = False
+    if stats is not None:
+        stats.update({
+            'finished': result.optimal,
+            'optimal': result.optimal,
+            'lower_bound': lower_bound,
+            'gap': len(min_hit_set) - lower_bound,
+            'nodes': result.nodes,
+        })
 
     if text:
-        print('\tMinHitSet complete! solution = {}'.format(sorted(sols)))
+        if not result.optimal:
+            print('\ttime budget hit after {} nodes, optimality gap = {}'.format(
+                result.nodes, len(min_hit_set) - lower_bound))
+        print('\tMinHitSet complete! solution = {}'.format(sorted(min_hit_set)))
 
-    return sols
+    return min_hit_set
 
 
-def stochastic_descent_hitting_set(
+def ilp_hitting_set(
     remaining,
     sols,
     text,
+    time_budget=None,
+    solver=None,
+    stats=None,
 ):
-    """Run stochastic descent MinHitSet algorithm on remaining un hit solutions. The nature of this as a probabilistic
-    method means that it will in all likelihood generate different solutions every time.
+    """Solve MinHitSet on remaining decompositions as an integer program, using whichever of OR-Tools CP-SAT or PuLP/CBC
+    is installed and warm started from the greedy solution. Falls back on branch-and-bound if neither is available.
+
+    Parameters
+    ----------
+    remaining : list
+        List of lists of remaining decompositions to check if sols hit.
+    sols : list
+        List of integers that form an at least partial solution to MinHitSet algorithm.
+    text : bool
+        Set False to avoid printing any statements
+    time_budget : float
+        Seconds the solver may run for. If it runs out the best solution found so far is returned. None (the default)
+        runs until the optimum is proven.
+    solver : str
+        'cp-sat' or 'cbc' to force a particular solver, falling back on branch-and-bound if it isn't installed.
+        Defaults to the first one installed. Any other name raises ValueError.
+    stats : dict
+        Optional dict to be filled with the search outcome: 'finished' (the same as 'optimal' here), 'optimal',
+        'lower_bound', 'gap' and 'solver'.
+
+    Returns
+    -------
+    list
+        List of integers forming a solution to the MinHitSet algorithm run on remaining. Guaranteed minimal unless the
+        time budget ran out.
+    """
+    deadline = as_deadline(time_budget)
+    incumbent = greedy_hitting_set(remaining, [], False)
+    result = solve_hitting_set_ilp(remaining, incumbent, deadline.remaining(), solver)
+
+    if result is None:
+        if text:
+            print('\nno ILP solver available, falling back on branch-and-bound')
+        return branch_and_bound_hitting_set(remaining, sols, text, deadline, stats)
+
+    if text:
+        print('\n---| Running ILP ({}) Minimum Prime Hitting Set Algorithm |---\n'.format(result.solver))
+
+    min_hit_set = result.solution + sols
+    lower_bound = result.lower_bound + len(sols)
+
+    if stats is not None:
+        stats.update({
+            'finished': result.optimal,
+            'optimal': result.optimal,
+            'lower_bound': lower_bound,
+            'gap': len(min_hit_set) - lower_bound,
+            'solver': result.solver,
+        })
+
+    if text:
+        if not result.optimal:
+            print('\ttime budget hit, optimality gap = {}'.format(len(min_hit_set) - lower_bound))
+        print('\tMinHitSet complete! solution = {}'.format(sorted(min_hit_set)))
+
+    return min_hit_set
+
+
+def lazy_greedy_cover(remaining):
+    """Pick primes greedily until every decomposition in remaining is hit, always taking the prime that hits the most
+    decompositions not yet hit. Ties go to whichever prime appears first when the unhit decompositions are read in
+    order, the same as collections.Counter would give.
+
+    A prime to decompositions index is built once and hit counts are only decremented for the decompositions newly hit
+    by each pick. The counts live in a lazy max heap: entries are checked against the current count when popped and
+    pushed back if they've gone stale, which is safe as a prime's count can only ever fall.
+
+    Parameters
+    ----------
+    remaining : list
+        List of lists of remaining decompositions to be hit.
+
+    Returns
+    -------
+    list
+        List of primes in the order they were picked.
+    """
+    occurrences = collections.defaultdict(list)  # prime -> [(decomposition index, position within it), ...]
+    for j, decomposition in enumerate(remaining):
+        for k, p in enumerate(decomposition):
+            occurrences[p].append((j, k))
+
+    counts = {p: len(occ) for p, occ in occurrences.items()}
+    first_unhit = dict.fromkeys(occurrences, 0)
+    hit = [False] * len(remaining)
+    unhit_total = len(remaining)
+
+    heap = [(-counts[p], occ[0][0], occ[0][1], p) for p, occ in occurrences.items()]
+    heapq.heapify(heap)
+    picks = []
+
+    while unhit_total and heap:
+        entry = heapq.heappop(heap)
+        p = entry[3]
+        occ = occurrences[p]
 
-    TODO - consider allowing worsening steps with some decreasing probability to increase the coverage of the alg?
+        ptr = first_unhit[p]
+        while ptr < len(occ) and hit[occ[ptr][0]]:
+            ptr += 1
+        first_unhit[p] = ptr
+
+        if counts[p] == 0:
+            continue
+
+        current = (-counts[p], occ[ptr][0], occ[ptr][1], p)
+        if current != entry:
+            heapq.heappush(heap, current)
+            continue
+
+        picks.append(p)
+        for j, _ in occ[ptr:]:
+            if not hit[j]:
+                hit[j] = True
+                unhit_total -= 1
+                for q in remaining[j]:
+                    counts[q] -= 1
+
+    return picks
+
+
+def greedy_hitting_set(
+    remaining,
+    sols,
+    text=True,
+    time_budget=None,
+    stats=None,
+):
+    """Run Greedy MinHitSet heuristic on remaining un hit solutions.
 
     Parameters
     ----------
@@ -186,40 +444,132 @@ def stochastic_descent_hitting_set(
         List of integers that form an at least partial solution to MinHitSet algorithm.
     text : bool
         Set False to avoid printing any statements
+    time_budget : float
+        Accepted like every other algorithm but never checked, greedy being what the others fall back on when they run
+        out of time.
+    stats : dict
+        Optional dict to be filled with 'finished', always True.
 
     Returns
     -------
     list
-        List of integers forming a stochastically generated solution to the MinHitSet algorithm run on remaining.
+        List of integers forming a potential (greedy) solution to the MinHitSet algorithm run on remaining.
     """
     if text:
-        print('\n---| Running Stochastic Descent Minimum Prime Hitting Set Algorithm |---\n')
+        print('\n---| Running Greedy Minimum Prime Hitting Set Heuristic |---\n')
+
+    sol_set = set(sols)
+    sols.extend(lazy_greedy_cover([decomposition for decomposition in remaining
+                                   if sol_set.isdisjoint(decomposition)]))
+
+    if stats is not None:
+        stats['finished'] = True
+
+    if text:
+        print('\tMinHitSet complete! solution = {}'.format(sorted(sols)))
+
+    return sols
+
+
+def stochastic_descent(
+    remaining,
+    rng=random,
+    sweep=False,
+    deadline=None,
+):
+    """Run a single stochastic descent on remaining, starting from every distinct element and randomly removing
+    elements (weighted by how often they occur) for as long as what's left still hits every decomposition. Whether a
+    removal is allowed is read off the per decomposition hit counts in a CoverageState, so each check only looks at the
+    decompositions the picked element appears in.
+
+    Parameters
+    ----------
+    remaining : list
+        List of lists of remaining decompositions to hit.
+    rng : random.Random
+        Source of randomness for the removals. Defaults to the random module itself.
+    sweep : bool
+        Set True to finish with a single pass removing every element that is still redundant.
+    deadline : Deadline
+        Optional deadline, checked every 64 picks. What's left when it passes still hits everything, so is returned as
+        it is (sweep skipped).
 
-    element_list = list(itertools.chain.from_iterable(remaining))
-    current_sol = list(set(element_list))
-    current_cost = len(current_sol)
+    Returns
+    -------
+    list
+        List of integers hitting every decomposition in remaining, not including sols.
+    """
+    counts = collections.Counter(itertools.chain.from_iterable(remaining))
+    sampler = WeightedSampler(counts)
+    state = CoverageState(remaining, counts)
     cont = True
     rep = 0
+    picks = 0
 
     while cont:
-        counts = pd.DataFrame.from_dict(collections.Counter(element_list), orient='index').reset_index()
-        counts.columns = ['prime', 'count']
+        picks += 1
+        if deadline is not None and picks % 64 == 0 and deadline.passed():
+            break
 
-        pick = int(counts['prime'].sample(weights=counts['count']))
-        test_sol = [i for i in current_sol if i != pick]
+        pick = sampler.sample(rng)
 
-        brakes_hit_set = check_if_solved(remaining, test_sol)
-        if not brakes_hit_set:
-            current_sol = test_sol
-            element_list = [i for i in element_list if i != pick]
+        if state.can_remove(pick):
+            state.remove(pick)
+            sampler.remove(pick)
             rep = 0
         else:
             rep += 1
 
-        if (current_cost == (len(sols) + 1)) | (rep == 5):
+        if (len(state.solution) == 1) | (rep == 5):
             cont = False
 
-    final_sol = current_sol + sols
+    if sweep and not (deadline is not None and deadline.expired):
+        state.remove_redundant()
+
+    return list(state.solution)
+
+
+def stochastic_descent_hitting_set(
+    remaining,
+    sols,
+    text,
+    sweep=False,
+    time_budget=None,
+    stats=None,
+):
+    """Run stochastic descent MinHitSet algorithm on remaining un hit solutions. The nature of this as a probabilistic
+    method means that it will in all likelihood generate different solutions every time.
+
+    Worsening steps aren't allowed here, see annealing_hitting_set for a search that takes them.
+
+    Parameters
+    ----------
+    remaining : list
+        List of lists of remaining decompositions to check if sols hit.
+    sols : list
+        List of integers that form an at least partial solution to MinHitSet algorithm.
+    text : bool
+        Set False to avoid printing any statements
+    sweep : bool
+        Set True to finish with a single pass removing every element that is still redundant.
+    time_budget : float
+        Seconds to descend for at most. The descent only ever holds hitting sets, so it just stops where it is.
+    stats : dict
+        Optional dict to be filled with 'finished', False if the time budget ran out.
+
+    Returns
+    -------
+    list
+        List of integers forming a stochastically generated solution to the MinHitSet algorithm run on remaining.
+    """
+    if text:
+        print('\n---| Running Stochastic Descent Minimum Prime Hitting Set Algorithm |---\n')
+
+    deadline = as_deadline(time_budget)
+    final_sol = stochastic_descent(remaining, sweep=sweep, deadline=deadline) + sols
+
+    if stats is not None:
+        stats['finished'] = not deadline.expired
 
     if text:
         print('\tMinHitSet complete! solution = {}'.format(sorted(final_sol)))
@@ -227,15 +577,46 @@ def stochastic_descent_hitting_set(
     return final_sol
 
 
+# the problem instance a descent worker process runs its restarts on, set once when the worker starts
+_worker_instance = None
+
+
+def _init_descent_worker(
+    remaining,
+    sweep,
+    deadline=None,
+):
+    """Store the problem instance in a descent worker process, so it isn't pickled again for every restart."""
+    global _worker_instance
+    _worker_instance = (remaining, sweep, deadline)
+
+
+def _run_descent_restart(seed):
+    """Run one seeded descent restart on the instance held by this worker process. Returns the solution and whether
+    the deadline cut it short, or None if the deadline had already passed before it started."""
+    remaining, sweep, deadline = _worker_instance
+
+    if deadline is not None and deadline.passed():
+        return None
+
+    solution = stochastic_descent(remaining, random.Random(seed), sweep, deadline)
+
+    return solution, deadline is not None and deadline.expired
+
+
 def multiple_stochastic_descent_hitting_set(
     remaining,
     sols,
     text,
+    number_of_iterations=5,
+    workers=None,
+    seeds=None,
+    sweep=False,
+    time_budget=None,
+    stats=None,
 ):
-    """Run multiple stochastic descent MinHitSet algorithms on remaining decompositions and take the best value
-
-    TODO - let number_of_iterations be an input
-         - consider a multiprocessed approach
+    """Run multiple stochastic descent MinHitSet algorithms on remaining decompositions and take the best value. The
+    restarts are spread over a pool of worker processes, each of which is handed the problem instance once on start up.
 
     Parameters
     ----------
@@ -245,6 +626,22 @@ def multiple_stochastic_descent_hitting_set(
         List of integers that form an at least partial solution to MinHitSet algorithm.
     text : bool
         Set False to avoid printing any statements
+    number_of_iterations : int
+        Number of descents to run.
+    workers : int
+        Number of worker processes. Defaults to one per cpu, capped at number_of_iterations. With a single worker the
+        restarts just run in this process.
+    seeds : list
+        One seed per restart. Each restart's outcome depends only on its own seed, so a fixed list of seeds gives the
+        same result whatever the number of workers. Defaults to seeds drawn from the random module.
+    sweep : bool
+        Set True to finish each descent with a single pass removing every element that is still redundant.
+    time_budget : float
+        Seconds to run for at most. Restarts still going when it runs out stop where they are, and those not yet
+        started are skipped.
+    stats : dict
+        Optional dict to be filled with 'finished', False if the time budget ran out, and 'restarts', the number of
+        restarts that got to run.
 
     Returns
     -------
@@ -255,39 +652,38 @@ def multiple_stochastic_descent_hitting_set(
     if text:
         print('\n---| Running Multiple Stochastic Descent Minimum Prime Hitting Set Algorithm |---\n')
 
-    number_of_iterations = 5
-    sols_list = []
-
-    for i in range(number_of_iterations):
-
-        element_list = list(itertools.chain.from_iterable(remaining))
-        current_sol = list(set(element_list))
-        current_cost = len(current_sol)
-        cont = True
-        rep = 0
-
-        while cont:
-            counts = pd.DataFrame.from_dict(collections.Counter(element_list), orient='index').reset_index()
-            counts.columns = ['prime', 'count']
-
-            pick = int(counts['prime'].sample(weights=counts['count']))
-            test_sol = [i for i in current_sol if i != pick]
-
-            brakes_hit_set = check_if_solved(remaining, test_sol)
-            if not brakes_hit_set:
-                current_sol = test_sol
-                element_list = [i for i in element_list if i != pick]
-                rep = 0
-            else:
-                rep += 1
+    if seeds is None:
+        seeds = [random.randrange(2 ** 32) for _ in range(number_of_iterations)]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(min(workers, len(seeds)), 1)
+
+    deadline = as_deadline(time_budget)
+
+    if workers == 1:
+        sols_list = []
+        for seed in seeds:
+            if sols_list and deadline.passed():
+                break
+            sols_list.append(stochastic_descent(remaining, random.Random(seed), sweep, deadline))
+        finished = not deadline.expired
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_descent_worker,
+                                 initargs=(remaining, sweep, deadline)) as executor:
+            restarts = list(executor.map(_run_descent_restart, seeds))
+        sols_list = [restart[0] for restart in restarts if restart is not None]
+        finished = all(restart is not None and not restart[1] for restart in restarts)
 
-            if (current_cost == (len(sols) + 1)) | (rep == 5):
-                cont = False
+    if not sols_list:
+        sols_list = [lazy_greedy_cover(remaining)]
 
-        final_sol = current_sol + sols
-        sols_list.append(final_sol)
+    best_sol = min(sols_list, key=len) + sols
 
-    best_sol = min(sols_list, key=len)
+    if stats is not None:
+        stats.update({
+            'finished': finished,
+            'restarts': len(sols_list),
+        })
 
     if text:
         print('\tMinHitSet complete! best solution = {}'.format(sorted(best_sol)))
@@ -295,120 +691,464 @@ def multiple_stochastic_descent_hitting_set(
     return best_sol
 
 
-def generate_initial_population(
+def simulated_annealing(
     remaining,
-    attempted_population_size=50,
+    initial_sol,
+    time_budget=0.2,
+    max_iterations=None,
+    initial_temperature=1.0,
+    final_temperature=0.02,
+    penalty=1.5,
+    rng=random,
 ):
-    """Generates an initial population of solution to MinHitSet to feed the GA.
+    """Simulated annealing over candidate solutions of remaining, scored as the number of primes picked plus penalty
+    for every decomposition left unhit. While the current solution is complete a random prime is dropped, otherwise a
+    prime from a random unhit decomposition is either added or swapped in for a random prime already picked. Worsening
+    moves are accepted with probability exp(-worsening / temperature), the temperature falling geometrically from
+    initial_temperature to final_temperature over the budget.
 
     Parameters
     ----------
     remaining : list
-        List of lists of remaining decompositions to check if sols hit.
-    attempted_population_size : int
-        Number of attempts at generating a legitimate solution.
+        List of lists of remaining decompositions to hit.
+    initial_sol : list
+        Complete solution to start from, i.e. the greedy one.
+    time_budget : float / Deadline
+        Seconds to run for, or a Deadline shared with the caller, the cooling spreading over whatever is left of it at
+        the start. With max_iterations as well the run stops at whichever comes first, but the cooling follows the
+        iterations.
+    max_iterations : int
+        Number of moves to try, for a run that doesn't depend on the speed of the machine.
+    initial_temperature : float
+        Starting temperature.
+    final_temperature : float
+        Temperature reached at the end of the budget.
+    penalty : float
+        Cost of each unhit decomposition. Must be above 1 for the best scoring solution to be a complete one.
+    rng : random.Random
+        Source of randomness. Defaults to the random module itself.
 
     Returns
     -------
-    list
-        list of solutions to MinHitSet.
+    tuple
+        (best_sol, iterations, elapsed) - the smallest complete solution seen, the number of moves tried and the time
+        taken in seconds.
     """
-    element_list = list(set(itertools.chain.from_iterable(remaining)))
+    state = CoverageState(remaining, initial_sol)
+    state.remove_redundant()
+    best_sol = list(state.solution)
+
+    deadline = as_deadline(time_budget)
+    span = deadline.remaining()
+    start = time.perf_counter()
+    elapsed = 0.0
+    iterations = 0
+    temperature = initial_temperature
+    cooling = final_temperature / initial_temperature
+
+    while True:
+        if max_iterations is not None:
+            if iterations >= max_iterations:
+                break
+            if iterations % 64 == 0 and deadline.passed():
+                break
+            progress = iterations / max_iterations
+            temperature = initial_temperature * cooling ** progress
+        elif iterations % 64 == 0:
+            elapsed = time.perf_counter() - start
+            if deadline.passed():
+                break
+            temperature = initial_temperature * cooling ** (elapsed / span)
+
+        iterations += 1
+        before = len(state.solution) + penalty * state.unhit
+
+        if state.is_solved():
+            if len(state.solution) < len(best_sol):
+                best_sol = list(state.solution)
+            if len(state.solution) <= 1:
+                break
+            dropped, added = state.random_member(rng), None
+        else:
+            added = rng.choice(remaining[state.random_unhit(rng)])
+            dropped = state.random_member(rng) if state.solution and rng.random() < 0.5 else None
 
-    initial_population = [list(set([random.choice(element_list) for i in range(len(element_list))]))
-                          for i in range(attempted_population_size)]
-    initial_population = [sol for sol in initial_population if not check_if_solved(remaining, sol)]
+        if dropped is not None:
+            state.remove(dropped)
+        if added is not None:
+            state.add(added)
 
-    if initial_population:
-        initial_population = sorted(initial_population, key=len)
-    else:
-        initial_population = [element_list]
+        worsening = len(state.solution) + penalty * state.unhit - before
+        if worsening > 0 and rng.random() >= math.exp(-worsening / temperature):
+            if added is not None:
+                state.remove(added)
+            if dropped is not None:
+                state.add(dropped)
 
-    return [sol for sol in initial_population if not check_if_solved(remaining, sol)]
+    if state.is_solved() and len(state.solution) < len(best_sol):
+        best_sol = list(state.solution)
 
+    return best_sol, iterations, time.perf_counter() - start
 
-def get_parents(
-    initial_population,
-    number_of_breeding_pairs=10,
+
+def annealing_hitting_set(
+    remaining,
+    sols,
+    text,
+    time_budget=None,
+    max_iterations=None,
+    initial_temperature=1.0,
+    final_temperature=0.02,
+    seed=None,
+    stats=None,
 ):
-    """Pick parents from initial population, using weighted sampling with replacement.
+    """Run simulated annealing MinHitSet algorithm on remaining decompositions, starting from the greedy solution. An
+    anytime algorithm: it runs for as long as it's given and returns the best solution it saw along the way.
 
     Parameters
     ----------
-    initial_population : list
-        List of solutions to MinHitSet problem.
-    number_of_breeding_pairs : int
-        Number of pairs of parents desired
+    remaining : list
+        List of lists of remaining decompositions to check if sols hit.
+    sols : list
+        List of integers that form an at least partial solution to MinHitSet algorithm.
+    text : bool
+        Set False to avoid printing any statements
+    time_budget : float
+        Wall clock seconds to run for, 0.2 if neither this nor max_iterations is given.
+    max_iterations : int
+        Number of moves to try instead of running to a time budget. Given both, the run stops at whichever comes first.
+    initial_temperature : float
+        Starting temperature of the cooling schedule.
+    final_temperature : float
+        Temperature at the end of the budget.
+    seed : int
+        Seed for the run. Defaults to drawing from the random module.
+    stats : dict
+        Optional dict to be filled with 'iterations', 'seconds' and 'iterations_per_second', along with 'finished',
+        False only if the time budget ran out before max_iterations were tried.
 
     Returns
     -------
     list
-        List of parents chosen.
+        List of integers forming a solution to the MinHitSet algorithm run on remaining, never worse than greedy.
     """
-    initial_population_size = len(initial_population)
+    if text:
+        print('\n---| Running Simulated Annealing Minimum Prime Hitting Set Algorithm |---\n')
+
+    rng = random.Random(seed) if seed is not None else random
+    initial_sol = lazy_greedy_cover(remaining)
+
+    if time_budget is None and max_iterations is None:
+        time_budget = 0.2
 
-    weight_widths = int(initial_population_size / 3)
-    weights = [1, 2, 3] * (weight_widths + 1)
-    weights = weights[:len(initial_population)]
+    best_sol, iterations, elapsed = simulated_annealing(
+        remaining, initial_sol, time_budget, max_iterations, initial_temperature, final_temperature, rng=rng,
+    )
+    best_sol = best_sol + sols
+    rate = iterations / elapsed if elapsed > 0 else float('inf')
 
-    parents = random.choices(sorted(initial_population, key=len), weights=weights, k=(2*number_of_breeding_pairs))
-    parents = [parents[:number_of_breeding_pairs], parents[number_of_breeding_pairs:]]
+    if stats is not None:
+        stats.update({
+            'finished': max_iterations is None or iterations >= max_iterations or len(best_sol) <= len(sols) + 1,
+            'iterations': iterations,
+            'seconds': elapsed,
+            'iterations_per_second': rate,
+        })
+
+    if text:
+        print('\t{} iterations in {:.3f}s ({:.0f} per second)'.format(iterations, elapsed, rate))
+        print('\tMinHitSet complete! solution = {}'.format(sorted(best_sol)))
 
-    return parents
+    return best_sol
 
 
-def breed_sols(parents):
-    """Breeding function to generate new solutions out of presumably decent ones
+def genetic_hitting_set(
+    remaining,
+    sols,
+    text,
+    population_size=50,
+    generations=100,
+    crossover_rate=0.9,
+    mutation_rate=0.02,
+    elite=2,
+    stale_generations=10,
+    seed=None,
+    islands=1,
+    migration_interval=5,
+    migrants=2,
+    time_budget=None,
+    stats=None,
+):
+    """Run GA MinHitSet on remaining un hit solutions. The population lives in a boolean numpy matrix, see
+    genetic_engine.py for the details of breeding and repair. With more than one island, independent populations are
+    evolved in separate processes and swap their best individuals every migration_interval generations.
 
     Parameters
     ----------
-    parents : list
-        List of two equally long lists, which will be the 'mother' and 'father' of the breeding alg.
+    remaining : list
+        List of lists of remaining decompositions to check if sols hit.
+    sols : list
+        List of integers that form an at least partial solution to MinHitSet algorithm.
+    text : bool
+        Set False to avoid printing any statements
+    population_size : int
+        Number of individuals in the population.
+    generations : int
+        Maximum number of generations to breed.
+    crossover_rate : float
+        Chance a child mixes both parents rather than copying the first.
+    mutation_rate : float
+        Chance each gene of each child is flipped.
+    elite : int
+        Number of best individuals carried over unchanged each generation.
+    stale_generations : int
+        Stop once this many generations pass without the best solution improving.
+    seed : int
+        Seed for the run. Defaults to drawing from the random module.
+    islands : int
+        Number of island populations, each run in its own process. 1 (the default) runs a single population here.
+    migration_interval : int
+        Island mode only. Generations between migrations.
+    migrants : int
+        Island mode only. Number of individuals each island passes on per migration.
+    time_budget : float
+        Seconds to run for at most. In island mode this is checked between migrations.
+    stats : dict
+        Optional dict to be filled with 'finished', False if the time budget ran out, along with 'generations' and
+        'history', the best solution size after each generation. In island mode it gets 'epochs' and 'islands' instead
+        of the latter two, 'islands' being a list of per island convergence stats.
 
     Returns
     -------
     list
-        List of children that may or may not be solutions to MinHitSet.
+        List of integers forming a genetically generated solution to the MinHitSet algorithm run on remaining.
     """
-    children = []
+    if text:
+        print('\n---| Running Genetic Minimum Prime Hitting Set Algorithm |---\n')
+
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+
+    if islands > 1:
+        result = run_island_genetic_algorithm(
+            remaining, islands, migration_interval, migrants,
+            epochs=max(generations // migration_interval, 1),
+            stale_epochs=max(stale_generations // migration_interval, 1),
+            time_budget=time_budget, population_size=population_size, crossover_rate=crossover_rate,
+            mutation_rate=mutation_rate, elite=elite, seed=seed,
+        )
+        if stats is not None:
+            stats.update({
+                'finished': not result.timed_out,
+                'epochs': result.epochs,
+                'islands': result.island_stats,
+            })
+    else:
+        result = run_genetic_algorithm(remaining, population_size, generations, crossover_rate, mutation_rate, elite,
+                                       stale_generations, time_budget, seed)
+        if stats is not None:
+            stats.update({
+                'finished': not result.timed_out,
+                'generations': result.generations,
+                'history': result.history,
+            })
+
+    sols = sols + result.solution
+
+    if text:
+        print('\tMinHitSet complete! solution = {}'.format(sorted(sols)))
+
+    return sols
+
 
-    for i in range(len(parents[0])):
-        left_sample_size = random.sample(range(1, len(parents[0][i])), k=1)
-        right_sample_size = random.sample(range(1, len(parents[1][i])), k=1)
+def _solve_component(task):
+    """Run one component through its algorithm under the shared deadline, top level so it can be sent to a worker
+    process. Returns the solution and whether the algorithm finished."""
+    algorithm, component, params, deadline = task
+    component_stats = {}
 
-        child = random.sample(parents[0][i], k=left_sample_size[0]) + random.sample(parents[1][i], k=right_sample_size[0])
-        children.append(list(set(child)))
+    params = dict(params, stats=component_stats)
+    if deadline.expires_at is not None or deadline.cancelled is not None:
+        params['time_budget'] = deadline
 
-    return [child for child in children if child]
+    solution = get_chosen_algorithm(algorithm)(component, [], False, **params)
 
+    return solution, component_stats.get('finished', True)
 
-def mutate_sols(mutation_candidates):
-    """Apply mutation function to the selected candidates.
+
+def component_hitting_set(
+    remaining,
+    sols,
+    text,
+    algorithm='branch-and-bound',
+    small_algorithm='exhaustive',
+    small_size=8,
+    workers=1,
+    algorithm_params=None,
+    time_budget=None,
+    stats=None,
+):
+    """Split remaining into connected components, decompositions in different components sharing no primes, and solve
+    each on its own before merging the results. If every component is solved exactly so is the whole problem.
 
     Parameters
     ----------
-    mutation_candidates : list
-        List of lists where each sublist is a potential solution of MinHitSet that will be mutated.
+    remaining : list
+        List of lists of remaining decompositions to check if sols hit.
+    sols : list
+        List of integers that form an at least partial solution to MinHitSet algorithm.
+    text : bool
+        Set False to avoid printing any statements
+    algorithm : string
+        Algorithm to solve the larger components with, any name from get_chosen_algorithm.
+    small_algorithm : string
+        Algorithm to solve components of at most small_size decompositions with.
+    small_size : int
+        Largest component, in decompositions, to hand to small_algorithm.
+    workers : int
+        Number of worker processes to solve components on. With a single worker everything runs in this process.
+    algorithm_params : dict
+        Optional keyword arguments passed to algorithm, i.e. {'population_size': 20}. small_algorithm gets none.
+    time_budget : float / Deadline
+        Seconds to solve every component in, or a Deadline shared with the caller. Every component's algorithm is
+        handed the same deadline, so any starting after it passes are solved with the algorithm's own fallback, usually
+        greedy.
+    stats : dict
+        Optional dict to be filled with 'finished', False if any component was cut off by the time budget, and
+        'components', a list holding the 'size', 'algorithm', 'solution_size' and 'finished' of each component.
 
     Returns
     -------
     list
-        List of lists where each sublist is a mutated form of one of the input sublists.
+        List of integers forming a solution to the MinHitSet algorithm run on remaining.
     """
-    mutants = []
+    if text:
+        print('\n---| Running Connected Component Minimum Prime Hitting Set Algorithm |---\n')
+
+    deadline = as_deadline(time_budget)
+    components = connected_components(remaining)
+    tasks = []
+    component_sols = []
+
+    for component in components:
+        if len(component) == 1:
+            # a lone decomposition is hit by any one of its primes
+            component_sols.append(([component[0][0]], True))
+            tasks.append(None)
+        elif len(component) <= small_size:
+            tasks.append((small_algorithm, component, {}, deadline))
+        else:
+            tasks.append((algorithm, component, algorithm_params or {}, deadline))
 
-    for candidate in mutation_candidates:
-        mutants.append(random.sample(candidate, k=(len(candidate)-1)))
+    to_solve = [task for task in tasks if task is not None]
+    if workers > 1 and len(to_solve) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(to_solve))) as executor:
+            solved = iter(list(executor.map(_solve_component, to_solve)))
+    else:
+        solved = map(_solve_component, to_solve)
 
-    return [mutant for mutant in mutation_candidates if mutant]
+    trivial = iter(component_sols)
+    component_sols = [next(trivial) if task is None else next(solved) for task in tasks]
 
+    if text:
+        print('\tsolved {} components, the largest holding {} decompositions'.format(
+            len(components), max(len(component) for component in components)))
+
+    if stats is not None:
+        stats['finished'] = all(finished for _, finished in component_sols)
+        stats['components'] = [
+            {
+                'size': len(component),
+                'algorithm': 'trivial' if task is None else task[0],
+                'solution_size': len(component_sol),
+                'finished': finished,
+            }
+            for component, task, (component_sol, finished) in zip(components, tasks, component_sols)
+        ]
+
+    sols = sols + [p for component_sol, _ in component_sols for p in component_sol]
 
-def genetic_hitting_set(
+    if text:
+        print('\tMinHitSet complete! solution = {}'.format(sols))
+
+    return sols
+
+
+# how often, in seconds, the portfolio checks on its entrants while waiting for news from them
+_PORTFOLIO_POLL = 0.1
+
+
+def _publish(
+    name,
+    solution,
+    bound,
+    results,
+):
+    """Send a portfolio entrant's new best solution to the coordinator, and lower the shared bound to match."""
+    results.put((name, solution, None))
+
+    with bound.get_lock():
+        bound.value = min(bound.value, len(solution))
+
+
+def _greedy_entrant(
+    remaining,
+    bound,
+    stop,
+    deadline,
+    results,
+    seed,
+):
+    """Portfolio entrant giving the greedy solution, a decent bound to be getting on with almost straight away."""
+    _publish('greedy', lazy_greedy_cover(remaining), bound, results)
+
+
+def _descent_entrant(
+    remaining,
+    bound,
+    stop,
+    deadline,
+    results,
+    seed,
+):
+    """Portfolio entrant running swept stochastic descent restarts until told to stop, sending each improvement."""
+    rng = random.Random(seed)
+    best_size = len(remaining) + 1
+
+    while best_size > 1 and not stop.is_set() and not deadline.passed():
+        solution = stochastic_descent(remaining, rng, True, deadline)
+
+        if len(solution) < best_size:
+            best_size = len(solution)
+            _publish('stochastic', solution, bound, results)
+
+
+def _exact_entrant(
+    remaining,
+    bound,
+    stop,
+    deadline,
+    results,
+    seed,
+):
+    """Portfolio entrant running branch-and-bound against the shared bound. Sends its best solution when done, along
+    with the optimum size if it got as far as proving it."""
+    result = branch_and_bound_search(remaining, None, deadline, bound)
+
+    results.put(('branch-and-bound', result.solution, result.lower_bound if result.optimal else None))
+
+
+def portfolio_hitting_set(
     remaining,
     sols,
     text,
+    seed=None,
+    time_budget=None,
+    stats=None,
 ):
-    """Run GA MinHitSet on remaining un hit solutions.
+    """Race greedy, stochastic descent and branch-and-bound against each other, each in its own process. They share
+    the size of the smallest hitting set any of them has found, which branch-and-bound prunes with, and everything is
+    stopped as soon as branch-and-bound proves the best hitting set found optimal or the time budget runs out.
 
     Parameters
     ----------
@@ -418,47 +1158,186 @@ def genetic_hitting_set(
         List of integers that form an at least partial solution to MinHitSet algorithm.
     text : bool
         Set False to avoid printing any statements
+    seed : int
+        Optional seed for the stochastic descent entrant.
+    time_budget : float
+        Seconds to race for. None waits for branch-and-bound to prove an optimum, however long that takes.
+    stats : dict
+        Optional dict to be filled with 'winner', the entrant that found the returned solution, 'optimal', 'finished'
+        (the same as 'optimal' here), 'lower_bound' if the optimum was proven, and 'entrants', the best solution size
+        each entrant found and the seconds it took to find it.
 
     Returns
     -------
     list
-        List of integers forming a genetically generated solution to the MinHitSet algorithm run on remaining.
+        List of integers forming the best solution to the MinHitSet algorithm run on remaining found by any entrant.
     """
     if text:
-        print('\n---| Running Genetic Minimum Prime Hitting Set Algorithm |---\n')
+        print('\n---| Running Portfolio Minimum Prime Hitting Set Algorithm |---\n')
+
+    deadline = as_deadline(time_budget)
+    start = time.perf_counter()
+    bound = multiprocessing.Value('i', len(remaining) + 1)
+    stop = multiprocessing.Event()
+    results = multiprocessing.Queue()
+
+    entrants = {
+        'greedy': _greedy_entrant,
+        'stochastic': _descent_entrant,
+        'branch-and-bound': _exact_entrant,
+    }
+    processes = {
+        name: multiprocessing.Process(target=entrant, args=(remaining, bound, stop, deadline, results, seed),
+                                      daemon=True)
+        for name, entrant in entrants.items()
+    }
+    for process in processes.values():
+        process.start()
+
+    best, winner, lower_bound = None, None, None
+    found = {}
+    exact_done = False
+
+    def receive(message):
+        nonlocal best, winner, lower_bound, exact_done
+        name, solution, proven = message
+
+        if name == 'branch-and-bound':
+            exact_done = True
+            lower_bound = proven
+        if best is None or len(solution) < len(best):
+            best, winner = solution, name
+        if name not in found or len(solution) < found[name]['solution_size']:
+            found[name] = {'solution_size': len(solution), 'seconds': time.perf_counter() - start}
+
+    # heuristics keep improving for as long as they're allowed, so the race is over once branch-and-bound is
+    while not exact_done:
+        wait = _PORTFOLIO_POLL if deadline.expires_at is None else min(_PORTFOLIO_POLL, deadline.remaining())
+        try:
+            receive(results.get(timeout=wait))
+        except queue.Empty:
+            if deadline.passed() or not processes['branch-and-bound'].is_alive():
+                break
+
+    # anything already sent but not yet read might still be an improvement. Once branch-and-bound has proven an optimum
+    # smaller than the best read so far, whoever found it has already sent it, it's just still on its way through the
+    # queue, so that's worth waiting a little for
+    while True:
+        waiting = lower_bound is not None and (best is None or len(best) > lower_bound)
+        try:
+            receive(results.get(timeout=_PORTFOLIO_POLL) if waiting else results.get_nowait())
+        except queue.Empty:
+            break
 
-    initial_population = generate_initial_population(remaining)
+    stop.set()
+    for process in processes.values():
+        if process.is_alive():
+            process.terminate()
+        process.join()
 
-    best_sol = min(initial_population, key=len)  # current best, to be iterated on
-    changed = 0
+    if best is None:
+        best, winner = lazy_greedy_cover(remaining), 'greedy'
 
-    while changed < 3:
-        parents = get_parents(initial_population)
-        children = breed_sols(parents)
-        try:
-            mutants = mutate_sols(random.choices(initial_population + children, k=20))
-        except IndexError:
-            mutants = []
-        finally:
-            initial_population = initial_population + children + mutants
-            initial_population = [sol for sol in initial_population if not check_if_solved(remaining, sol) and sol]
-            initial_population = sorted(initial_population, key=len)
-            initial_population = initial_population[floor(len(initial_population)/10):]
+    optimal = lower_bound is not None and len(best) <= lower_bound
+    min_hit_set = sols + list(best)
 
-            new_best_sol = min(initial_population, key=len)
+    if text:
+        print('\t{} won{}'.format(winner, ', proven optimal' if optimal else ''))
+        print('\tMinHitSet complete! solution = {}'.format(sorted(min_hit_set)))
 
-            if len(new_best_sol) >= len(best_sol):
-                changed += 1
-            else:
-                changed = 0
-                best_sol = new_best_sol
+    if stats is not None:
+        stats.update({
+            'winner': winner,
+            'optimal': optimal,
+            'finished': optimal,
+            'entrants': found,
+        })
+        if lower_bound is not None:
+            stats['lower_bound'] = lower_bound + len(sols)
 
-    sols = sols + best_sol
+    return min_hit_set
 
-    if text:
-        print('\tMinHitSet complete! solution = {}'.format(sorted(sols)))
 
-    return sols
+def auto_hitting_set(
+    remaining,
+    sols,
+    text,
+    quality='exact',
+    time_budget=None,
+    stats=None,
+    **params
+):
+    """Pick an algorithm from cheap features of remaining (see algorithm_selection.py) and run it.
+
+    Parameters
+    ----------
+    remaining : list
+        List of lists of remaining decompositions to check if sols hit.
+    sols : list
+        List of integers that form an at least partial solution to MinHitSet algorithm.
+    text : bool
+        Set False to avoid printing any statements
+    quality : string
+        'exact' to only pick algorithms that prove their answer minimal, 'heuristic' to settle for a good answer fast.
+    time_budget : float
+        Seconds to run for, passed on to the chosen algorithm.
+    stats : dict
+        Optional dict to be filled with 'algorithm', the name of the chosen algorithm, and 'features', a dict of the
+        features it was chosen on, as well as whatever the chosen algorithm fills in itself.
+    **params
+        Keyword arguments for whichever algorithm is chosen, i.e. seed. Each is only passed on if the chosen algorithm
+        takes it.
+
+    Returns
+    -------
+    list
+        List of integers forming a solution to the MinHitSet algorithm run on remaining.
+
+    Raises
+    ------
+    ValueError
+        If params holds a keyword none of the algorithms take.
+    """
+    taken = set(itertools.chain.from_iterable(
+        inspect.signature(function).parameters for name, function in ALGORITHMS.items() if name != 'auto'))
+    unknown = set(params) - taken
+    if unknown:
+        raise ValueError('no algorithm takes {}'.format(', '.join(sorted(unknown))))
+
+    features = instance_features(remaining)
+    algorithm = choose_algorithm(features, quality)
+
+    if text:
+        print('\tpicked {} from {}'.format(algorithm, dict(features._asdict())))
+
+    if stats is not None:
+        stats.update({
+            'algorithm': algorithm,
+            'features': dict(features._asdict()),
+        })
+
+    chosen_parameters = inspect.signature(ALGORITHMS[algorithm]).parameters
+    params = {key: value for key, value in params.items() if key in chosen_parameters}
+
+    return get_chosen_algorithm(algorithm)(remaining, sols, text, time_budget=time_budget, stats=stats, **params)
+
+
+# every algorithm get_chosen_algorithm knows, by name
+ALGORITHMS = {
+    'self-solve': self_solve_hitting_set,
+    'random': randomly_generated_hitting_set,
+    'exhaustive': exhaustive_hitting_set,
+    'branch-and-bound': branch_and_bound_hitting_set,
+    'ilp': ilp_hitting_set,
+    'greedy': greedy_hitting_set,
+    'stochastic': stochastic_descent_hitting_set,
+    'multiple-stochastic': multiple_stochastic_descent_hitting_set,
+    'genetic': genetic_hitting_set,
+    'annealing': annealing_hitting_set,
+    'components': component_hitting_set,
+    'portfolio': portfolio_hitting_set,
+    'auto': auto_hitting_set,
+}
 
 
 def get_chosen_algorithm(algorithm):
@@ -474,28 +1353,56 @@ def get_chosen_algorithm(algorithm):
     function
         Uncalled function of desire
     """
-    algorithms_dict = {
-        'self-solve': self_solve_hitting_set,
-        'random': randomly_generated_hitting_set,
-        'exhaustive': exhaustive_hitting_set,
-        'greedy': greedy_hitting_set,
-        'stochastic': stochastic_descent_hitting_set,
-        'multiple-stochastic': multiple_stochastic_descent_hitting_set,
-        'genetic': genetic_hitting_set,
-    }
-
     try:
-        desired_function = algorithms_dict[algorithm]
+        desired_function = ALGORITHMS[algorithm]
         return desired_function
     except KeyError:
         print('{} is not an available algorithm'.format(algorithm))
         return None
 
 
+def check_algorithm_params(
+    algorithm,
+    algorithm_params,
+):
+    """Check an algorithm takes every keyword argument it's about to be given.
+
+    Parameters
+    ----------
+    algorithm : string
+        Name of the algorithm, as in get_chosen_algorithm.
+    algorithm_params : dict
+        Keyword arguments the algorithm is to be run with.
+
+    Raises
+    ------
+    ValueError
+        If algorithm_params holds a keyword the algorithm doesn't take, or one of the positional arguments every
+        algorithm is given anyway.
+    """
+    parameters = inspect.signature(ALGORITHMS[algorithm]).parameters
+    accepted = set(parameters) - {'remaining', 'sols', 'text'}
+
+    if any(parameter.kind == parameter.VAR_KEYWORD for parameter in parameters.values()):
+        unknown = set(algorithm_params) & {'remaining', 'sols', 'text'}
+    else:
+        unknown = set(algorithm_params) - accepted
+
+    if unknown:
+        raise ValueError('{} does not take {}, it takes {}'.format(
+            algorithm, ', '.join(sorted(unknown)), ', '.join(sorted(accepted))))
+
+
 def minimum_prime_hitting_set(
     int_list,
-    algorithm='exhaustive',
+    algorithm='auto',
     text=True,
+    bitset=False,
+    algorithm_params=None,
+    kernel=False,
+    cache=None,
+    time_budget=None,
+    stats=None,
 ):
     """Run MinPrimeHitSet algorithm.
 
@@ -504,9 +1411,29 @@ def minimum_prime_hitting_set(
     int_list : list
         List of integers to run the algorithm on.
     algorithm : string
-        Pick algorithm to be utilised in solution, takes values of 'exhaustive', 'greedy', 'stochastic'.
+        Pick algorithm to be utilised in solution, takes any of the names in get_chosen_algorithm i.e. 'exhaustive',
+        'branch-and-bound', 'greedy', 'stochastic'. The default, 'auto', picks an exact algorithm suited to the reduced
+        problem.
     text : bool
         Set False to avoid printing any statements throughout.
+    bitset : bool
+        Set True to run the reduction steps on bitmask encoded decompositions, which is far cheaper on large inputs.
+    algorithm_params : dict
+        Optional keyword arguments passed through to the chosen algorithm, i.e. {'seed': 0}.
+    kernel : bool
+        Set True to replace the usual reduction steps with kernelisation.kernelise, which applies every reduction rule
+        until the problem stops shrinking, before passing what's left to the chosen algorithm.
+    cache : SolutionCache
+        Optional solution_cache.SolutionCache. If the reduced problem has been solved before, exactly or by this same
+        algorithm and seed, the cached solution is used rather than running the algorithm again.
+    time_budget : float
+        Seconds the whole run, factorisation and reduction included, should take. Whatever is left after the reduction
+        is handed to the algorithm, which returns the best hitting set it has found when it runs out. Overrides any
+        time_budget in algorithm_params. None (the default) lets the algorithm run to completion.
+    stats : dict
+        Optional dict passed to the algorithm to fill. Every algorithm bar self-solve sets 'finished', False if the
+        time budget cut it short. With kernel=True it also gets 'kernel', the dict of how much each reduction rule
+        shrank the problem (see kernelisation.kernelise), even if the kernel leaves nothing for the algorithm.
 
     Returns
     -------
@@ -514,21 +1441,74 @@ def minimum_prime_hitting_set(
         List of integers that form *a* solution to MinPrimeHitSet for some input list of integers. Multiple solutions
         may exist and since no seed is set I think it is possible that this could output different lists each time if
         multiple solutions do exist. Returns None if no valid algorithm is selected
+
+    Raises
+    ------
+    ValueError
+        If algorithm_params holds a keyword the chosen algorithm doesn't take.
     """
+    deadline = as_deadline(time_budget)
+
+    algorithm_function = get_chosen_algorithm(algorithm)
+    if algorithm_function is None:
+        return None
+    if algorithm != 'self-solve':
+        check_algorithm_params(algorithm, algorithm_params or {})
+
     prime_decomposition_list = get_prime_decomposition_list(int_list, text)
 
-    sols = get_sols(prime_decomposition_list)
+    if kernel:
+        remaining, sols, kernel_stats = kernelise(prime_decomposition_list)
+
+        if stats is not None:
+            stats['kernel'] = dict(kernel_stats)
 
-    remaining = get_remaining(prime_decomposition_list, sols)
-    remaining = check_if_solved(remaining, sols)
-    remaining = solution_reduction(remaining, sols, text)
+        if text:
+            print('kernelised in {rounds} rounds: {forced_primes} forced primes hit {forced_sets} decompositions, '
+                  '{duplicate_sets} duplicate and {subsumed_sets} subsumed decompositions dropped, '
+                  '{dominated_primes} dominated primes removed\n'.format(**kernel_stats))
+
+        if not remaining:
+            if text:
+                print('\tMinHitSet complete! solution = {}'.format(sols))
+            return sols
+    elif bitset:
+        remaining, sols = bitset_reduction(prime_decomposition_list, text)
+    else:
+        sols = get_sols(prime_decomposition_list)
+
+        remaining = get_remaining(prime_decomposition_list, sols)
+        remaining = check_if_solved(remaining, sols)
+        remaining = solution_reduction(remaining, sols, text)
 
     if (type(remaining[0]) != list) and (algorithm != 'self-solve'):
         return remaining
     else:
-        try:
-            sols = get_chosen_algorithm(algorithm)(remaining, sols, text)
-            return sols
-        except TypeError:
-            print('partial solution = {}'.format(sols))
-            return sols
+        if cache is not None and algorithm != 'self-solve':
+            cached = cache.get(remaining, algorithm, algorithm_params)
+            if cached is not None:
+                if text:
+                    print('\tfound solution to the reduced problem in the cache')
+                return sols + cached
+
+        # self-solve just hands back the partial solution from the reduction steps
+        if algorithm == 'self-solve':
+            return self_solve_hitting_set(remaining, sols)
+
+        params = dict(algorithm_params or {})
+        run_stats = stats if stats is not None else {}
+        params['stats'] = run_stats
+        if time_budget is not None:
+            params['time_budget'] = deadline
+
+        reduced_sols = list(sols)
+        sols = algorithm_function(remaining, sols, text, **params)
+
+        if text and not run_stats.get('finished', True):
+            print('\tran out of time, returning the best solution found')
+
+        # a run cut short may not be minimal, and won't come out the same again, so isn't worth keeping
+        if cache is not None and run_stats.get('finished', True):
+            cache.put(remaining, algorithm, algorithm_params, [p for p in sols if p not in reduced_sols])
+
+        return sols
@@ -0,0 +1,206 @@
+"""
+Integer programming form of MinHitSet, solved by whichever offline solver happens to be installed. Neither solver is a
+hard dependency, solve_hitting_set_ilp just returns None if none are available. Both are only imported when they're
+actually used, since OR-Tools brings pandas in with it and would otherwise double the import time of
+hit_set_algorithms.
+
+The model is the standard set cover one: a binary variable per prime, a constraint per decomposition saying at least one
+of its primes is picked, and the objective is the number of primes picked.
+"""
+import collections
+import importlib.util
+import math
+from bitsets import build_prime_index, encode_decompositions
+from branch_and_bound import disjoint_lower_bound
+
+# every solver this module knows how to drive, whether or not it's installed
+ILP_SOLVERS = ('cbc', 'cp-sat')
+
+ILPResult = collections.namedtuple('ILPResult', ['solution', 'lower_bound', 'optimal', 'solver'])
+
+
+def _installed(module):
+    """Whether module can be imported, without importing it (beyond its parent packages)."""
+    try:
+        return importlib.util.find_spec(module) is not None
+    except ImportError:
+        return False
+
+
+def available_ilp_solvers():
+    """List the ILP solvers importable in this environment, in order of preference.
+
+    Returns
+    -------
+    list
+        Subset of ['cbc', 'cp-sat'].
+    """
+    solvers = []
+
+    # CBC's LP relaxation bound is much the stronger of the two on set cover style models, so it goes first
+    if _installed('pulp') and _cbc_command(None, False) is not None:
+        solvers.append('cbc')
+    if _installed('ortools.sat.python.cp_model'):
+        solvers.append('cp-sat')
+
+    return solvers
+
+
+def _fallback_lower_bound(remaining):
+    """Disjoint set lower bound, for when a solver doesn't report one of its own."""
+    _, bit_of = build_prime_index(remaining)
+
+    return disjoint_lower_bound((1 << len(remaining)) - 1, encode_decompositions(remaining, bit_of))
+
+
+def _solve_cp_sat(
+    remaining,
+    primes,
+    incumbent,
+    time_limit,
+):
+    """Solve the set cover model with OR-Tools CP-SAT."""
+    from ortools.sat.python import cp_model
+
+    model = cp_model.CpModel()
+    picked = {p: model.NewBoolVar('p_{}'.format(p)) for p in primes}
+
+    for decomposition in remaining:
+        model.AddBoolOr([picked[p] for p in decomposition])
+    model.Minimize(sum(picked.values()))
+
+    if incumbent is not None:
+        for p in primes:
+            model.AddHint(picked[p], p in incumbent)
+
+    solver = cp_model.CpSolver()
+    if time_limit is not None:
+        solver.parameters.max_time_in_seconds = float(time_limit)
+
+    status = solver.Solve(model)
+
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return None
+
+    solution = [p for p in primes if solver.Value(picked[p])]
+    lower_bound = max(math.ceil(solver.BestObjectiveBound() - 1e-6), _fallback_lower_bound(remaining))
+
+    return ILPResult(solution, lower_bound, status == cp_model.OPTIMAL, 'cp-sat')
+
+
+def _cbc_command(
+    time_limit,
+    warm_start,
+):
+    """PuLP command running CBC, preferring a CBC on the path (i.e. from pip install pulp[cbc]) over the copy bundled
+    with PuLP, which it only reaches through the deprecated PULP_CBC_CMD. Returns None if there's neither."""
+    import pulp
+    from pulp.apis import coin_api
+
+    command = pulp.COIN_CMD(msg=False, timeLimit=time_limit, warmStart=warm_start)
+    if command.available():
+        return command
+
+    bundled = getattr(coin_api, 'pulp_cbc_path', None)
+    if bundled is not None:
+        command = pulp.COIN_CMD(path=bundled, msg=False, timeLimit=time_limit, warmStart=warm_start)
+        if command.available():
+            return command
+
+    return None
+
+
+def _solve_cbc(
+    remaining,
+    primes,
+    incumbent,
+    time_limit,
+):
+    """Solve the set cover model with CBC through PuLP."""
+    import pulp
+
+    problem = pulp.LpProblem('minimum_prime_hitting_set', pulp.LpMinimize)
+    if hasattr(problem, 'add_variable'):
+        picked = {p: problem.add_variable('p_{}'.format(p), cat='Binary') for p in primes}
+    else:
+        # PuLP before 3.3 only has the free standing constructor
+        picked = {p: pulp.LpVariable('p_{}'.format(p), cat='Binary') for p in primes}
+
+    problem += pulp.lpSum(picked.values())
+    for decomposition in remaining:
+        problem += pulp.lpSum(picked[p] for p in decomposition) >= 1
+
+    if incumbent is not None:
+        for p in primes:
+            picked[p].setInitialValue(1 if p in incumbent else 0)
+
+    problem.solve(_cbc_command(time_limit, incumbent is not None))
+
+    if problem.sol_status not in (pulp.LpSolutionOptimal, pulp.LpSolutionIntegerFeasible):
+        return None
+
+    solution = [p for p in primes if picked[p].value() is not None and picked[p].value() > 0.5]
+    optimal = problem.sol_status == pulp.LpSolutionOptimal
+    lower_bound = len(solution) if optimal else _fallback_lower_bound(remaining)
+
+    return ILPResult(solution, lower_bound, optimal, 'cbc')
+
+
+def solve_hitting_set_ilp(
+    remaining,
+    incumbent=None,
+    time_limit=None,
+    solver=None,
+):
+    """Solve MinHitSet on remaining as an integer program.
+
+    Parameters
+    ----------
+    remaining : list
+        List of lists of remaining decompositions to be hit.
+    incumbent : list
+        Any known hitting set of remaining, passed to the solver as a warm start and returned if it finds nothing
+        better in the time limit.
+    time_limit : float
+        Seconds the solver may run for. None lets it run until optimal.
+    solver : str
+        One of ILP_SOLVERS. Defaults to the first of available_ilp_solvers().
+
+    Returns
+    -------
+    ILPResult / None
+        Named tuple of (solution, lower_bound, optimal, solver), or None if the requested solver isn't installed.
+
+    Raises
+    ------
+    ValueError
+        If solver isn't one of ILP_SOLVERS.
+    """
+    available = available_ilp_solvers()
+    if solver is not None and solver not in ILP_SOLVERS:
+        raise ValueError('solver must be one of {}, not {} (installed here: {})'.format(
+            ', '.join(ILP_SOLVERS), solver, ', '.join(available) or 'none'))
+    if solver is None and available:
+        solver = available[0]
+    if solver not in available:
+        return None
+
+    if not remaining:
+        return ILPResult([], 0, True, solver)
+
+    primes, _ = build_prime_index(remaining)
+    incumbent = None if incumbent is None else set(incumbent)
+
+    if solver == 'cbc':
+        result = _solve_cbc(remaining, primes, incumbent, time_limit)
+    else:
+        result = _solve_cp_sat(remaining, primes, incumbent, time_limit)
+
+    if incumbent is not None:
+        incumbent = sorted(incumbent & set(primes))
+        if result is None:
+            result = ILPResult(incumbent, _fallback_lower_bound(remaining), False, solver)
+        elif len(incumbent) < len(result.solution):
+            result = result._replace(solution=incumbent)
+
+    return result
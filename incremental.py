@@ -0,0 +1,221 @@
+"""
+Incremental MinPrimeHitSet, for when integers arrive (or leave) a few at a time and a current hitting set is needed
+after every batch rather than once at the end.
+
+The solver keeps the factors of every integer seen, an inverted index of prime to decompositions and a hit count per
+decomposition. A new integer already hit by the solution just bumps some counts. New decompositions left unhit are
+repaired locally, greedily adding whichever prime hits the most of them, then dropping any solution primes near the
+new ones that have become redundant. Nothing is ever solved from scratch unless resolve is called.
+"""
+import collections
+from factorisation import batch_prime_factors, prime_factors
+from hit_set_algorithms import get_chosen_algorithm
+
+# fewest new integers worth factoring as one batch, rather than one at a time through the shared sieve
+BATCH_FACTORISE_MIN = 1000
+
+
+class IncrementalHittingSet:
+    """Hitting set of a changing multiset of integers.
+
+    Parameters
+    ----------
+    int_list : list
+        Optional integers to start with.
+    """
+
+    def __init__(self, int_list=()):
+        self.factors = {}
+        self.value_counts = collections.Counter()
+        self.set_counts = collections.Counter()
+        self.sets_of = collections.defaultdict(set)
+        self.hit_counts = {}
+        self.solution_primes = set()
+
+        if int_list:
+            self.add(int_list)
+
+    def _factorise(self, values):
+        """Factor any of values not seen before, in one batch if there are enough of them to be worth it."""
+        new_values = list(set(val for val in values if val not in self.factors))
+
+        if len(new_values) >= BATCH_FACTORISE_MIN:
+            factor_lists = batch_prime_factors(new_values)
+        else:
+            factor_lists = [prime_factors(val) for val in new_values]
+
+        for val, primes in zip(new_values, factor_lists):
+            self.factors[val] = frozenset(primes)
+
+    def _insert(self, p):
+        """Put p in the solution, returning the decompositions it newly hits."""
+        self.solution_primes.add(p)
+        newly_hit = []
+
+        for key in self.sets_of[p]:
+            if self.hit_counts[key] == 0:
+                newly_hit.append(key)
+            self.hit_counts[key] += 1
+
+        return newly_hit
+
+    def _prune(self, candidates):
+        """Drop every prime in candidates that is in the solution but no longer needed, least used first."""
+        for p in sorted(candidates, key=lambda q: (len(self.sets_of.get(q, ())), q)):
+            if p in self.solution_primes and all(self.hit_counts[key] > 1 for key in self.sets_of.get(p, ())):
+                self.solution_primes.discard(p)
+                for key in self.sets_of.get(p, ()):
+                    self.hit_counts[key] -= 1
+
+    def _repair(self, unhit):
+        """Greedily insert primes until every decomposition in unhit is hit, then prune around what was inserted."""
+        unhit = set(unhit)
+        inserted = []
+
+        while unhit:
+            gains = collections.Counter(p for key in unhit for p in key)
+            # ties go to the smallest prime, so the same inputs always give the same solution
+            p = min(gains, key=lambda q: (-gains[q], q))
+
+            unhit.difference_update(self._insert(p))
+            inserted.append(p)
+
+        neighbours = set(q for p in inserted for key in self.sets_of[p] for q in key)
+        self._prune(neighbours & self.solution_primes)
+
+    def add(self, int_list):
+        """Add integers, repairing the solution around any decompositions they leave unhit. An integer whose
+        decomposition is already hit costs a hash lookup per prime factor.
+
+        Parameters
+        ----------
+        int_list : list
+            Integers to add. Repeats are counted, so each needs removing as many times as it was added.
+
+        Returns
+        -------
+        int
+            Number of new decompositions that weren't hit by the solution, and so needed repairing.
+        """
+        values = [abs(int(val)) for val in int_list]
+        self._factorise(values)
+        unhit = []
+
+        for val in values:
+            key = self.factors[val]
+            self.value_counts[val] += 1
+
+            if not key:
+                continue
+
+            self.set_counts[key] += 1
+            if self.set_counts[key] == 1:
+                for p in key:
+                    self.sets_of[p].add(key)
+                self.hit_counts[key] = len(key & self.solution_primes)
+
+                if self.hit_counts[key] == 0:
+                    unhit.append(key)
+
+        if unhit:
+            self._repair(unhit)
+
+        return len(unhit)
+
+    def remove(self, int_list):
+        """Remove integers, dropping any solution primes left redundant.
+
+        Parameters
+        ----------
+        int_list : list
+            Integers to remove, each previously added.
+
+        Raises
+        ------
+        ValueError
+            If an integer is removed more times than it was added. Integers before it in int_list are still removed,
+            and the solution pruned around them.
+        """
+        candidates = set()
+
+        try:
+            for val in int_list:
+                val = abs(int(val))
+                if self.value_counts[val] == 0:
+                    raise ValueError('{} is not in the incremental hitting set'.format(val))
+
+                self.value_counts[val] -= 1
+                if self.value_counts[val] == 0:
+                    del self.value_counts[val]
+
+                key = self.factors[val]
+                if not key:
+                    continue
+
+                self.set_counts[key] -= 1
+                if self.set_counts[key] == 0:
+                    del self.set_counts[key]
+                    del self.hit_counts[key]
+                    for p in key:
+                        self.sets_of[p].discard(key)
+                        if not self.sets_of[p]:
+                            del self.sets_of[p]
+                    candidates |= key
+        finally:
+            self._prune(candidates & self.solution_primes)
+
+    def decompositions(self):
+        """The distinct prime decompositions currently needing to be hit.
+
+        Returns
+        -------
+        list
+            List of sorted lists of primes.
+        """
+        return [sorted(key) for key in self.set_counts]
+
+    def solution(self):
+        """The current hitting set.
+
+        Returns
+        -------
+        list
+            Sorted list of primes hitting every integer currently held.
+        """
+        return sorted(self.solution_primes)
+
+    def resolve(
+        self,
+        algorithm='greedy',
+        algorithm_params=None,
+    ):
+        """Solve the current decompositions from scratch with any algorithm from get_chosen_algorithm, and keep the
+        answer if it beats the incrementally maintained solution.
+
+        Parameters
+        ----------
+        algorithm : string
+            Name of the algorithm to run.
+        algorithm_params : dict
+            Optional keyword arguments passed through to the algorithm.
+
+        Returns
+        -------
+        bool
+            True if the solution was replaced.
+        """
+        remaining = self.decompositions()
+        if not remaining:
+            return False
+
+        candidate = set(get_chosen_algorithm(algorithm)(remaining, [], False, **(algorithm_params or {})))
+        if len(candidate) >= len(self.solution_primes):
+            return False
+
+        self.solution_primes = set()
+        for key in self.hit_counts:
+            self.hit_counts[key] = 0
+        for p in candidate:
+            self._insert(p)
+
+        return True
@@ -0,0 +1,197 @@
+"""
+Kernelisation of MinHitSet, i.e. shrinking the problem as far as possible with reduction rules that never change the
+size of the minimum solution, before any algorithm gets to see it. The rules are applied over and over until none of
+them changes anything:
+
+1. forced singletons - a decomposition of a single prime can only be hit by that prime, so it goes straight into the
+   solution and every decomposition it hits is dropped.
+2. duplicate collapse - identical decompositions only need hitting once.
+3. subsumption - if decomposition A is a strict subset of B, anything hitting A also hits B, so B is dropped.
+4. element domination - if every decomposition containing p also contains q, q is at least as good a pick as p, so p is
+   dropped from every decomposition. Of primes appearing in exactly the same decompositions only the smallest is kept.
+
+Note that subsumption here drops the superset, where get_remaining keeps it. Every rule works from hashed frozensets and
+an inverted index of prime to decompositions, so nothing is ever compared pairwise against everything else.
+"""
+import collections
+
+Kernel = collections.namedtuple('Kernel', ['remaining', 'forced', 'stats'])
+
+
+def _inverted_index(decompositions):
+    """Map each prime to the list of indices of the decompositions it appears in."""
+    index = collections.defaultdict(list)
+    for j, decomposition in enumerate(decompositions):
+        for p in decomposition:
+            index[p].append(j)
+
+    return index
+
+
+def force_singletons(decompositions):
+    """Pick the prime of every single prime decomposition and drop every decomposition those primes hit.
+
+    Parameters
+    ----------
+    decompositions : list
+        List of lists of primes.
+
+    Returns
+    -------
+    tuple
+        (decompositions, forced) where decompositions are those left unhit and forced is the sorted list of primes
+        picked.
+    """
+    forced = set(decomposition[0] for decomposition in decompositions if len(decomposition) == 1)
+    if not forced:
+        return decompositions, []
+
+    decompositions = [decomposition for decomposition in decompositions
+                      if not any(p in forced for p in decomposition)]
+
+    return decompositions, sorted(forced)
+
+
+def collapse_duplicates(decompositions):
+    """Keep only the first of each group of decompositions holding the same primes, in whatever order.
+
+    Parameters
+    ----------
+    decompositions : list
+        List of lists of primes.
+
+    Returns
+    -------
+    list
+        The decompositions with duplicates removed, otherwise in their original order.
+    """
+    seen = set()
+    collapsed = []
+
+    for decomposition in decompositions:
+        key = frozenset(decomposition)
+        if key not in seen:
+            seen.add(key)
+            collapsed.append(decomposition)
+
+    return collapsed
+
+
+def remove_subsumed(decompositions):
+    """Drop every decomposition that is a strict superset of another. Supersets of a decomposition are found by
+    scanning only the decompositions containing its rarest prime.
+
+    Parameters
+    ----------
+    decompositions : list
+        List of lists of primes, free of duplicates.
+
+    Returns
+    -------
+    list
+        The decompositions that contain no other decomposition, in their original order.
+    """
+    sets = [frozenset(decomposition) for decomposition in decompositions]
+    index = _inverted_index(decompositions)
+    subsumed = set()
+
+    for decomposition_set in sets:
+        rarest = min(decomposition_set, key=lambda p: len(index[p]))
+        for j in index[rarest]:
+            if len(sets[j]) > len(decomposition_set) and decomposition_set <= sets[j]:
+                subsumed.add(j)
+
+    return [decomposition for j, decomposition in enumerate(decompositions) if j not in subsumed]
+
+
+def remove_dominated(decompositions):
+    """Drop every prime p for which some other prime q appears in every decomposition p does. Candidates for q only come
+    from the shortest decomposition containing p.
+
+    Parameters
+    ----------
+    decompositions : list
+        List of lists of primes.
+
+    Returns
+    -------
+    tuple
+        (decompositions, dominated) where decompositions have had the dominated primes removed and dominated is the
+        sorted list of primes removed.
+    """
+    index = {p: set(js) for p, js in _inverted_index(decompositions).items()}
+    dominated = []
+
+    for p, sets_p in index.items():
+        shortest = min((decompositions[j] for j in sets_p), key=len)
+
+        for q in shortest:
+            sets_q = index[q]
+            # of two primes in exactly the same decompositions the larger goes, so they never knock each other out
+            if q != p and (len(sets_q) > len(sets_p) or q < p) and sets_p <= sets_q:
+                dominated.append(p)
+                break
+
+    if not dominated:
+        return decompositions, []
+
+    dropped = set(dominated)
+    decompositions = [[p for p in decomposition if p not in dropped] for decomposition in decompositions]
+
+    return decompositions, sorted(dominated)
+
+
+def kernelise(decompositions):
+    """Apply every reduction rule repeatedly until the problem stops shrinking. The forced primes plus any minimum
+    hitting set of the kernel make a minimum hitting set of the original decompositions.
+
+    Parameters
+    ----------
+    decompositions : list
+        List of lists of primes, i.e. the output of get_prime_decomposition_list.
+
+    Returns
+    -------
+    Kernel
+        Named tuple of (remaining, forced, stats). remaining is the list of lists of decompositions left to hit, forced
+        the list of primes that have to be in the solution and stats a dict counting the 'rounds' run, the
+        'forced_primes' picked, the decompositions dropped as 'forced_sets', 'duplicate_sets' and 'subsumed_sets', and
+        the 'dominated_primes' removed.
+    """
+    remaining = [list(decomposition) for decomposition in decompositions]
+    forced = []
+    stats = {
+        'rounds': 0,
+        'forced_primes': 0,
+        'forced_sets': 0,
+        'duplicate_sets': 0,
+        'subsumed_sets': 0,
+        'dominated_primes': 0,
+    }
+    changed = True
+
+    while changed and remaining:
+        stats['rounds'] += 1
+
+        before = len(remaining)
+        remaining, newly_forced = force_singletons(remaining)
+        forced += newly_forced
+        stats['forced_primes'] += len(newly_forced)
+        stats['forced_sets'] += before - len(remaining)
+
+        before = len(remaining)
+        remaining = collapse_duplicates(remaining)
+        stats['duplicate_sets'] += before - len(remaining)
+
+        before = len(remaining)
+        remaining = remove_subsumed(remaining)
+        stats['subsumed_sets'] += before - len(remaining)
+
+        remaining, dominated = remove_dominated(remaining)
+        stats['dominated_primes'] += len(dominated)
+
+        # the set dropping rules all ran before domination, so only a dominated prime (leaving smaller decompositions
+        # behind) can give them anything new to do
+        changed = bool(dominated)
+
+    return Kernel(remaining, forced, stats)
@@ -0,0 +1,471 @@
+"""
+Asyncio front end for MinPrimeHitSet, so a web tier can hand solves off without blocking a thread on each.
+
+At most max_queue requests are in flight at once, counting those waiting, being factored and being solved, and any more
+are turned away straight off rather than letting latency grow without limit. A single batching task takes requests off
+the queue a few milliseconds' worth at a time and factors all of their integers together through one shared sieve, then
+kernelises each (see kernelisation.py). Anything the kernel doesn't solve outright is sent to a process pool, along with
+most of what's left of its time budget if the algorithm takes one. A request still unsolved when its time budget runs
+out gets the lazy greedy cover of its reduced problem instead, flagged as a timeout.
+
+Every job sent to the pool carries a Deadline (see deadline.py) whose cancelled check reads a flag in memory shared with
+the workers. Cancelling a request, or running out of time on it, drops its job if it's still queued and sets the flag
+if it's running, so the algorithm stops at its next deadline check rather than holding the worker up.
+
+The server speaks newline delimited JSON over TCP on localhost or a unix socket. Each request is a line such as
+
+    {"id": 1, "ints": [6, 10, 15], "algorithm": "exhaustive", "time_budget": 0.5}
+
+and is answered, possibly out of order, by a line such as
+
+    {"id": 1, "status": "ok", "solution": [2, 3]}
+
+where status is one of 'ok', 'timeout', 'busy', 'cancelled' or 'error'. Sending {"cancel": 1} cancels request 1.
+
+    python service.py --port 8765
+"""
+import argparse
+import asyncio
+import collections
+import inspect
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from deadline import Deadline
+from factorisation import compact_prime_factors, expand_compact_decomposition
+from kernelisation import kernelise
+from hit_set_algorithms import get_chosen_algorithm, lazy_greedy_cover
+
+# share of a request's remaining time budget handed to the algorithm itself, the rest covering the trip to the worker
+WORKER_BUDGET_SHARE = 0.8
+
+
+# cancel flags of the jobs, one per slot, set in each worker process by _init_worker
+_cancel_flags = None
+
+
+class ServiceBusy(Exception):
+    """Raised when a request arrives while max_queue requests are already in flight."""
+
+
+def _greedy_fallback(
+    remaining,
+    sols,
+):
+    """Solution handed back when the algorithm runs out of time."""
+    return sols + lazy_greedy_cover(remaining)
+
+
+def _init_worker(cancel_flags):
+    """Keep hold of the shared cancel flags in a worker process."""
+    global _cancel_flags
+    _cancel_flags = cancel_flags
+
+
+class _CancelFlag:
+    """Check of one job's cancel flag, a class rather than a closure so a Deadline holding it still pickles."""
+
+    def __init__(self, slot):
+        self.slot = slot
+
+    def __call__(self):
+        return _cancel_flags is not None and bool(_cancel_flags[self.slot])
+
+
+def _solve_in_worker(
+    remaining,
+    sols,
+    algorithm,
+    algorithm_params,
+    deadline,
+):
+    """Run one reduced problem through its algorithm, top level so it can be sent to a worker process. The deadline
+    stands in for any time_budget, if the algorithm takes one."""
+    chosen_algorithm = get_chosen_algorithm(algorithm)
+    algorithm_params = dict(algorithm_params or {})
+    if 'time_budget' in inspect.signature(chosen_algorithm).parameters:
+        algorithm_params['time_budget'] = deadline
+
+    return chosen_algorithm(remaining, list(sols), False, **algorithm_params)
+
+
+class SolveService:
+    """Batching, bounded, asynchronous MinPrimeHitSet solver. Use as an async context manager, or call start and stop.
+
+    Parameters
+    ----------
+    workers : int
+        Number of solver processes. Defaults to one per cpu.
+    max_queue : int
+        Number of requests allowed in flight, waiting, being factored or being solved, before new ones are turned away.
+    batch_window : float
+        Seconds the batching task waits after the first request of a batch for others to join it.
+    max_batch : int
+        Largest number of requests factored together.
+    default_time_budget : float
+        Time budget, in seconds, for requests that don't set their own. None lets them run until solved.
+    """
+
+    def __init__(
+        self,
+        workers=None,
+        max_queue=1000,
+        batch_window=0.005,
+        max_batch=256,
+        default_time_budget=None,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.default_time_budget = default_time_budget
+        self.stats = collections.Counter()
+
+        self._queue = None
+        self._pool = None
+        self._batcher = None
+        self._dispatched = set()
+        self._in_flight = 0
+        self._cancel_flags = None
+        self._free_slots = []
+
+    async def start(self):
+        """Start the process pool and the batching task."""
+        self._queue = asyncio.Queue()
+        # a slot stays taken until its job is out of the worker, which can be a while after its request settles
+        self._cancel_flags = multiprocessing.RawArray('b', self.max_queue + self.workers)
+        self._free_slots = list(range(len(self._cancel_flags)))
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                         initargs=(self._cancel_flags,))
+        self._batcher = asyncio.get_running_loop().create_task(self._run_batches())
+
+    async def stop(self):
+        """Stop batching, cancel everything in flight and shut the process pool down. Solves already running in a
+        worker process are left to finish there, but nobody waits for them."""
+        self._batcher.cancel()
+        for task in list(self._dispatched):
+            task.cancel()
+        await asyncio.gather(self._batcher, *self._dispatched, return_exceptions=True)
+
+        while not self._queue.empty():
+            self._queue.get_nowait()[-1].cancel()
+
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def solve(
+        self,
+        int_list,
+        algorithm='greedy',
+        algorithm_params=None,
+        time_budget=None,
+    ):
+        """Solve MinPrimeHitSet for int_list. Cancelling the awaiting task cancels the request.
+
+        Parameters
+        ----------
+        int_list : list
+            List of integers to run the algorithm on.
+        algorithm : string
+            Any name from get_chosen_algorithm.
+        algorithm_params : dict
+            Optional keyword arguments passed through to the algorithm.
+        time_budget : float
+            Seconds from now to answer within. Defaults to the service's default_time_budget.
+
+        Returns
+        -------
+        dict
+            Dict of 'status', 'ok' or 'timeout', and 'solution', the list of primes found.
+
+        Raises
+        ------
+        ServiceBusy
+            If max_queue requests are already in flight.
+        """
+        if get_chosen_algorithm(algorithm) is None:
+            raise ValueError('{} is not an available algorithm'.format(algorithm))
+
+        loop = asyncio.get_running_loop()
+        time_budget = self.default_time_budget if time_budget is None else time_budget
+        deadline = None if time_budget is None else loop.time() + time_budget
+        if self._in_flight >= self.max_queue:
+            self.stats['busy'] += 1
+            raise ServiceBusy('{} requests are already in flight'.format(self.max_queue))
+
+        result = loop.create_future()
+        self._in_flight += 1
+        result.add_done_callback(self._release)
+        self._queue.put_nowait((list(int_list), algorithm, algorithm_params, deadline, result))
+
+        try:
+            return await result
+        except asyncio.CancelledError:
+            self.stats['cancelled'] += 1
+            raise
+
+    def _release(self, result):
+        """Count a settled request as out of flight."""
+        self._in_flight -= 1
+
+    def _submit(
+        self,
+        remaining,
+        sols,
+        algorithm,
+        algorithm_params,
+        time_budget,
+    ):
+        """Send one reduced problem to the pool under a Deadline of time_budget. Cancelling the returned future drops
+        the job if it's still queued, and sets its cancel flag so the algorithm stops if it's running."""
+        slot = self._free_slots.pop() if self._free_slots else None
+        if slot is not None:
+            self._cancel_flags[slot] = 0
+
+        deadline = Deadline(time_budget, None if slot is None else _CancelFlag(slot))
+        job = self._pool.submit(_solve_in_worker, remaining, sols, algorithm, algorithm_params, deadline)
+        solving = asyncio.wrap_future(job)
+
+        if slot is not None:
+            def cancel(_):
+                if solving.cancelled():
+                    self._cancel_flags[slot] = 1
+
+            solving.add_done_callback(cancel)
+            # called from the pool's own thread, but a list append is atomic
+            job.add_done_callback(lambda _: self._free_slots.append(slot))
+
+        return solving
+
+    async def _next_batch(self):
+        """Wait for a request, then gather any others arriving within the batch window."""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        closes = loop.time() + self.batch_window
+
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), max(closes - loop.time(), 0)))
+            except asyncio.TimeoutError:
+                break
+
+        return [request for request in batch if not request[-1].cancelled()]
+
+    async def _run_batches(self):
+        """Factor and reduce batches of requests, sending the unsolved ones on to the process pool."""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = await self._next_batch()
+            if not batch:
+                continue
+
+            self.stats['batches'] += 1
+            self.stats['requests'] += len(batch)
+
+            # one factorisation for the whole batch, the sieve is shared and repeats across requests factored once
+            int_lists = [request[0] for request in batch]
+            try:
+                compact = await loop.run_in_executor(
+                    None, compact_prime_factors, [val for int_list in int_lists for val in int_list])
+                decompositions = expand_compact_decomposition(compact)
+            except Exception as error:
+                for request in batch:
+                    if not request[-1].done():
+                        self.stats['error'] += 1
+                        request[-1].set_exception(error)
+                continue
+
+            start = 0
+            for (int_list, algorithm, algorithm_params, deadline, result) in batch:
+                request_decompositions = [d for d in decompositions[start:start + len(int_list)] if d != []]
+                start += len(int_list)
+
+                task = loop.create_task(
+                    self._solve_request(request_decompositions, algorithm, algorithm_params, deadline, result))
+                self._dispatched.add(task)
+                task.add_done_callback(self._dispatched.discard)
+
+    async def _solve_request(
+        self,
+        prime_decomposition_list,
+        algorithm,
+        algorithm_params,
+        deadline,
+        result,
+    ):
+        """Kernelise one request and solve what's left in the pool, settling result however it ends."""
+        loop = asyncio.get_running_loop()
+
+        try:
+            remaining, sols, _ = await loop.run_in_executor(None, kernelise, prime_decomposition_list)
+
+            if not remaining:
+                self._settle(result, 'ok', sols)
+                return
+
+            algorithm_params = dict(algorithm_params or {})
+            timeout = None if deadline is None else max(deadline - loop.time(), 0)
+            time_budget = algorithm_params.pop('time_budget', None)
+            if time_budget is None and timeout is not None:
+                time_budget = timeout * WORKER_BUDGET_SHARE
+
+            solving = self._submit(remaining, sols, algorithm, algorithm_params, time_budget)
+            # however result ends up settled, including by the caller cancelling, the job is no longer wanted
+            result.add_done_callback(lambda _: solving.cancel())
+
+            try:
+                self._settle(result, 'ok', await asyncio.wait_for(asyncio.shield(solving), timeout))
+            except asyncio.TimeoutError:
+                solving.cancel()
+                self._settle(result, 'timeout', await loop.run_in_executor(None, _greedy_fallback, remaining, sols))
+        except asyncio.CancelledError:
+            if not result.done():
+                result.cancel()
+            raise
+        except Exception as error:
+            if not result.done():
+                self.stats['error'] += 1
+                result.set_exception(error)
+
+    def _settle(
+        self,
+        result,
+        status,
+        solution,
+    ):
+        """Hand a finished solve back to whoever is awaiting it, unless they've already given up."""
+        if not result.done():
+            self.stats[status] += 1
+            result.set_result({'status': status, 'solution': [int(p) for p in solution]})
+
+
+async def _answer(
+    service,
+    message,
+    writer,
+    write_lock,
+):
+    """Solve one request line and write back its response line."""
+    response = {'id': message.get('id')}
+
+    try:
+        response.update(await service.solve(
+            message['ints'],
+            message.get('algorithm', 'greedy'),
+            message.get('algorithm_params'),
+            message.get('time_budget'),
+        ))
+    except ServiceBusy:
+        response['status'] = 'busy'
+    except asyncio.CancelledError:
+        response['status'] = 'cancelled'
+    except Exception as error:
+        response.update({'status': 'error', 'message': str(error)})
+
+    async with write_lock:
+        writer.write((json.dumps(response) + '\n').encode())
+        await writer.drain()
+
+
+async def handle_connection(
+    service,
+    reader,
+    writer,
+):
+    """Read request lines off one connection until it closes, answering each as it finishes."""
+    in_flight = {}
+    write_lock = asyncio.Lock()
+
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+
+            try:
+                message = json.loads(line)
+            except ValueError:
+                async with write_lock:
+                    writer.write(b'{"status": "error", "message": "request is not valid JSON"}\n')
+                    await writer.drain()
+                continue
+
+            if 'cancel' in message:
+                task = in_flight.get(message['cancel'])
+                if task is not None:
+                    task.cancel()
+                continue
+
+            task = asyncio.get_running_loop().create_task(_answer(service, message, writer, write_lock))
+            in_flight[message.get('id')] = task
+            task.add_done_callback(lambda _, key=message.get('id'): in_flight.pop(key, None))
+    except asyncio.CancelledError:
+        # the server is shutting down, which is as good as the client hanging up
+        pass
+    finally:
+        for task in list(in_flight.values()):
+            task.cancel()
+        await asyncio.gather(*in_flight.values(), return_exceptions=True)
+        writer.close()
+
+
+async def serve(
+    service,
+    host='127.0.0.1',
+    port=8765,
+    path=None,
+):
+    """Start serving requests for a started SolveService.
+
+    Parameters
+    ----------
+    service : SolveService
+        The service to hand requests to.
+    host : str
+        Address to listen on. Only used without path.
+    port : int
+        Port to listen on. Only used without path.
+    path : str
+        Unix socket path to listen on, rather than TCP.
+
+    Returns
+    -------
+    asyncio.Server
+        The running server.
+    """
+    def handler(reader, writer):
+        return handle_connection(service, reader, writer)
+
+    if path is not None:
+        return await asyncio.start_unix_server(handler, path)
+
+    return await asyncio.start_server(handler, host, port)
+
+
+async def _main(arguments):
+    """Run the service until interrupted."""
+    async with SolveService(arguments.workers, arguments.max_queue,
+                            default_time_budget=arguments.time_budget) as service:
+        server = await serve(service, arguments.host, arguments.port, arguments.path)
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve MinPrimeHitSet solves over a local socket.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--path', help='unix socket path, used instead of host and port')
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--max-queue', type=int, default=1000)
+    parser.add_argument('--time-budget', type=float, help='default time budget per request in seconds')
+
+    asyncio.run(_main(parser.parse_args()))
@@ -6,11 +6,15 @@ TODO - probably rename the file lets be real 'shared_functions' is hardly clear
 import itertools
 import collections
 import random
+from factorisation import prime_factors, batch_prime_factors
+
+# largest decomposition drop_strict_subsets will enumerate the subsets of, 2 ** 12 lookups at most per decomposition
+SUBSET_ENUMERATION_LIMIT = 12
 
 
 def prime_factor_decomposition(val):
     """Reduce any integer into its unique prime decomposition, returning the input integer if the integer itself is
-    prime.
+    prime. Factorisation itself is handed off to the sieve / Pollard's rho engine in factorisation.py.
 
     Parameters
     ----------
@@ -22,28 +26,15 @@ def prime_factor_decomposition(val):
     list
         List of prime factors of val, or an empty list if val is in [-1, 0, 1]
     """
-    val = abs(val)
-
-    if val not in [0, 1]:
-        divisors = list(set([d if val % d == 0 else val
-                             for d in range(2, val // 2 + 1)]))
-        divisors = [d for d in divisors
-                    if all(d % od != 0 for od in divisors if od != d)]
-
-        if val in [2, 3]:
-            divisors = divisors + [val]
-
-        return divisors
-
-    else:
-        return []
+    return prime_factors(val)
 
 
 def get_prime_decomposition_list(
     int_list,
     text,
 ):
-    """Break a list of integers down into their unique prime factors
+    """Break a list of integers down into their unique prime factors. The whole list is factorised in one batch, so
+    repeated integers are only ever factored once.
 
     Parameters
     ----------
@@ -60,8 +51,8 @@ def get_prime_decomposition_list(
     if text:
         print('\ndecomposing input integers...\n')
 
-    prime_decomposition_list = [prime_factor_decomposition(i) for i in int_list
-                                if prime_factor_decomposition(i) != []]
+    prime_decomposition_list = [decomposition for decomposition in batch_prime_factors(int_list)
+                                if decomposition != []]
 
     return prime_decomposition_list
 
@@ -86,6 +77,57 @@ def get_sols(prime_decomposition_list):
     return sols
 
 
+def drop_strict_subsets(decompositions):
+    """Drop every decomposition that is a strict subset of another, i.e. [2, 3], [3, 2, 7] -> [3, 2, 7]. Identical
+    decompositions are all kept.
+
+    Rather than comparing every pair, each distinct decomposition of up to SUBSET_ENUMERATION_LIMIT primes looks up
+    every one of its own strict subsets in a hash set of the decompositions. Integers have few distinct prime factors so
+    this is nearly always the route taken. Anything larger goes in a prime -> sets inverted index, and every
+    decomposition checks for a superset among just the large ones holding its rarest prime.
+
+    Parameters
+    ----------
+    decompositions : list
+        List of lists of prime numbers.
+
+    Returns
+    -------
+    list
+        The decompositions not strictly contained in any other, in their original order.
+    """
+    decomposition_sets = [frozenset(decomposition) for decomposition in decompositions]
+    distinct = set(decomposition_sets)
+    subsets = set()
+    large_sets = []
+    large_index = collections.defaultdict(list)
+
+    for decomposition_set in distinct:
+        if len(decomposition_set) <= SUBSET_ENUMERATION_LIMIT:
+            for size in range(len(decomposition_set)):
+                for subset in itertools.combinations(decomposition_set, size):
+                    subset = frozenset(subset)
+                    if subset in distinct:
+                        subsets.add(subset)
+        else:
+            large_sets.append(decomposition_set)
+            for p in decomposition_set:
+                large_index[p].append(decomposition_set)
+
+    if large_sets:
+        for decomposition_set in distinct - subsets:
+            if decomposition_set:
+                candidates = large_index.get(min(decomposition_set, key=lambda p: len(large_index.get(p, ()))), ())
+            else:
+                candidates = large_sets
+
+            if any(decomposition_set < other for other in candidates):
+                subsets.add(decomposition_set)
+
+    return [decomposition for decomposition, decomposition_set in zip(decompositions, decomposition_sets)
+            if decomposition_set not in subsets]
+
+
 def get_remaining(
     prime_decomposition_list,
     sols,
@@ -108,16 +150,12 @@ def get_remaining(
     list
         List of lists where each sublist if of length > 1.
     """
-    sols = [[i] for i in sols]
+    sols = set(sols)
 
     remaining = [decomposition for decomposition in prime_decomposition_list
-                 if decomposition not in sols]
-    remaining_sets = [set(decomposition) for decomposition in remaining]
-
-    remaining = [decomposition_list for decomposition_list, decomposition_set in zip(remaining, remaining_sets)
-                 if not any(decomposition_set < other for other in remaining_sets)]
+                 if not (len(decomposition) == 1 and decomposition[0] in sols)]
 
-    return remaining
+    return drop_strict_subsets(remaining)
 
 
 def check_if_solved(
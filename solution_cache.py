@@ -0,0 +1,311 @@
+"""
+Memoisation of solved instances, so repeated or overlapping inputs that reduce to the same problem skip the search.
+
+Instances are keyed on the canonical form of what's left after the reduction steps, i.e. the sorted, deduplicated
+decompositions, hashed. An exact solution is valid whichever algorithm asks for it next, so those are stored under the
+instance alone. A heuristic solution is only reusable by the same algorithm run with the same params (seed included),
+so those are stored under all three, and only at all if rerunning would give the same answer anyway.
+
+Entries live in an in memory LRU, optionally backed by a SQLite file that persists between runs. The LRU is bounded
+both by its number of entries and, optionally, by the total number of primes held across their solutions, which is
+what its memory use actually grows with.
+"""
+import collections
+import hashlib
+import json
+import sqlite3
+
+# algorithms guaranteed to return a minimum solution, so long as no time budget cuts them short
+EXACT_ALGORITHMS = frozenset(['exhaustive', 'branch-and-bound', 'ilp', 'portfolio'])
+
+# algorithms that are exact whenever the algorithms they hand the work to are, mapped to those params and their defaults
+DELEGATING_ALGORITHMS = {
+    'components': {'algorithm': 'branch-and-bound', 'small_algorithm': 'exhaustive'},
+}
+
+# heuristics that involve no randomness, so give the same answer every time without a seed
+DETERMINISTIC_ALGORITHMS = frozenset(['greedy'])
+
+CacheInfo = collections.namedtuple(
+    'CacheInfo', ['hits', 'misses', 'disk_hits', 'max_entries', 'entries', 'max_primes', 'primes']
+)
+
+
+def canonical_instance(remaining):
+    """Canonical form of a set of decompositions, independent of the order of the decompositions, the order of the
+    primes within them, and any repeats.
+
+    Parameters
+    ----------
+    remaining : list
+        List of lists of remaining decompositions.
+
+    Returns
+    -------
+    tuple
+        Sorted tuple of sorted tuples of primes.
+    """
+    return tuple(sorted(set(tuple(sorted(decomposition)) for decomposition in remaining)))
+
+
+def instance_digest(remaining):
+    """SHA-256 hex digest of the canonical form of remaining.
+
+    Parameters
+    ----------
+    remaining : list
+        List of lists of remaining decompositions.
+
+    Returns
+    -------
+    str
+        Hex digest identifying the instance.
+    """
+    return hashlib.sha256(repr(canonical_instance(remaining)).encode()).hexdigest()
+
+
+def is_exact(
+    algorithm,
+    algorithm_params=None,
+):
+    """Check if a run of algorithm with algorithm_params is guaranteed to give a minimum solution.
+
+    Parameters
+    ----------
+    algorithm : string
+        Name of the algorithm, as in get_chosen_algorithm.
+    algorithm_params : dict
+        Keyword arguments the algorithm is run with.
+
+    Returns
+    -------
+    bool
+        True if the algorithm is exact and not running under a time budget. Algorithms handing their work to others,
+        i.e. components, count as exact when those others are and aren't under a time budget either.
+    """
+    algorithm_params = algorithm_params or {}
+
+    if algorithm in DELEGATING_ALGORITHMS:
+        delegates = [algorithm_params.get(param, default)
+                     for param, default in DELEGATING_ALGORITHMS[algorithm].items()]
+        # only the main delegate is passed params, so only it can have been given a time budget
+        exact = all(delegate in EXACT_ALGORITHMS for delegate in delegates) and \
+            is_exact(delegates[0], algorithm_params.get('algorithm_params'))
+    else:
+        # auto only picks from the exact algorithms when asked for an exact answer
+        exact = algorithm in EXACT_ALGORITHMS or \
+            (algorithm == 'auto' and algorithm_params.get('quality', 'exact') == 'exact')
+
+    return exact and algorithm_params.get('time_budget') is None
+
+
+def is_reproducible(
+    algorithm,
+    algorithm_params=None,
+):
+    """Check if a run of algorithm with algorithm_params always gives the same solution.
+
+    Parameters
+    ----------
+    algorithm : string
+        Name of the algorithm, as in get_chosen_algorithm.
+    algorithm_params : dict
+        Keyword arguments the algorithm is run with.
+
+    Returns
+    -------
+    bool
+        True if the algorithm is deterministic or has been given a seed.
+    """
+    algorithm_params = algorithm_params or {}
+
+    return (
+        algorithm in DETERMINISTIC_ALGORITHMS
+        or algorithm_params.get('seed') is not None
+        or algorithm_params.get('seeds') is not None
+    )
+
+
+class SolutionCache:
+    """LRU cache of MinHitSet solutions keyed on the reduced instance, with an optional SQLite backing store.
+
+    Parameters
+    ----------
+    max_entries : int
+        Number of solutions held in memory before the least recently used is evicted.
+    max_primes : int
+        Optional limit on the total number of primes across the solutions held in memory, least recently used solutions
+        being evicted until back under it. A single solution larger than the limit isn't held in memory at all.
+    path : str
+        Optional path of a SQLite file to persist solutions in. Entries evicted from memory stay on disk, and are
+        loaded back in when next asked for.
+    """
+
+    def __init__(
+        self,
+        max_entries=1024,
+        max_primes=None,
+        path=None,
+    ):
+        self.max_entries = max_entries
+        self.max_primes = max_primes
+        self.primes = 0
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.connection = None
+
+        if path is not None:
+            self.connection = sqlite3.connect(path)
+            self.connection.execute('CREATE TABLE IF NOT EXISTS solutions (key TEXT PRIMARY KEY, solution TEXT)')
+            self.connection.commit()
+
+    @staticmethod
+    def _keys(
+        digest,
+        algorithm,
+        algorithm_params,
+    ):
+        """The exact and heuristic cache keys for an instance and run."""
+        params = json.dumps(algorithm_params or {}, sort_keys=True, default=repr)
+
+        return 'exact:{}'.format(digest), '{}:{}:{}'.format(algorithm, params, digest)
+
+    def _remember(
+        self,
+        key,
+        solution,
+    ):
+        """Put key at the most recently used end of the LRU, evicting from the other end if over size."""
+        if key in self.entries:
+            self.primes -= len(self.entries[key])
+        self.entries[key] = solution
+        self.entries.move_to_end(key)
+        self.primes += len(solution)
+
+        while self.entries and (len(self.entries) > self.max_entries or
+                                (self.max_primes is not None and self.primes > self.max_primes)):
+            self.primes -= len(self.entries.popitem(last=False)[1])
+
+    def _fetch(self, key):
+        """Look key up in memory, then on disk. Returns None if it's in neither."""
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+        if self.connection is not None:
+            row = self.connection.execute('SELECT solution FROM solutions WHERE key = ?', (key,)).fetchone()
+            if row is not None:
+                self.disk_hits += 1
+                solution = json.loads(row[0])
+                self._remember(key, solution)
+                return solution
+
+        return None
+
+    def get(
+        self,
+        remaining,
+        algorithm,
+        algorithm_params=None,
+    ):
+        """Look up a cached solution to remaining usable by this run of algorithm. An exact solution is returned
+        whichever algorithm is asking, a heuristic one only to the same algorithm and params.
+
+        Parameters
+        ----------
+        remaining : list
+            List of lists of remaining decompositions.
+        algorithm : string
+            Name of the algorithm that would otherwise be run.
+        algorithm_params : dict
+            Keyword arguments the algorithm would be run with.
+
+        Returns
+        -------
+        list / None
+            Cached list of primes hitting remaining, or None on a miss.
+        """
+        exact_key, heuristic_key = self._keys(instance_digest(remaining), algorithm, algorithm_params)
+
+        solution = self._fetch(exact_key)
+        if solution is None and is_reproducible(algorithm, algorithm_params):
+            solution = self._fetch(heuristic_key)
+
+        if solution is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return list(solution)
+
+    def put(
+        self,
+        remaining,
+        algorithm,
+        algorithm_params,
+        solution,
+    ):
+        """Store the solution a run of algorithm found for remaining. Solutions that neither an exact nor a reproducible
+        run produced are ignored, there being no one they could be given back to.
+
+        Parameters
+        ----------
+        remaining : list
+            List of lists of remaining decompositions.
+        algorithm : string
+            Name of the algorithm that was run.
+        algorithm_params : dict
+            Keyword arguments the algorithm was run with.
+        solution : list
+            List of primes hitting remaining.
+
+        Returns
+        -------
+        bool
+            True if the solution was stored.
+        """
+        exact_key, heuristic_key = self._keys(instance_digest(remaining), algorithm, algorithm_params)
+
+        if is_exact(algorithm, algorithm_params):
+            key = exact_key
+        elif is_reproducible(algorithm, algorithm_params):
+            key = heuristic_key
+        else:
+            return False
+
+        solution = [int(p) for p in solution]
+        self._remember(key, solution)
+
+        if self.connection is not None:
+            self.connection.execute('INSERT OR REPLACE INTO solutions (key, solution) VALUES (?, ?)',
+                                    (key, json.dumps(solution)))
+            self.connection.commit()
+
+        return True
+
+    def info(self):
+        """Hit and miss counters, along with the current and maximum number of entries and primes held in memory.
+
+        Returns
+        -------
+        CacheInfo
+            Named tuple of (hits, misses, disk_hits, max_entries, entries, max_primes, primes).
+        """
+        return CacheInfo(self.hits, self.misses, self.disk_hits, self.max_entries, len(self.entries), self.max_primes,
+                         self.primes)
+
+    def clear(self):
+        """Empty the in memory entries and reset the counters. Anything on disk is left alone."""
+        self.entries.clear()
+        self.primes = 0
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+    def close(self):
+        """Close the connection to the backing store, if there is one."""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
@@ -0,0 +1,59 @@
+"""
+Unit tests for algorithm_selection.py, the instance features and the algorithm picked from them.
+"""
+from algorithm_selection import (
+    InstanceFeatures,
+    instance_features,
+    choose_algorithm,
+)
+from ilp_backend import available_ilp_solvers
+import math
+import unittest
+
+
+class TestAlgorithmSelectionFunctions(unittest.TestCase):
+
+    def test_instance_features(self):
+        input_list = [[2, 3], [3, 5, 7], [11, 13]]
+        expected_output = InstanceFeatures(
+            set_count=3,
+            distinct_primes=6,
+            log10_search_space=math.log10(12),
+            max_degree=2,
+            component_count=2,
+        )
+
+        realised_output = instance_features(input_list)
+
+        self.assertEqual(expected_output[:2], realised_output[:2])
+        self.assertAlmostEqual(expected_output.log10_search_space, realised_output.log10_search_space)
+        self.assertEqual(expected_output[3:], realised_output[3:])
+
+    def test_choose_algorithm_small_instance(self):
+        features = InstanceFeatures(10, 8, 3.0, 5, 1)
+
+        self.assertEqual('exhaustive', choose_algorithm(features))
+        self.assertEqual('exhaustive', choose_algorithm(features, 'heuristic'))
+
+    def test_choose_algorithm_large_instance(self):
+        one_component = InstanceFeatures(1000, 150, 300.0, 500, 1)
+        many_components = InstanceFeatures(1000, 200, 300.0, 500, 30)
+
+        self.assertEqual('branch-and-bound', choose_algorithm(one_component))
+        self.assertEqual('components', choose_algorithm(many_components))
+        self.assertEqual('greedy', choose_algorithm(one_component, 'heuristic'))
+
+    def test_choose_algorithm_wide_instance(self):
+        features = InstanceFeatures(300, 60, 140.0, 25, 1)
+        expected_output = 'ilp' if available_ilp_solvers() else 'branch-and-bound'
+
+        self.assertEqual(expected_output, choose_algorithm(features))
+        self.assertEqual('annealing', choose_algorithm(features, 'heuristic'))
+
+    def test_choose_algorithm_unknown_quality(self):
+        with self.assertRaises(ValueError):
+            choose_algorithm(InstanceFeatures(10, 8, 3.0, 5, 1), 'perfect')
+
+
+if __name__ == '__main__':
+    unittest.main(exit=True)
@@ -0,0 +1,120 @@
+"""
+Unit tests for the bitset form of the decompositions. Most cases reuse the inputs from shared_function_tests, so the
+two representations can be seen to agree.
+"""
+from bitsets import (
+    build_prime_index,
+    encode_decompositions,
+    decode_mask,
+    decode_masks,
+    pack_masks,
+    unhit_rows,
+    get_sols_bits,
+    get_remaining_bits,
+    check_if_solved_bits,
+    remove_single_elements_bits,
+    bitset_reduction,
+)
+from shared_functions import (
+    get_prime_decomposition_list,
+    get_sols,
+    get_remaining,
+    check_if_solved,
+    remove_single_elements,
+    solution_reduction,
+)
+import random
+import unittest
+
+
+class TestBitsetFunctions(unittest.TestCase):
+
+    def test_encode_decode_round_trip(self):
+        input_list = [[2, 3, 5], [3], [11, 23], [2, 13], [13, 23]]
+        primes, bit_of = build_prime_index(input_list)
+
+        realised_output = decode_masks(encode_decompositions(input_list, bit_of), primes)
+
+        self.assertListEqual([2, 3, 5, 11, 13, 23], primes)
+        self.assertListEqual(input_list, realised_output)
+
+    def test_get_sols_bits(self):
+        input_list = [[2, 3, 5], [3], [9], [11, 23], [3]]
+        primes, bit_of = build_prime_index(input_list)
+
+        realised_output = decode_mask(get_sols_bits(encode_decompositions(input_list, bit_of)), primes)
+
+        self.assertCountEqual([3, 9], realised_output)
+
+    def test_get_remaining_bits(self):
+        input_list = [[2, 3, 5], [3], [9], [11, 23], [3], [11, 23, 17], [2, 13], [13, 23]]
+        input_sols = [3, 9, 2]
+        primes, bit_of = build_prime_index(input_list)
+        masks = encode_decompositions(input_list, bit_of)
+        sol_mask = encode_decompositions([input_sols], bit_of)[0]
+
+        realised_output = decode_masks(get_remaining_bits(masks, sol_mask), primes)
+
+        self.assertCountEqual([sorted(d) for d in get_remaining(input_list, input_sols)], realised_output)
+
+    def test_check_if_solved_bits(self):
+        input_list = [[2, 3, 5], [3], [9], [3], [11, 23, 17], [2, 13], [13, 23]]
+        input_sols = [3, 9]
+        primes, bit_of = build_prime_index(input_list)
+        masks = encode_decompositions(input_list, bit_of)
+        sol_mask = encode_decompositions([input_sols], bit_of)[0]
+
+        realised_output = decode_masks(check_if_solved_bits(masks, sol_mask), primes)
+
+        self.assertListEqual([sorted(d) for d in check_if_solved(input_list, input_sols)], realised_output)
+
+    def test_remove_single_elements_bits(self):
+        input_list = [[2, 3, 13], [27, 2, 3], [27, 5], [11]]
+        primes, bit_of = build_prime_index(input_list)
+
+        realised_output = decode_masks(remove_single_elements_bits(encode_decompositions(input_list, bit_of)), primes)
+
+        self.assertListEqual(remove_single_elements([sorted(d) for d in input_list]), realised_output)
+
+    def test_unhit_rows(self):
+        input_masks = [1 << 70 | 1, 1 << 3, 1 << 64, 1 << 70]
+        sol_mask = 1 << 70
+
+        packed = pack_masks(input_masks, 71)
+        realised_output = unhit_rows(packed, pack_masks([sol_mask], 71)[0])
+
+        self.assertListEqual([1, 2], realised_output.tolist())
+
+    def test_bitset_reduction(self):
+        rng = random.Random(3)
+
+        for _ in range(20):
+            input_list = get_prime_decomposition_list(rng.sample(range(2, 300), 25), False)
+            sols = get_sols(input_list)
+            expected_output = solution_reduction(check_if_solved(get_remaining(input_list, sols), sols), sols, False)
+
+            remaining, realised_sols = bitset_reduction(input_list, False)
+
+            self.assertEqual(len(sols), len(realised_sols))
+            if remaining is realised_sols:
+                # solved outright, though a tie for the last prime may be broken differently
+                self.assertNotIsInstance(expected_output[0], list)
+            else:
+                self.assertCountEqual(sols, realised_sols)
+                self.assertCountEqual([sorted(d) for d in expected_output], [sorted(d) for d in remaining])
+
+    def test_bitset_reduction_matches_list_reduction(self):
+        from hit_set_algorithms import minimum_prime_hitting_set
+        rng = random.Random(3)
+
+        for _ in range(20):
+            input_list = rng.sample(range(2, 300), 25)
+
+            expected_output = minimum_prime_hitting_set(input_list, algorithm='exhaustive', text=False)
+            realised_output = minimum_prime_hitting_set(input_list, algorithm='exhaustive', text=False, bitset=True)
+
+            self.assertEqual(len(expected_output), len(realised_output))
+
+
+if __name__ == '__main__':
+    unittest.main(exit=True)
@@ -0,0 +1,74 @@
+"""
+Unit tests for the branch-and-bound search. Optimal sizes are checked against the exhaustive algorithm on small random
+instances, since the solutions themselves needn't be unique.
+"""
+from branch_and_bound import (
+    disjoint_lower_bound,
+    branch_and_bound_search,
+)
+from hit_set_algorithms import exhaustive_hitting_set
+from shared_functions import check_if_solved
+from deadline import Deadline
+import random
+import time
+import unittest
+
+
+class TestBranchAndBoundFunctions(unittest.TestCase):
+
+    def test_disjoint_lower_bound(self):
+        input_masks = [0b011, 0b110, 0b100, 0b1000]
+
+        realised_output = disjoint_lower_bound(0b1111, input_masks)
+
+        self.assertEqual(3, realised_output)
+
+    def test_branch_and_bound_search(self):
+        input_list = [[3, 7, 5], [11, 5], [3, 11], [11, 7]]
+
+        realised_output = branch_and_bound_search(input_list)
+
+        self.assertEqual(2, len(realised_output.solution))
+        self.assertTrue(realised_output.optimal)
+        self.assertEqual([], check_if_solved(input_list, realised_output.solution))
+
+    def test_branch_and_bound_matches_exhaustive(self):
+        rng = random.Random(11)
+        primes = [2, 3, 5, 7, 11, 13, 17, 19, 23]
+
+        for _ in range(30):
+            input_list = [rng.sample(primes, rng.randint(2, 3)) for _ in range(8)]
+
+            expected_output = exhaustive_hitting_set(input_list, [], False)
+            realised_output = branch_and_bound_search(input_list, incumbent=primes)
+
+            self.assertEqual(len(expected_output), len(realised_output.solution))
+            self.assertEqual([], check_if_solved(input_list, realised_output.solution))
+
+    def test_branch_and_bound_time_budget(self):
+        rng = random.Random(5)
+        primes = list(range(100, 160))
+        input_list = [rng.sample(primes, 4) for _ in range(120)]
+
+        realised_output = branch_and_bound_search(input_list, time_budget=0.01)
+
+        self.assertEqual([], check_if_solved(input_list, realised_output.solution))
+        self.assertLessEqual(realised_output.lower_bound, len(realised_output.solution))
+
+    def test_branch_and_bound_shared_deadline(self):
+        rng = random.Random(5)
+        primes = list(range(100, 160))
+        input_list = [rng.sample(primes, 4) for _ in range(120)]
+        deadline = Deadline(0.01)
+        time.sleep(0.02)
+
+        # the time spent before the call counts against the shared deadline
+        realised_output = branch_and_bound_search(input_list, time_budget=deadline)
+
+        self.assertFalse(realised_output.optimal)
+        self.assertTrue(deadline.expired)
+        self.assertEqual([], check_if_solved(input_list, realised_output.solution))
+
+
+if __name__ == '__main__':
+    unittest.main(exit=True)
@@ -0,0 +1,37 @@
+"""
+Unit tests for components.py, the splitting of remaining into independent sub problems.
+"""
+from components import (
+    prime_components,
+    connected_components,
+)
+import unittest
+
+
+class TestComponentsFunctions(unittest.TestCase):
+
+    def test_prime_components(self):
+        input_list = [[2, 3], [5, 7], [3, 11], [13]]
+
+        realised_output = prime_components(input_list)
+
+        self.assertEqual(realised_output[2], realised_output[3])
+        self.assertEqual(realised_output[2], realised_output[11])
+        self.assertEqual(realised_output[5], realised_output[7])
+        self.assertNotEqual(realised_output[2], realised_output[5])
+        self.assertNotEqual(realised_output[2], realised_output[13])
+
+    def test_connected_components(self):
+        input_list = [[2, 3], [5, 7], [11, 13], [3, 11], [7, 17], [19]]
+        expected_output = [[[2, 3], [11, 13], [3, 11]], [[5, 7], [7, 17]], [[19]]]
+
+        realised_output = connected_components(input_list)
+
+        self.assertListEqual(expected_output, realised_output)
+
+    def test_connected_components_empty(self):
+        self.assertListEqual([], connected_components([]))
+
+
+if __name__ == '__main__':
+    unittest.main(exit=True)
@@ -0,0 +1,79 @@
+"""
+Unit tests for the incremental coverage bookkeeping used by the local search algorithms.
+"""
+from coverage_state import CoverageState
+from shared_functions import check_if_solved
+import random
+import unittest
+
+
+class TestCoverageState(unittest.TestCase):
+
+    def test_initial_state(self):
+        input_list = [[3, 7, 5], [3], [11, 5], [3, 11], [11, 7]]
+
+        state = CoverageState(input_list, [3, 7])
+
+        self.assertListEqual([2, 1, 0, 1, 1], state.hit_counts)
+        self.assertEqual(1, state.unhit)
+        self.assertFalse(state.is_solved())
+
+    def test_can_remove(self):
+        input_list = [[3, 7, 5], [3], [11, 5], [3, 11], [11, 7]]
+        state = CoverageState(input_list, [3, 7, 11])
+
+        self.assertTrue(state.can_remove(7))
+        self.assertFalse(state.can_remove(3))
+        self.assertFalse(state.can_remove(5))
+
+    def test_add_remove(self):
+        input_list = [[3, 7, 5], [3], [11, 5], [3, 11], [11, 7]]
+        state = CoverageState(input_list, [3])
+
+        self.assertEqual(2, state.add(11))
+        self.assertTrue(state.is_solved())
+        self.assertEqual(0, state.add(11))
+        self.assertEqual(2, state.remove(11))
+        self.assertEqual(2, state.unhit)
+
+    def test_gain_and_cost(self):
+        input_list = [[3, 7, 5], [3], [11, 5], [3, 11], [11, 7]]
+        state = CoverageState(input_list, [3, 7])
+
+        self.assertEqual(1, state.addition_gain(5))
+        self.assertEqual(2, state.removal_cost(3))
+        self.assertEqual(1, state.removal_cost(7))
+
+    def test_can_remove_matches_check_if_solved(self):
+        rng = random.Random(4)
+        primes = [2, 3, 5, 7, 11, 13, 17]
+        input_list = [rng.sample(primes, rng.randint(1, 3)) for _ in range(12)]
+        state = CoverageState(input_list, primes)
+
+        for p in primes:
+            expected_output = not check_if_solved(input_list, [q for q in state.solution if q != p])
+            self.assertEqual(expected_output, state.can_remove(p))
+
+    def test_random_member_and_unhit(self):
+        input_list = [[3, 7, 5], [3], [11, 5], [3, 11], [11, 7]]
+        state = CoverageState(input_list, [3, 5, 7])
+        rng = random.Random(2)
+
+        state.remove(5)
+
+        self.assertTrue(all(state.random_member(rng) in (3, 7) for _ in range(20)))
+        self.assertTrue(all(state.random_unhit(rng) == 2 for _ in range(20)))
+
+    def test_remove_redundant(self):
+        input_list = [[3, 7, 5], [3], [11, 5], [3, 11], [11, 7]]
+        state = CoverageState(input_list, [3, 5, 7, 11])
+
+        removed = state.remove_redundant()
+
+        self.assertTrue(state.is_solved())
+        self.assertCountEqual([3, 11], state.solution)
+        self.assertCountEqual([5, 7], removed)
+
+
+if __name__ == '__main__':
+    unittest.main(exit=True)
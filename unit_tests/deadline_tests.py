@@ -0,0 +1,56 @@
+"""
+Unit tests for deadline.py, the time budget shared by the algorithms.
+"""
+from deadline import Deadline, as_deadline
+import pickle
+import time
+import unittest
+
+
+class TestDeadline(unittest.TestCase):
+
+    def test_no_budget_never_expires(self):
+        deadline = Deadline()
+
+        self.assertFalse(deadline.passed())
+        self.assertIsNone(deadline.remaining())
+        self.assertFalse(deadline.expired)
+
+    def test_expires(self):
+        deadline = Deadline(0.01)
+
+        self.assertFalse(deadline.expired)
+        time.sleep(0.02)
+
+        self.assertTrue(deadline.passed())
+        self.assertTrue(deadline.expired)
+        self.assertEqual(0.0, deadline.remaining())
+
+    def test_cancelled(self):
+        flag = []
+        deadline = Deadline(cancelled=lambda: bool(flag))
+
+        self.assertFalse(deadline.passed())
+        flag.append(True)
+
+        self.assertTrue(deadline.passed())
+        self.assertEqual(0.0, deadline.remaining())
+
+    def test_survives_pickling(self):
+        deadline = Deadline(10)
+
+        realised_output = pickle.loads(pickle.dumps(deadline))
+
+        self.assertEqual(deadline.expires_at, realised_output.expires_at)
+        self.assertLessEqual(realised_output.remaining(), 10)
+
+    def test_as_deadline(self):
+        deadline = Deadline(10)
+
+        self.assertIs(deadline, as_deadline(deadline))
+        self.assertIsNone(as_deadline(None).expires_at)
+        self.assertLessEqual(as_deadline(5).remaining(), 5)
+
+
+if __name__ == '__main__':
+    unittest.main(exit=True)
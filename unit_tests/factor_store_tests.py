@@ -0,0 +1,78 @@
+"""
+Unit tests for factor_store.py. Each test builds a small store in a temporary directory, and takes it out of use again
+afterwards so the rest of the suite factors as normal.
+"""
+from factor_store import (
+    build_factor_store,
+    open_factor_store,
+    close_factor_store,
+    FactorStore,
+)
+from factorisation import prime_factors, get_sieve
+from shared_functions import get_prime_decomposition_list
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import tempfile
+import unittest
+
+
+class TestFactorStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        build_factor_store(self.directory.name, limit=10 ** 4)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_sieve_is_memory_mapped(self):
+        store = open_factor_store(self.directory.name)
+        try:
+            sieve = get_sieve()
+
+            self.assertIsInstance(sieve, np.memmap)
+            self.assertFalse(sieve.flags.writeable)
+            self.assertEqual(10 ** 4, store.limit)
+        finally:
+            close_factor_store(store)
+
+    def test_large_values_written_back(self):
+        input_list = [10, 9973 * 9967, 2 ** 5 * 10007, 10, -9973 * 9967]
+        expected_output = [[2, 5], [9967, 9973], [2, 10007], [2, 5], [9967, 9973]]
+
+        store = open_factor_store(self.directory.name, writable=True)
+        try:
+            realised_output = get_prime_decomposition_list(input_list, False)
+            single_output = prime_factors(10009 * 10037)
+        finally:
+            close_factor_store(store)
+
+        reader = FactorStore(self.directory.name)
+        stored = reader.get_many([9973 * 9967, 2 ** 5 * 10007, 10009 * 10037, 10 ** 5])
+        reader.close()
+
+        self.assertListEqual(expected_output, realised_output)
+        self.assertListEqual([10009, 10037], single_output)
+        self.assertDictEqual({9973 * 9967: [9967, 9973], 2 ** 5 * 10007: [2, 10007], 10009 * 10037: [10009, 10037]},
+                             stored)
+
+    def test_read_only_store(self):
+        store = FactorStore(self.directory.name)
+        try:
+            with self.assertRaises(ValueError):
+                store.put_many({10 ** 5: [2, 5]})
+        finally:
+            store.close()
+
+    def test_shared_between_workers(self):
+        input_ints = [12, 9973 * 9967, 10 ** 12 + 39]
+
+        with ProcessPoolExecutor(max_workers=2, initializer=open_factor_store,
+                                 initargs=(self.directory.name,)) as executor:
+            realised_output = list(executor.map(prime_factors, input_ints))
+
+        self.assertListEqual([prime_factors(i) for i in input_ints], realised_output)
+
+
+if __name__ == '__main__':
+    unittest.main(exit=True)
@@ -0,0 +1,112 @@
+"""
+Unit tests for the factorisation engine. Values are picked to exercise both the sieve and the Pollard's rho paths, the
+larger semiprimes being products of primes well above any sieve limit we'd realistically set.
+"""
+from factorisation import (
+    batch_prime_factors,
+    build_smallest_prime_factor_sieve,
+    compact_prime_factors,
+    get_sieve,
+    is_probable_prime,
+    pollard_rho,
+    prime_factors,
+    set_sieve_limit,
+)
+import unittest
+
+
+class TestFactorisationFunctions(unittest.TestCase):
+
+    def test_build_smallest_prime_factor_sieve(self):
+        expected_output = [0, 0, 2, 3, 2, 5, 2, 7, 2, 3, 2, 11, 2, 13, 2, 3, 2, 17, 2, 19, 2, 3, 2, 23, 2, 5]
+
+        realised_output = list(build_smallest_prime_factor_sieve(25))
+
+        self.assertListEqual(expected_output, realised_output)
+
+    def test_is_probable_prime(self):
+        input_ints = [0, 1, 2, 9, 41, 561, 104729, 1000000007, 2 ** 61 - 1, (2 ** 61 - 1) * 1000000007]
+        expected_output = [False, False, True, False, True, False, True, True, True, False]
+
+        realised_output = [is_probable_prime(i) for i in input_ints]
+
+        self.assertListEqual(expected_output, realised_output)
+
+    def test_pollard_rho(self):
+        input_int = 1000000007 * 998244353
+
+        realised_output = pollard_rho(input_int)
+
+        self.assertIn(realised_output, [1000000007, 998244353])
+
+    def test_prime_factors_small(self):
+        input_ints = [10, 2, 5, -12, 36, 100, 0, 1, -1, 97]
+        expected_output = [[2, 5], [2], [5], [2, 3], [2, 3], [2, 5], [], [], [], [97]]
+
+        realised_output = [prime_factors(i) for i in input_ints]
+
+        self.assertListEqual(expected_output, realised_output)
+
+    def test_prime_factors_above_sieve(self):
+        sieve = build_smallest_prime_factor_sieve(100)
+        input_ints = [101, 2 * 3 * 101 ** 2, 1000000007 * 998244353 * 4, 2 ** 61 - 1]
+        expected_output = [[101], [2, 3, 101], [2, 998244353, 1000000007], [2 ** 61 - 1]]
+
+        realised_output = [prime_factors(i, sieve=sieve) for i in input_ints]
+
+        self.assertListEqual(expected_output, realised_output)
+
+    def test_prime_factors_matches_sieve_exhaustively(self):
+        sieve = build_smallest_prime_factor_sieve(50)
+
+        for i in range(2, 2000):
+            expected_output = sorted(p for p in range(2, i + 1)
+                                     if i % p == 0 and all(p % q != 0 for q in range(2, p)))
+
+            self.assertListEqual(expected_output, prime_factors(i, sieve=sieve))
+
+    def test_batch_prime_factors(self):
+        input_ints = [10, 2, 0, 10, -12, 1000000007 * 3, 36, 1, 2]
+        expected_output = [[2, 5], [2], [], [2, 5], [2, 3], [3, 1000000007], [2, 3], [], [2]]
+
+        realised_output = batch_prime_factors(input_ints, max_sieve_limit=1000)
+
+        self.assertListEqual(expected_output, realised_output)
+
+    def test_batch_prime_factors_matches_prime_factors(self):
+        input_ints = list(range(-50, 3000)) + list(range(3000, 0, -7))
+        expected_output = [prime_factors(i) for i in input_ints]
+
+        realised_output = batch_prime_factors(input_ints)
+
+        self.assertListEqual(expected_output, realised_output)
+
+    def test_compact_prime_factors(self):
+        input_ints = [12, 7, -12, 1]
+
+        realised_output = compact_prime_factors(input_ints)
+
+        self.assertListEqual([12, 7, 1], realised_output.values)
+        self.assertListEqual([0, 2, 3, 3], realised_output.offsets.tolist())
+        self.assertListEqual([2, 3, 7], realised_output.primes.tolist())
+        self.assertListEqual([0, 1, 0, 2], realised_output.inverse.tolist())
+
+
+    def test_compact_prime_factors_grows_sieve(self):
+        set_sieve_limit(1000)
+        try:
+            compact_prime_factors([1009, 5000])
+            self.assertEqual(1001, len(get_sieve()))
+
+            input_ints = list(range(1001, 6000))
+            expected_output = [prime_factors(i) for i in input_ints]
+
+            realised_output = batch_prime_factors(input_ints)
+
+            self.assertListEqual(expected_output, realised_output)
+            self.assertEqual(6000, len(get_sieve()))
+        finally:
+            set_sieve_limit(10 ** 6)
+
+if __name__ == '__main__':
+    unittest.main(exit=True)
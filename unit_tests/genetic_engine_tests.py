@@ -0,0 +1,102 @@
+"""
+Unit tests for the numpy GA engine. Being a stochastic algorithm the tests stick to properties that must always hold
+(every individual is a valid hitting set, runs are reproducible from a seed) rather than exact outputs.
+"""
+from genetic_engine import (
+    greedy_repair,
+    trim_redundant,
+    random_population,
+    next_generation,
+    run_genetic_algorithm,
+    run_island_genetic_algorithm,
+)
+from hit_check import build_incidence_matrix, hit_counts
+from shared_functions import check_if_solved
+import numpy as np
+import random
+import time
+import unittest
+
+INPUT_LIST = [[3, 7, 5], [3, 13], [11, 5], [3, 11], [11, 7], [13, 17, 19]]
+
+
+class TestGeneticEngineFunctions(unittest.TestCase):
+
+    def test_greedy_repair(self):
+        _, _, incidence = build_incidence_matrix(INPUT_LIST)
+        population = np.zeros((4, incidence.shape[0]), dtype=bool)
+
+        counts = greedy_repair(population, incidence, np.random.default_rng(0))
+
+        self.assertTrue((counts > 0).all())
+        self.assertTrue((hit_counts(population, incidence) == counts).all())
+
+    def test_trim_redundant(self):
+        _, _, incidence = build_incidence_matrix(INPUT_LIST)
+        population = np.ones((3, incidence.shape[0]), dtype=bool)
+        counts = hit_counts(population, incidence)
+
+        trim_redundant(population, counts, incidence, np.random.default_rng(1))
+
+        self.assertTrue((counts > 0).all())
+        self.assertTrue((hit_counts(population, incidence) == counts).all())
+        for individual in population:
+            for k in np.flatnonzero(individual):
+                without_k = individual.copy()
+                without_k[k] = False
+                self.assertFalse((hit_counts(without_k[None, :], incidence) > 0).all())
+
+    def test_generations_stay_valid(self):
+        _, _, incidence = build_incidence_matrix(INPUT_LIST)
+        rng = np.random.default_rng(2)
+
+        population = random_population(incidence, 20, rng)
+        for _ in range(5):
+            population = next_generation(population, incidence, rng)
+
+            self.assertEqual((20, incidence.shape[0]), population.shape)
+            self.assertTrue((hit_counts(population, incidence) > 0).all())
+
+    def test_run_genetic_algorithm(self):
+        rng = random.Random(8)
+        primes = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37]
+        input_list = [rng.sample(primes, 3) for _ in range(30)]
+
+        realised_output = run_genetic_algorithm(input_list, population_size=20, seed=4)
+        repeated_output = run_genetic_algorithm(input_list, population_size=20, seed=4)
+
+        self.assertEqual([], check_if_solved(input_list, realised_output.solution))
+        self.assertListEqual(realised_output.solution, repeated_output.solution)
+        self.assertEqual(realised_output.generations + 1, len(realised_output.history))
+        self.assertEqual(len(realised_output.solution), realised_output.history[-1])
+
+    def test_run_island_genetic_algorithm(self):
+        rng = random.Random(9)
+        primes = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37]
+        input_list = [rng.sample(primes, 3) for _ in range(30)]
+
+        realised_output = run_island_genetic_algorithm(input_list, islands=2, migration_interval=2, epochs=3,
+                                                       population_size=10, seed=5)
+
+        self.assertEqual([], check_if_solved(input_list, realised_output.solution))
+        self.assertEqual(2, len(realised_output.island_stats))
+        self.assertEqual(realised_output.epochs, len(realised_output.island_stats[0]['history']))
+        self.assertEqual(len(realised_output.solution), min(min(s['history']) for s in realised_output.island_stats))
+
+
+    def test_run_island_genetic_algorithm_stops_mid_epoch(self):
+        rng = random.Random(10)
+        primes = [p for p in range(101, 400) if all(p % q for q in range(2, p))]
+        input_list = [rng.sample(primes, 3) for _ in range(150)]
+
+        start = time.perf_counter()
+        realised_output = run_island_genetic_algorithm(input_list, islands=2, migration_interval=10 ** 6,
+                                                       stale_epochs=10, time_budget=0.2, seed=5)
+
+        # an epoch of a million generations would take minutes
+        self.assertLess(time.perf_counter() - start, 2)
+        self.assertTrue(realised_output.timed_out)
+        self.assertEqual([], check_if_solved(input_list, realised_output.solution))
+
+if __name__ == '__main__':
+    unittest.main(exit=True)
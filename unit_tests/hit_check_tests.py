@@ -0,0 +1,61 @@
+"""
+Unit tests for the vectorised hit check kernel. Results are compared against check_if_solved on the same inputs.
+"""
+from hit_check import (
+    build_incidence_matrix,
+    solutions_to_matrix,
+    batch_check_if_solved,
+    batch_is_solution,
+    filter_solutions,
+)
+from shared_functions import check_if_solved
+import random
+import unittest
+
+
+class TestHitCheckFunctions(unittest.TestCase):
+
+    def test_build_incidence_matrix(self):
+        input_list = [[2, 3], [3, 5], [7]]
+        expected_output = [[True, False, False], [True, True, False], [False, True, False], [False, False, True]]
+
+        primes, _, incidence = build_incidence_matrix(input_list)
+
+        self.assertListEqual([2, 3, 5, 7], primes)
+        self.assertListEqual(expected_output, incidence.tolist())
+
+    def test_batch_check_if_solved(self):
+        input_list = [[2, 3, 5], [3], [9], [3], [11, 23, 17], [2, 13], [13, 23]]
+        input_candidates = [[3, 9], [3, 9, 2, 23], [41]]
+        _, bit_of, incidence = build_incidence_matrix(input_list)
+
+        hit_mask, unhit = batch_check_if_solved(solutions_to_matrix(input_candidates, bit_of), incidence)
+
+        self.assertEqual((3, 7), hit_mask.shape)
+        for candidate, candidate_unhit in zip(input_candidates, unhit):
+            expected_output = check_if_solved(input_list, candidate)
+            self.assertListEqual(expected_output, [input_list[j] for j in candidate_unhit])
+
+    def test_batch_is_solution_matches_check_if_solved(self):
+        rng = random.Random(7)
+        input_list = [rng.sample([2, 3, 5, 7, 11, 13, 17], rng.randint(1, 3)) for _ in range(15)]
+        input_candidates = [rng.sample([2, 3, 5, 7, 11, 13, 17], rng.randint(1, 6)) for _ in range(200)]
+        _, bit_of, incidence = build_incidence_matrix(input_list)
+
+        realised_output = batch_is_solution(solutions_to_matrix(input_candidates, bit_of), incidence).tolist()
+        expected_output = [not check_if_solved(input_list, candidate) for candidate in input_candidates]
+
+        self.assertListEqual(expected_output, realised_output)
+
+    def test_filter_solutions(self):
+        input_list = [[3, 7, 5], [11, 5], [3, 11], [11, 7]]
+        input_candidates = [[3, 7], [5, 11], [7, 11, 3], []]
+        expected_output = [[5, 11], [7, 11, 3]]
+
+        realised_output = filter_solutions(input_list, input_candidates)
+
+        self.assertListEqual(expected_output, realised_output)
+
+
+if __name__ == '__main__':
+    unittest.main(exit=True)
@@ -3,16 +3,29 @@ Unit tests for exhaustive algorithm. See function docstrings for explanation of
 cases (most notably hitting_set's) are quite low effort, this is in part due to complexity of manually calculating the
 MinHitSet solution, and in part due to the codes current decision to pick to return only one solution in cases where
 there are multiple, which is not infrequent for larger input lists. I use assertCountEqual over assertListEqual in most
-cases as order is arbitrary and irrelevant.
-
-TODO - GA unit tests - legit this one needs testing fo sho
+cases as order is arbitrary and irrelevant. The GA engine has its own tests in genetic_engine_tests.py.
 """
 from hit_set_algorithms import (
+    stream_hitting_sets,
     exhaustive_hitting_set,
+    lazy_greedy_cover,
     greedy_hitting_set,
+    multiple_stochastic_descent_hitting_set,
+    annealing_hitting_set,
+    component_hitting_set,
+    portfolio_hitting_set,
+    get_chosen_algorithm,
     minimum_prime_hitting_set,
 )
+from shared_functions import check_if_solved, get_prime_decomposition_list
+import hit_set_algorithms
+import collections
+import itertools
+import operator
+import random
+import time
 import unittest
+from unittest import mock
 
 
 class TestExhaustiveAlgorithmFunctions(unittest.TestCase):
@@ -26,6 +39,22 @@ class TestExhaustiveAlgorithmFunctions(unittest.TestCase):
 
         self.assertCountEqual(expected_output, realised_output)
 
+    def test_exhaustive_hitting_set_matches_product(self):
+        input_list = [[3, 7, 5], [3, 13], [11, 5], [3, 11], [11, 7], [13, 17, 19]]
+        expected_output = min(len(set(k)) for k in itertools.product(*input_list))
+
+        realised_output = exhaustive_hitting_set(input_list, [], False)
+
+        self.assertEqual(expected_output, len(realised_output))
+
+    def test_stream_hitting_sets(self):
+        input_list = [[2, 3], [3, 5], [7]]
+        expected_output = [frozenset([2, 3, 7]), frozenset([2, 5, 7]), frozenset([3, 7])]
+
+        realised_output = list(stream_hitting_sets(input_list, [10]))
+
+        self.assertListEqual(expected_output, realised_output)
+
     def test_greedy_hitting_set(self):
         input_list = [[3, 7, 5], [3], [11, 5], [3, 11], [11, 7]]
         input_sols = [2]
@@ -35,6 +64,151 @@ class TestExhaustiveAlgorithmFunctions(unittest.TestCase):
 
         self.assertCountEqual(expected_output, realised_output)
 
+    def test_lazy_greedy_cover_matches_counter_greedy(self):
+        rng = random.Random(13)
+        primes = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31]
+
+        for _ in range(50):
+            input_list = [rng.sample(primes, rng.randint(1, 4)) for _ in range(rng.randint(1, 30))]
+
+            # the original Counter based greedy loop, which the lazy heap version should agree with exactly
+            remaining = input_list
+            expected_output = []
+            while remaining:
+                counts = collections.Counter(itertools.chain.from_iterable(remaining))
+                expected_output.append(max(counts.items(), key=operator.itemgetter(1))[0])
+                remaining = check_if_solved(remaining, expected_output)
+
+            realised_output = lazy_greedy_cover(input_list)
+
+            self.assertListEqual(expected_output, realised_output)
+
+    def test_multiple_stochastic_descent_hitting_set_reproducible(self):
+        input_list = [[3, 7, 5], [3, 13], [11, 5], [3, 11], [11, 7], [13, 17, 19]]
+        input_seeds = [1, 2, 3, 4]
+
+        serial_output = multiple_stochastic_descent_hitting_set(input_list, [2], False, workers=1, seeds=input_seeds)
+        parallel_output = multiple_stochastic_descent_hitting_set(input_list, [2], False, workers=2, seeds=input_seeds)
+
+        self.assertListEqual(serial_output, parallel_output)
+        self.assertEqual([], check_if_solved(input_list, serial_output))
+
+    def test_annealing_hitting_set(self):
+        rng = random.Random(21)
+        primes = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43]
+        input_list = [rng.sample(primes, 3) for _ in range(40)]
+        stats = {}
+
+        realised_output = annealing_hitting_set(input_list, [47], False, max_iterations=2000, seed=3, stats=stats)
+        repeated_output = annealing_hitting_set(input_list, [47], False, max_iterations=2000, seed=3)
+
+        self.assertEqual([], check_if_solved(input_list, realised_output))
+        self.assertIn(47, realised_output)
+        self.assertLessEqual(len(realised_output), len(lazy_greedy_cover(input_list)) + 1)
+        self.assertCountEqual(realised_output, repeated_output)
+        self.assertEqual(2000, stats['iterations'])
+
+    def test_component_hitting_set_matches_exhaustive(self):
+        rng = random.Random(4)
+        input_list = []
+        for primes in ([2, 3, 5, 7, 11], [13, 17, 19, 23], [29, 31, 37, 41, 43]):
+            input_list += [rng.sample(primes, 2) for _ in range(5)]
+        input_list.append([47, 53])
+        stats = {}
+
+        realised_output = component_hitting_set(input_list, [59], False, small_size=3, stats=stats)
+        parallel_output = component_hitting_set(input_list, [59], False, small_size=3, workers=2)
+        exhaustive_output = exhaustive_hitting_set(input_list, [59], False)
+
+        self.assertEqual([], check_if_solved(input_list, realised_output))
+        self.assertEqual(len(exhaustive_output), len(realised_output))
+        self.assertCountEqual(realised_output, parallel_output)
+        self.assertEqual(len(input_list), sum(component['size'] for component in stats['components']))
+        self.assertEqual('trivial', stats['components'][-1]['algorithm'])
+
+    def test_portfolio_hitting_set_proves_optimum(self):
+        rng = random.Random(6)
+        primes = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+        input_list = [rng.sample(primes, 3) for _ in range(25)]
+        stats = {}
+
+        realised_output = portfolio_hitting_set(input_list, [31], False, seed=0, stats=stats)
+        exhaustive_output = exhaustive_hitting_set(input_list, [31], False)
+
+        self.assertEqual([], check_if_solved(input_list, realised_output))
+        self.assertIn(31, realised_output)
+        self.assertEqual(len(exhaustive_output), len(realised_output))
+        self.assertTrue(stats['optimal'])
+        self.assertEqual(len(realised_output), stats['lower_bound'])
+        self.assertIn(stats['winner'], stats['entrants'])
+
+    def test_portfolio_hitting_set_waits_for_proven_optimum(self):
+        rng = random.Random(6)
+        primes = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+        input_list = [rng.sample(primes, 3) for _ in range(25)]
+        optimum = exhaustive_hitting_set(input_list, [], False)
+        exact_entrant = hit_set_algorithms._exact_entrant
+
+        def late_entrant(remaining, bound, stop, deadline, results, seed):
+            # lowers the bound straight away but is slow sending the solution that goes with it
+            with bound.get_lock():
+                bound.value = len(optimum)
+            time.sleep(0.05)
+            results.put(('greedy', optimum, None))
+
+        def waiting_exact_entrant(remaining, bound, stop, deadline, results, seed):
+            while bound.value > len(optimum):
+                time.sleep(0.001)
+            exact_entrant(remaining, bound, stop, deadline, results, seed)
+
+        stats = {}
+        with mock.patch.multiple(hit_set_algorithms, _greedy_entrant=late_entrant, _descent_entrant=lambda *_: None,
+                                 _exact_entrant=waiting_exact_entrant):
+            realised_output = portfolio_hitting_set(input_list, [], False, stats=stats)
+
+        self.assertEqual(len(optimum), len(realised_output))
+        self.assertTrue(stats['optimal'])
+        self.assertEqual('greedy', stats['winner'])
+
+    def test_time_budget_returns_hitting_set(self):
+        rng = random.Random(5)
+        primes = [p for p in range(101, 400) if all(p % q for q in range(2, p))]
+        input_list = [sorted(set(rng.sample(primes, 3))) for _ in range(150)]
+
+        for algorithm in ['random', 'exhaustive', 'branch-and-bound', 'ilp', 'greedy', 'stochastic',
+                          'multiple-stochastic', 'genetic', 'annealing', 'components', 'portfolio']:
+            stats = {}
+            start = time.perf_counter()
+
+            realised_output = get_chosen_algorithm(algorithm)(input_list, [], False, time_budget=0.1, stats=stats)
+
+            self.assertEqual([], check_if_solved(input_list, realised_output), algorithm)
+            self.assertLess(time.perf_counter() - start, 2, algorithm)
+            self.assertIn('finished', stats, algorithm)
+
+    def test_time_budget_cuts_exhaustive_short(self):
+        rng = random.Random(5)
+        primes = [p for p in range(101, 400) if all(p % q for q in range(2, p))]
+        input_list = [rng.choice(primes) * rng.choice(primes) * rng.choice(primes) for _ in range(150)]
+        stats = {}
+
+        realised_output = minimum_prime_hitting_set(input_list, 'exhaustive', False, kernel=True, time_budget=0.2,
+                                                     stats=stats)
+
+        self.assertFalse(stats['finished'])
+        self.assertEqual([], check_if_solved(get_prime_decomposition_list(input_list, False), realised_output))
+
+    def test_minimum_prime_hitting_set_kernel_stats(self):
+        input_list = [30, 21, 3 * 11 * 13, 11 * 13 * 17, 19]
+        stats = {}
+
+        realised_output = minimum_prime_hitting_set(input_list, 'exhaustive', False, kernel=True, stats=stats)
+
+        self.assertCountEqual([3, 11, 19], realised_output)
+        self.assertEqual(3, stats['kernel']['forced_primes'])
+        self.assertEqual(5, stats['kernel']['dominated_primes'])
+        self.assertIn('rounds', stats['kernel'])
+
     def test_minimum_prime_hitting_set_exhaustive(self):
         input_list = [2, 3, 5, 10, 25, 15, 9, 4, 38]
         expected_output = [2, 3, 5]
@@ -43,6 +217,41 @@ class TestExhaustiveAlgorithmFunctions(unittest.TestCase):
 
         self.assertCountEqual(expected_output, realised_output)
 
+    def test_minimum_prime_hitting_set_auto(self):
+        rng = random.Random(7)
+        input_list = [rng.randrange(2, 10 ** 9) for _ in range(300)]
+        stats = {}
+
+        realised_output = minimum_prime_hitting_set(input_list, text=False, stats=stats)
+        expected_output = minimum_prime_hitting_set(input_list, 'branch-and-bound', False)
+
+        self.assertEqual(len(expected_output), len(realised_output))
+        self.assertIn(stats['algorithm'], ['exhaustive', 'ilp', 'components', 'branch-and-bound'])
+        self.assertGreater(stats['features']['set_count'], 0)
+
+    def test_minimum_prime_hitting_set_auto_passes_params(self):
+        rng = random.Random(8)
+        primes = [p for p in range(101, 400) if all(p % q for q in range(2, p))]
+        input_list = [rng.choice(primes) * rng.choice(primes) * rng.choice(primes) for _ in range(150)]
+        params = {'quality': 'heuristic', 'seed': 0, 'max_iterations': 2000}
+        stats = {}
+
+        realised_output = minimum_prime_hitting_set(input_list, text=False, kernel=True, algorithm_params=params,
+                                                    stats=stats)
+        repeated_output = minimum_prime_hitting_set(input_list, text=False, kernel=True, algorithm_params=params)
+
+        self.assertEqual('annealing', stats['algorithm'])
+        self.assertEqual(2000, stats['iterations'])
+        self.assertCountEqual(realised_output, repeated_output)
+        with self.assertRaises(ValueError):
+            minimum_prime_hitting_set(input_list, text=False, algorithm_params={'colour': 'blue'})
+
+    def test_minimum_prime_hitting_set_unknown_param(self):
+        input_list = [2, 3, 5, 10, 25, 15, 9, 4, 38]
+
+        with self.assertRaises(ValueError):
+            minimum_prime_hitting_set(input_list, 'exhaustive', False, algorithm_params={'seed': 0})
+
     def test_minimum_prime_hitting_set_greedy(self):
         input_list = [2, 3, 5, 10, 25, 15, 9, 4, 38]
         expected_output = [2, 3, 5]
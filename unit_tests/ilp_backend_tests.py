@@ -0,0 +1,85 @@
+"""
+Unit tests for the ILP backend. The solver specific tests are skipped when the solver isn't installed.
+"""
+from ilp_backend import (
+    ILP_SOLVERS,
+    available_ilp_solvers,
+    solve_hitting_set_ilp,
+)
+from hit_set_algorithms import ilp_hitting_set
+from shared_functions import check_if_solved
+import ilp_backend
+import os
+import subprocess
+import sys
+import unittest
+import warnings
+from unittest import mock
+
+INPUT_LIST = [[3, 7, 5], [3, 13], [11, 5], [3, 11], [11, 7], [13, 17, 19]]
+
+
+class TestILPBackendFunctions(unittest.TestCase):
+
+    @unittest.skipUnless('cp-sat' in available_ilp_solvers(), 'OR-Tools not installed')
+    def test_solve_hitting_set_ilp_cp_sat(self):
+        realised_output = solve_hitting_set_ilp(INPUT_LIST, solver='cp-sat')
+
+        self.assertEqual(3, len(realised_output.solution))
+        self.assertTrue(realised_output.optimal)
+        self.assertEqual(3, realised_output.lower_bound)
+        self.assertEqual([], check_if_solved(INPUT_LIST, realised_output.solution))
+
+    @unittest.skipUnless('cbc' in available_ilp_solvers(), 'PuLP not installed')
+    def test_solve_hitting_set_ilp_cbc(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            realised_output = solve_hitting_set_ilp(INPUT_LIST, incumbent=[3, 5, 11, 13], solver='cbc')
+
+        self.assertEqual([], [warning for warning in caught if issubclass(warning.category, DeprecationWarning)])
+        self.assertEqual(3, len(realised_output.solution))
+        self.assertTrue(realised_output.optimal)
+        self.assertEqual([], check_if_solved(INPUT_LIST, realised_output.solution))
+
+    def test_solve_hitting_set_ilp_unknown_solver(self):
+        with self.assertRaises(ValueError):
+            solve_hitting_set_ilp(INPUT_LIST, solver='not-a-solver')
+
+    def test_solve_hitting_set_ilp_unavailable_solver(self):
+        with mock.patch('ilp_backend.available_ilp_solvers', return_value=[]):
+            realised_output = solve_hitting_set_ilp(INPUT_LIST, solver=ILP_SOLVERS[0])
+
+        self.assertIsNone(realised_output)
+
+    def test_ilp_hitting_set(self):
+        input_sols = [2]
+        stats = {}
+
+        realised_output = ilp_hitting_set([list(d) for d in INPUT_LIST], input_sols, False, stats=stats)
+
+        self.assertEqual(4, len(realised_output))
+        self.assertIn(2, realised_output)
+        self.assertTrue(stats['optimal'])
+        self.assertEqual(0, stats['gap'])
+
+    def test_ilp_hitting_set_falls_back_without_solver(self):
+        stats = {}
+
+        with mock.patch('ilp_backend.available_ilp_solvers', return_value=[]):
+            realised_output = ilp_hitting_set([list(d) for d in INPUT_LIST], [], False, stats=stats)
+
+        self.assertEqual(3, len(realised_output))
+        self.assertIn('nodes', stats)
+
+
+    def test_solvers_imported_lazily(self):
+        # a fresh interpreter, as this one has likely imported the solvers already
+        script = 'import sys, hit_set_algorithms; print(sorted(set(sys.modules) & {"ortools", "pulp", "pandas"}))'
+
+        realised_output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True,
+                                         cwd=os.path.dirname(os.path.abspath(ilp_backend.__file__))).stdout
+
+        self.assertEqual('[]', realised_output.strip())
+
+if __name__ == '__main__':
+    unittest.main(exit=True)
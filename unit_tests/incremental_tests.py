@@ -0,0 +1,89 @@
+"""
+Unit tests for incremental.py. After every change the solution is checked to hit every integer still held, against
+the same integers run through check_if_solved.
+"""
+from incremental import IncrementalHittingSet
+from shared_functions import check_if_solved, get_prime_decomposition_list
+import random
+import unittest
+
+
+class TestIncrementalHittingSet(unittest.TestCase):
+
+    def assertHitsAll(self, solver, int_list):
+        self.assertEqual([], check_if_solved(get_prime_decomposition_list(int_list, False), solver.solution()))
+
+    def test_add(self):
+        solver = IncrementalHittingSet([6, 10])
+
+        self.assertListEqual([2], solver.solution())
+        self.assertEqual(0, solver.add([14, 4]))
+        self.assertListEqual([2], solver.solution())
+        self.assertEqual(2, solver.add([15, 21]))
+        self.assertHitsAll(solver, [6, 10, 14, 4, 15, 21])
+
+    def test_repair_prunes_redundant_primes(self):
+        solver = IncrementalHittingSet([6, 10])
+        self.assertListEqual([2], solver.solution())
+
+        solver.add([3, 5])
+
+        self.assertListEqual([3, 5], solver.solution())
+
+    def test_remove(self):
+        solver = IncrementalHittingSet([2, 3, 6, 6])
+
+        solver.remove([2, 6])
+        self.assertListEqual([3], solver.solution())
+
+        solver.remove([3])
+        self.assertEqual(1, len(solver.solution()))
+
+        solver.remove([6])
+        self.assertListEqual([], solver.solution())
+        self.assertListEqual([], solver.decompositions())
+
+        with self.assertRaises(ValueError):
+            solver.remove([6])
+
+    def test_remove_prunes_before_raising(self):
+        solver = IncrementalHittingSet([2, 3, 6])
+
+        with self.assertRaises(ValueError):
+            solver.remove([2, 6, 7])
+
+        self.assertListEqual([3], solver.solution())
+        self.assertListEqual([[3]], solver.decompositions())
+
+    def test_random_stream(self):
+        rng = random.Random(8)
+        solver = IncrementalHittingSet()
+        held = []
+
+        for _ in range(30):
+            batch = [rng.randrange(-1, 5000) for _ in range(rng.randint(1, 20))]
+            solver.add(batch)
+            held += batch
+
+            for val in rng.sample(held, min(len(held), rng.randint(0, 5))):
+                held.remove(val)
+                solver.remove([val])
+
+            self.assertHitsAll(solver, held)
+
+    def test_resolve(self):
+        rng = random.Random(3)
+        input_list = [rng.randrange(2, 3000) for _ in range(200)]
+        solver = IncrementalHittingSet()
+        for val in input_list:
+            solver.add([val])
+        before = len(solver.solution())
+
+        solver.resolve('greedy')
+
+        self.assertLessEqual(len(solver.solution()), before)
+        self.assertHitsAll(solver, input_list)
+
+
+if __name__ == '__main__':
+    unittest.main(exit=True)
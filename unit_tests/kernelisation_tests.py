@@ -0,0 +1,79 @@
+"""
+Unit tests for kernelisation.py. The individual rules are checked on small hand made cases, and kernelise as a whole
+against the exhaustive algorithm, since the kernel must have exactly the same minimum solution size.
+"""
+from kernelisation import (
+    force_singletons,
+    collapse_duplicates,
+    remove_subsumed,
+    remove_dominated,
+    kernelise,
+)
+from hit_set_algorithms import exhaustive_hitting_set
+from shared_functions import check_if_solved
+import random
+import unittest
+
+
+class TestKernelisationFunctions(unittest.TestCase):
+
+    def test_force_singletons(self):
+        input_list = [[2], [2, 3], [5, 7], [7], [11, 13]]
+        expected_output = ([[11, 13]], [2, 7])
+
+        realised_output = force_singletons(input_list)
+
+        self.assertEqual(expected_output, realised_output)
+
+    def test_collapse_duplicates(self):
+        input_list = [[2, 3], [5, 7], [3, 2], [7, 5, 11], [5, 7]]
+        expected_output = [[2, 3], [5, 7], [7, 5, 11]]
+
+        realised_output = collapse_duplicates(input_list)
+
+        self.assertListEqual(expected_output, realised_output)
+
+    def test_remove_subsumed(self):
+        input_list = [[2, 3, 5], [3, 5], [7, 11], [5, 3, 13], [7, 13]]
+        expected_output = [[3, 5], [7, 11], [7, 13]]
+
+        realised_output = remove_subsumed(input_list)
+
+        self.assertListEqual(expected_output, realised_output)
+
+    def test_remove_dominated(self):
+        input_list = [[2, 3, 5], [3, 7], [3, 11, 13], [11, 13, 17]]
+        expected_output = ([[3], [3], [3, 11], [11]], [2, 5, 7, 13, 17])
+
+        realised_output = remove_dominated(input_list)
+
+        self.assertEqual(expected_output, realised_output)
+
+    def test_kernelise(self):
+        input_list = [[2, 3, 5], [3, 7], [3, 11, 13], [11, 13, 17], [19]]
+
+        realised_output = kernelise(input_list)
+
+        self.assertListEqual([], realised_output.remaining)
+        self.assertListEqual([3, 11, 19], sorted(realised_output.forced))
+        self.assertEqual(3, realised_output.stats['forced_primes'])
+        self.assertEqual(5, realised_output.stats['dominated_primes'])
+
+    def test_kernelise_keeps_minimum_size(self):
+        rng = random.Random(12)
+        primes = [2, 3, 5, 7, 11, 13, 17, 19, 23]
+
+        for _ in range(20):
+            input_list = [rng.sample(primes, rng.randint(1, 3)) for _ in range(8)]
+
+            realised_output = kernelise(input_list)
+            kernel_sols = exhaustive_hitting_set(realised_output.remaining, [], False) if realised_output.remaining \
+                else []
+
+            self.assertEqual([], check_if_solved(input_list, realised_output.forced + kernel_sols))
+            self.assertEqual(len(set(exhaustive_hitting_set(input_list, [], False))),
+                             len(realised_output.forced) + len(kernel_sols))
+
+
+if __name__ == '__main__':
+    unittest.main(exit=True)
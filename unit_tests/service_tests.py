@@ -0,0 +1,158 @@
+"""
+Unit tests for service.py, run against a live service with a small process pool.
+"""
+from service import (
+    SolveService,
+    ServiceBusy,
+    serve,
+)
+from shared_functions import check_if_solved, get_prime_decomposition_list
+import asyncio
+import json
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+
+def hard_instance(seed):
+    """Integers whose reduced problem takes branch and bound a good while."""
+    rng = random.Random(seed)
+    primes = [p for p in range(101, 400) if all(p % q for q in range(2, p))]
+
+    return [rng.choice(primes) * rng.choice(primes) * rng.choice(primes) for _ in range(150)]
+
+
+class TestSolveService(unittest.IsolatedAsyncioTestCase):
+
+    def assertHits(self, int_list, solution):
+        self.assertEqual([], check_if_solved(get_prime_decomposition_list(int_list, False), solution))
+
+    async def test_concurrent_requests_batched(self):
+        rng = random.Random(1)
+        int_lists = [[rng.randrange(2, 10 ** 5) for _ in range(30)] for _ in range(8)]
+
+        async with SolveService(workers=2, batch_window=0.05) as service:
+            results = await asyncio.gather(*[service.solve(int_list) for int_list in int_lists])
+
+        for int_list, result in zip(int_lists, results):
+            self.assertEqual('ok', result['status'])
+            self.assertHits(int_list, result['solution'])
+        self.assertLess(service.stats['batches'], len(int_lists))
+
+    async def test_time_budget(self):
+        int_list = hard_instance(2)
+
+        async with SolveService(workers=1) as service:
+            result = await service.solve(int_list, 'branch-and-bound', time_budget=0.2)
+
+        # the algorithm gets most of the budget and should answer in time, unless the pool is slow to start
+        self.assertIn(result['status'], ['ok', 'timeout'])
+        self.assertHits(int_list, result['solution'])
+
+    async def test_timeout_fallback(self):
+        int_list = hard_instance(2)
+
+        async with SolveService(workers=1) as service:
+            # a time budget of its own means the algorithm ignores the request's
+            result = await service.solve(int_list, 'branch-and-bound', {'time_budget': 1.0}, time_budget=0.2)
+
+        self.assertEqual('timeout', result['status'])
+        self.assertHits(int_list, result['solution'])
+
+    async def test_kernelise_error(self):
+        async with SolveService(workers=1) as service:
+            with mock.patch('service.kernelise', side_effect=RuntimeError('broken')):
+                with self.assertRaises(RuntimeError):
+                    await asyncio.wait_for(service.solve([6, 10, 15]), 5)
+
+        self.assertEqual(1, service.stats['error'])
+
+    async def test_busy_when_queue_full(self):
+        service = SolveService(workers=1, max_queue=1)
+        await service.start()
+        try:
+            first = asyncio.get_running_loop().create_task(service.solve([6, 10, 15]))
+            second = asyncio.get_running_loop().create_task(service.solve([6, 10, 15]))
+            third = asyncio.get_running_loop().create_task(service.solve([6, 10, 15]))
+            results = await asyncio.gather(first, second, third, return_exceptions=True)
+        finally:
+            await service.stop()
+
+        self.assertTrue(any(isinstance(result, ServiceBusy) for result in results))
+        self.assertTrue(any(isinstance(result, dict) for result in results))
+
+    async def test_cancellation(self):
+        async with SolveService(workers=1) as service:
+            task = asyncio.get_running_loop().create_task(
+                service.solve(hard_instance(3), 'branch-and-bound', {'time_budget': 1.0}))
+            await asyncio.sleep(0.1)
+            task.cancel()
+
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        self.assertEqual(1, service.stats['cancelled'])
+
+    async def test_busy_while_solving(self):
+        async with SolveService(workers=1, max_queue=2) as service:
+            loop = asyncio.get_running_loop()
+            slow = [loop.create_task(service.solve(hard_instance(seed), 'branch-and-bound', time_budget=1.0))
+                    for seed in (4, 5)]
+            # long enough for both to have left the batching queue for the pool
+            await asyncio.sleep(0.3)
+
+            with self.assertRaises(ServiceBusy):
+                await service.solve([6, 10, 15])
+
+            for task in slow:
+                task.cancel()
+            await asyncio.gather(*slow, return_exceptions=True)
+            result = await service.solve([6, 10, 15])
+
+        self.assertEqual('ok', result['status'])
+
+    async def test_cancellation_frees_worker(self):
+        async with SolveService(workers=1) as service:
+            loop = asyncio.get_running_loop()
+            running = loop.create_task(service.solve(hard_instance(3), 'branch-and-bound', time_budget=3.0))
+            queued = loop.create_task(service.solve(hard_instance(4), 'branch-and-bound', time_budget=3.0))
+            await asyncio.sleep(0.3)
+            running.cancel()
+            queued.cancel()
+            await asyncio.gather(running, queued, return_exceptions=True)
+
+            start = loop.time()
+            result = await service.solve([6, 10, 15], 'branch-and-bound')
+
+        self.assertEqual('ok', result['status'])
+        self.assertLess(loop.time() - start, 1.5)
+
+    async def test_unix_socket_server(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'solve.sock')
+
+            async with SolveService(workers=1) as service:
+                server = await serve(service, path=path)
+                try:
+                    reader, writer = await asyncio.open_unix_connection(path)
+                    writer.write(b'{"id": 7, "ints": [6, 10, 15, 77]}\n')
+                    writer.write(b'not json\n')
+                    await writer.drain()
+
+                    responses = [json.loads(await reader.readline()) for _ in range(2)]
+                    writer.close()
+                    await writer.wait_closed()
+                finally:
+                    server.close()
+                    await server.wait_closed()
+
+        solved = [response for response in responses if response.get('id') == 7][0]
+        self.assertEqual('ok', solved['status'])
+        self.assertHits([6, 10, 15, 77], solved['solution'])
+        self.assertIn('error', [response['status'] for response in responses])
+
+
+if __name__ == '__main__':
+    unittest.main(exit=True)
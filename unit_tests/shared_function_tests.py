@@ -2,9 +2,11 @@
 Unit tests for the functions that are shared across multiple algorithms.
 
 """
+import shared_functions
 from shared_functions import (
     prime_factor_decomposition,
     get_sols,
+    drop_strict_subsets,
     get_remaining,
     check_if_solved,
     check_for_single_remaining_sol,
@@ -42,6 +44,20 @@ class TestSharedFunctions(unittest.TestCase):
 
         self.assertCountEqual(expected_output, realised_output)
 
+    def test_drop_strict_subsets(self):
+        input_list = [[2, 3], [7, 3, 2], [5, 7], [5, 7], [11], [13, 11, 17], [2, 3, 7]]
+        expected_output = [[7, 3, 2], [5, 7], [5, 7], [13, 11, 17], [2, 3, 7]]
+
+        realised_output = drop_strict_subsets(input_list)
+        shared_functions.SUBSET_ENUMERATION_LIMIT = 1
+        try:
+            index_output = drop_strict_subsets(input_list)
+        finally:
+            shared_functions.SUBSET_ENUMERATION_LIMIT = 12
+
+        self.assertListEqual(expected_output, realised_output)
+        self.assertListEqual(expected_output, index_output)
+
     def test_check_if_solved_solved(self):
         input_list = [[2, 3, 5], [3], [9], [3], [2, 13]]
         input_sols = [3, 9, 2]
@@ -0,0 +1,118 @@
+"""
+Unit tests for solution_cache.py. The SQLite store is tested against a file in a temporary directory.
+"""
+from solution_cache import (
+    canonical_instance,
+    instance_digest,
+    is_exact,
+    is_reproducible,
+    SolutionCache,
+)
+from hit_set_algorithms import minimum_prime_hitting_set
+import os
+import tempfile
+import unittest
+
+
+class TestSolutionCacheFunctions(unittest.TestCase):
+
+    def test_canonical_instance(self):
+        input_list = [[7, 3], [5, 2], [3, 7], [2, 5, 11]]
+        expected_output = ((2, 5), (2, 5, 11), (3, 7))
+
+        realised_output = canonical_instance(input_list)
+
+        self.assertEqual(expected_output, realised_output)
+        self.assertEqual(instance_digest(input_list), instance_digest([[11, 5, 2], [7, 3], [2, 5]]))
+
+    def test_is_exact(self):
+        self.assertTrue(is_exact('exhaustive'))
+        self.assertTrue(is_exact('branch-and-bound', {}))
+        self.assertFalse(is_exact('branch-and-bound', {'time_budget': 1.0}))
+        self.assertFalse(is_exact('greedy'))
+        self.assertTrue(is_exact('auto'))
+        self.assertFalse(is_exact('auto', {'quality': 'heuristic'}))
+        self.assertTrue(is_exact('components'))
+        self.assertFalse(is_exact('components', {'algorithm': 'greedy'}))
+        self.assertFalse(is_exact('components', {'algorithm_params': {'time_budget': 1.0}}))
+
+    def test_is_reproducible(self):
+        self.assertTrue(is_reproducible('greedy'))
+        self.assertTrue(is_reproducible('annealing', {'seed': 3}))
+        self.assertFalse(is_reproducible('annealing', {'time_budget': 0.1}))
+
+    def test_exact_solutions_shared_between_algorithms(self):
+        cache = SolutionCache()
+        input_list = [[2, 3], [3, 5], [5, 7]]
+
+        cache.put(input_list, 'exhaustive', None, [3, 5])
+
+        self.assertListEqual([3, 5], cache.get([[5, 3], [7, 5], [3, 2]], 'greedy'))
+        self.assertEqual((1, 0), cache.info()[:2])
+
+    def test_heuristic_solutions_need_same_algorithm_and_seed(self):
+        cache = SolutionCache()
+        input_list = [[2, 3], [3, 5], [5, 7]]
+
+        self.assertTrue(cache.put(input_list, 'annealing', {'seed': 1}, [3, 7]))
+        self.assertFalse(cache.put(input_list, 'stochastic', None, [2, 5]))
+
+        self.assertListEqual([3, 7], cache.get(input_list, 'annealing', {'seed': 1}))
+        self.assertIsNone(cache.get(input_list, 'annealing', {'seed': 2}))
+        self.assertIsNone(cache.get(input_list, 'genetic', {'seed': 1}))
+        self.assertIsNone(cache.get(input_list, 'stochastic'))
+        self.assertEqual((1, 3), cache.info()[:2])
+
+    def test_lru_eviction(self):
+        cache = SolutionCache(max_entries=2)
+
+        cache.put([[2, 3]], 'exhaustive', None, [2])
+        cache.put([[5, 7]], 'exhaustive', None, [5])
+        cache.get([[2, 3]], 'exhaustive')
+        cache.put([[11, 13]], 'exhaustive', None, [11])
+
+        self.assertIsNotNone(cache.get([[2, 3]], 'exhaustive'))
+        self.assertIsNone(cache.get([[5, 7]], 'exhaustive'))
+        self.assertEqual(2, cache.info().entries)
+
+    def test_size_eviction(self):
+        cache = SolutionCache(max_primes=4)
+
+        cache.put([[2, 3], [5, 7]], 'exhaustive', None, [2, 5])
+        cache.put([[11, 13], [17, 19]], 'exhaustive', None, [11, 17])
+        cache.put([[23, 29], [31, 37], [41, 43]], 'exhaustive', None, [23, 31, 41])
+
+        self.assertIsNone(cache.get([[2, 3], [5, 7]], 'exhaustive'))
+        self.assertIsNone(cache.get([[11, 13], [17, 19]], 'exhaustive'))
+        self.assertIsNotNone(cache.get([[23, 29], [31, 37], [41, 43]], 'exhaustive'))
+        self.assertEqual((1, 3), (cache.info().entries, cache.info().primes))
+
+    def test_disk_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'solutions.sqlite')
+
+            cache = SolutionCache(path=path)
+            cache.put([[2, 3], [3, 5]], 'exhaustive', None, [3])
+            cache.close()
+
+            reopened = SolutionCache(path=path)
+            realised_output = reopened.get([[2, 3], [3, 5]], 'branch-and-bound')
+            reopened.close()
+
+        self.assertListEqual([3], realised_output)
+        self.assertEqual(1, reopened.info().disk_hits)
+
+    def test_minimum_prime_hitting_set_with_cache(self):
+        cache = SolutionCache()
+        input_list = [6, 15, 35, 77, 143, 221]
+
+        first_output = minimum_prime_hitting_set(input_list, algorithm='exhaustive', text=False, cache=cache)
+        second_output = minimum_prime_hitting_set(list(reversed(input_list)), algorithm='greedy', text=False,
+                                                  cache=cache)
+
+        self.assertEqual(len(first_output), len(second_output))
+        self.assertEqual((1, 1), cache.info()[:2])
+
+
+if __name__ == '__main__':
+    unittest.main(exit=True)
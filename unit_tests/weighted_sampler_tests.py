@@ -0,0 +1,56 @@
+"""
+Unit tests for the Fenwick tree weighted sampler. Sampling is checked statistically with a fixed seed, using a tolerance
+wide enough that the tests aren't flaky.
+"""
+from weighted_sampler import WeightedSampler
+import collections
+import random
+import unittest
+
+
+class TestWeightedSampler(unittest.TestCase):
+
+    def test_total(self):
+        sampler = WeightedSampler({2: 3, 3: 1, 5: 4, 7: 2})
+
+        self.assertAlmostEqual(10, sampler.total)
+
+    def test_update_and_remove(self):
+        sampler = WeightedSampler({2: 3, 3: 1, 5: 4, 7: 2})
+
+        sampler.update(3, 6)
+        sampler.remove(5)
+
+        self.assertAlmostEqual(11, sampler.total)
+        self.assertEqual(3, len(sampler))
+
+    def test_sample_never_returns_removed(self):
+        sampler = WeightedSampler({p: 1 for p in range(2, 40)})
+        rng = random.Random(0)
+
+        for p in range(2, 39):
+            sampler.remove(p)
+
+        self.assertTrue(all(sampler.sample(rng) == 39 for _ in range(100)))
+
+    def test_sample_distribution(self):
+        input_weights = {2: 1, 3: 2, 5: 0, 7: 5}
+        sampler = WeightedSampler(input_weights)
+        rng = random.Random(1)
+
+        draws = collections.Counter(sampler.sample(rng) for _ in range(8000))
+
+        self.assertEqual(0, draws[5])
+        for item, weight in input_weights.items():
+            self.assertAlmostEqual(weight / 8, draws[item] / 8000, delta=0.02)
+
+    def test_sample_all_zero(self):
+        sampler = WeightedSampler({2: 1})
+        sampler.remove(2)
+
+        with self.assertRaises(ValueError):
+            sampler.sample()
+
+
+if __name__ == '__main__':
+    unittest.main(exit=True)
@@ -0,0 +1,122 @@
+"""
+Weighted random sampling from a set of items whose weights change as the algorithm runs, i.e. the prime frequencies
+used to pick removals in the descent algorithms.
+
+Weights are held in a Fenwick (binary indexed) tree, so drawing an item and changing or removing a weight both cost
+O(log n) rather than rebuilding the whole distribution every step.
+"""
+import random
+
+
+class WeightedSampler:
+    """Draw items with probability proportional to their weight.
+
+    Parameters
+    ----------
+    weights : dict
+        Mapping of item to non negative weight.
+    """
+
+    def __init__(self, weights):
+        self.items = list(weights)
+        self.index = {item: i for i, item in enumerate(self.items)}
+        self.weights = [float(weights[item]) for item in self.items]
+        self.tree = [0.0] * (len(self.items) + 1)
+
+        # linear time build, each node passes its partial sum up to its parent
+        for i, weight in enumerate(self.weights, start=1):
+            self.tree[i] += weight
+            parent = i + (i & -i)
+            if parent <= len(self.items):
+                self.tree[parent] += self.tree[i]
+
+        self._top_bit = 1 << (len(self.items).bit_length() - 1) if self.items else 0
+
+    @property
+    def total(self):
+        """Sum of all current weights."""
+        total = 0.0
+        i = len(self.items)
+
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+
+        return total
+
+    def __len__(self):
+        """Number of items with a positive weight."""
+        return sum(1 for weight in self.weights if weight > 0)
+
+    def update(
+        self,
+        item,
+        weight,
+    ):
+        """Set the weight of an item.
+
+        Parameters
+        ----------
+        item : hashable
+            Item whose weight should change. Must be one of the items the sampler was built with.
+        weight : float
+            New non negative weight.
+        """
+        i = self.index[item]
+        delta = float(weight) - self.weights[i]
+        self.weights[i] = float(weight)
+
+        i += 1
+        while i <= len(self.items):
+            self.tree[i] += delta
+            i += i & -i
+
+    def remove(self, item):
+        """Stop an item from ever being drawn again, by setting its weight to zero.
+
+        Parameters
+        ----------
+        item : hashable
+            Item to remove.
+        """
+        self.update(item, 0)
+
+    def sample(self, rng=random):
+        """Draw a single item, with probability proportional to its weight.
+
+        Parameters
+        ----------
+        rng : random.Random
+            Source of randomness. Defaults to the random module itself.
+
+        Returns
+        -------
+        hashable
+            The item drawn.
+
+        Raises
+        ------
+        ValueError
+            If every weight is zero.
+        """
+        total = self.total
+        if total <= 0:
+            raise ValueError('cannot sample when every weight is zero')
+
+        target = rng.random() * total
+        position = 0
+        step = self._top_bit
+
+        # walk down the tree to the first item whose cumulative weight passes target
+        while step:
+            next_position = position + step
+            if next_position <= len(self.items) and self.tree[next_position] <= target:
+                position = next_position
+                target -= self.tree[next_position]
+            step >>= 1
+
+        # floating point error can leave position pointing at a zero weight item at the very end, step back if so
+        while position >= len(self.items) or self.weights[position] <= 0:
+            position -= 1
+
+        return self.items[position]